@@ -36,6 +36,12 @@ class ABTestManager:
         else:
             return 'control'
 
+    def assign_users(self, user_ids: List[str]) -> np.ndarray:
+        # Same md5-mod-100 bucketing as assign_user; the 128-bit digest is reduced as two big-endian uint64 halves
+        digests = np.frombuffer(b''.join(hashlib.md5(user_id.encode()).digest() for user_id in user_ids), dtype='>u8').reshape(-1, 2)
+        buckets = (digests[:, 0] % 100 * (2 ** 64 % 100) + digests[:, 1] % 100) % 100
+        return np.where(buckets / 100.0 < self.split_ratio, 'treatment', 'control')
+
     def log_result(self, user_id: str, query: str, response: str, metrics: Dict[str, Any], metadata: Optional[Dict[str, Any]]=None):
         group = self.assign_user(user_id)
         result = {'user_id': user_id, 'query': query, 'response': response, 'metrics': metrics, 'metadata': metadata or {}, 'timestamp': datetime.now().isoformat()}
@@ -1,6 +1,9 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from src.unified_llm import UnifiedLLM
 from src.tools.research_retrieval import ResearchRetriever
 from typing import Dict, Any, List
+_SYNTHESIS_TEMPLATE = 'Business Query: {query}\n\nYou have access to the following academic research papers:\n\n{research_context}\n\nYour task:\n1. Identify the key findings most relevant to the business query\n2. Synthesize insights across papers (note where findings align or conflict)\n3. Extract evidence-based recommendations and frameworks\n4. Highlight empirical findings with statistical support\n5. Note any limitations or gaps in the current research\n\nProvide a concise synthesis (300-500 words) organized by key themes.\nUse this EXACT citation format: (Source: Author et al., Year)\n\nExample: "Customer churn is driven primarily by poor onboarding (Source: Smith et al., 2024)."\n\n**Key Research Themes:**\n\n1. [Theme 1]\n   - Finding with citation (Source: Author et al., Year)\n   - Implication for business\n\n2. [Theme 2]\n   - Finding with citation (Source: Author et al., Year)\n\n**Evidence-Based Recommendations:**\n- [Recommendation] (Source: Author et al., Year)\n\n**Knowledge Gaps:**\n- [Gaps in research]\n'
 
 class ResearchSynthesisAgent:
 
@@ -22,40 +25,47 @@ class ResearchSynthesisAgent:
             print(f'✓ Retrieved {len(papers)} relevant papers')
         research_context = self._format_papers_for_llm(papers)
         print(' Synthesizing research insights...')
-        synthesis_prompt = f'Business Query: {query}\n\nYou have access to the following academic research papers:\n\n{research_context}\n\nYour task:\n1. Identify the key findings most relevant to the business query\n2. Synthesize insights across papers (note where findings align or conflict)\n3. Extract evidence-based recommendations and frameworks\n4. Highlight empirical findings with statistical support\n5. Note any limitations or gaps in the current research\n\nProvide a concise synthesis (300-500 words) organized by key themes.\nUse this EXACT citation format: (Source: Author et al., Year)\n\nExample: "Customer churn is driven primarily by poor onboarding (Source: Smith et al., 2024)."\n\n**Key Research Themes:**\n\n1. [Theme 1]\n   - Finding with citation (Source: Author et al., Year)\n   - Implication for business\n\n2. [Theme 2]\n   - Finding with citation (Source: Author et al., Year)\n\n**Evidence-Based Recommendations:**\n- [Recommendation] (Source: Author et al., Year)\n\n**Knowledge Gaps:**\n- [Gaps in research]\n'
+        synthesis_prompt = _SYNTHESIS_TEMPLATE.format(query=query, research_context=research_context)
         synthesis = self.llm.generate(input_text=synthesis_prompt, instructions=self.system_prompt, reasoning_effort='low', text_verbosity='high', max_tokens=1500)
         agent_context = self._create_agent_context(papers, synthesis)
         return {'papers': papers, 'synthesis': synthesis, 'research_context': agent_context, 'paper_count': len(papers)}
 
+    def synthesize_many(self, queries: List[str], top_k_papers: int=3, max_workers: int=4) -> List[Dict[str, Any]]:
+        if not queries:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(queries))) as executor:
+            return list(executor.map(lambda q: self.synthesize(query=q, top_k_papers=top_k_papers), queries))
+
+    async def asynthesize(self, query: str, retrieve_papers: bool=True, top_k_papers: int=3) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.synthesize, query, retrieve_papers, top_k_papers)
+
     def _format_papers_for_llm(self, papers: List[Dict[str, Any]]) -> str:
         if not papers:
             return 'No papers retrieved.'
-        formatted = ''
+        parts = []
         for i, paper in enumerate(papers, 1):
-            formatted += f'--- Paper {i} ---\n'
-            formatted += f"Title: {paper['title']}\n"
-            formatted += f"Authors: {', '.join(paper['authors'][:3])}"
+            parts.append(f'--- Paper {i} ---\n')
+            parts.append(f"Title: {paper['title']}\n")
+            parts.append(f"Authors: {', '.join(paper['authors'][:3])}")
             if len(paper['authors']) > 3:
-                formatted += ' et al.'
-            formatted += f"\nYear: {paper['year']}\n"
-            formatted += f"Source: {paper['source']}\n"
+                parts.append(' et al.')
+            parts.append(f"\nYear: {paper['year']}\n")
+            parts.append(f"Source: {paper['source']}\n")
             if paper.get('citation_count', 0) > 0:
-                formatted += f"Citations: {paper['citation_count']}\n"
-            formatted += f"\nAbstract:\n{paper['abstract']}\n"
-            formatted += f"\nCitation: {paper['citation']}\n"
-            formatted += f"\n{'=' * 70}\n\n"
-        return formatted
+                parts.append(f"Citations: {paper['citation_count']}\n")
+            parts.append(f"\nAbstract:\n{paper['abstract']}\n")
+            parts.append(f"\nCitation: {paper['citation']}\n")
+            parts.append(f"\n{'=' * 70}\n\n")
+        return ''.join(parts)
 
     def _create_agent_context(self, papers: List[Dict[str, Any]], synthesis: str) -> str:
         if not papers:
             return ''
-        context = '\n## Research-Backed Insights\n\n'
-        context += synthesis + '\n\n'
-        context += '## Academic Sources\n'
+        parts = ['\n## Research-Backed Insights\n\n', synthesis, '\n\n', '## Academic Sources\n']
         for i, paper in enumerate(papers, 1):
-            context += f"{i}. {paper['citation']}\n"
-            context += f"   URL: {paper['url']}\n\n"
-        return context
+            parts.append(f"{i}. {paper['citation']}\n")
+            parts.append(f"   URL: {paper['url']}\n\n")
+        return ''.join(parts)
 
     def quick_research_summary(self, query: str, top_k: int=2) -> str:
         papers = self.retriever.retrieve_papers(query=query, top_k=top_k)
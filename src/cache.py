@@ -1,11 +1,49 @@
+import base64
 import json
 import hashlib
 import logging
 import os
+import tempfile
+import threading
 import time
+import zlib
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, List, Tuple
+import msgpack
 logger = logging.getLogger(__name__)
+_FORMAT_JSON = b'\x00'
+_FORMAT_MSGPACK = b'\x01'
+_FORMAT_MSGPACK_ZLIB = b'\x02'
+_COMPRESS_THRESHOLD = 4096
+_COMPRESS_LEVEL = 3
+_L1_SHARED_TYPES = (str, bytes, int, float)
+
+def _pack(value: Any) -> bytes:
+    payload = msgpack.packb(value, use_bin_type=True, default=str)
+    if len(payload) > _COMPRESS_THRESHOLD:
+        return _FORMAT_MSGPACK_ZLIB + zlib.compress(payload, _COMPRESS_LEVEL)
+    return _FORMAT_MSGPACK + payload
+
+def _unpack(data: bytes) -> Any:
+    marker = data[:1]
+    if marker == _FORMAT_MSGPACK:
+        return msgpack.unpackb(data[1:], raw=False)
+    if marker == _FORMAT_MSGPACK_ZLIB:
+        return msgpack.unpackb(zlib.decompress(data[1:]), raw=False)
+    if marker == _FORMAT_JSON:
+        data = data[1:]
+    return json.loads(data)
+
+@lru_cache(maxsize=4096)
+def _derive_key(client_id: Optional[str], prefix: str, parts: Tuple[str, ...]) -> str:
+    payload = msgpack.packb(parts, use_bin_type=True, default=str)
+    digest = hashlib.blake2b(payload, digest_size=8).digest()
+    content_hash = base64.urlsafe_b64encode(digest).rstrip(b'=').decode()
+    if client_id:
+        return f'client:{client_id}:{prefix}:{content_hash}'
+    return f'{prefix}:{content_hash}'
 
 class CacheBackend:
 
@@ -15,14 +53,37 @@ class CacheBackend:
     def set(self, key: str, value: Any, ttl: int):
         raise NotImplementedError
 
+    def get_raw(self, key: str) -> Optional[bytes]:
+        value = self.get(key)
+        return _pack(value) if value is not None else None
+
+    def set_raw(self, key: str, payload: bytes, ttl: int):
+        self.set(key, _unpack(payload), ttl)
+
+    def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        return [self.get(key) for key in keys]
+
+    def mset_ex(self, items: List[Tuple[str, Any, int]]):
+        for key, value, ttl in items:
+            self.set(key, value, ttl)
+
+    def mget_raw(self, keys: List[str]) -> List[Optional[bytes]]:
+        return [self.get_raw(key) for key in keys]
+
+    def mset_raw(self, items: List[Tuple[str, bytes, int]]):
+        for key, payload, ttl in items:
+            self.set_raw(key, payload, ttl)
+
     def clear(self):
         raise NotImplementedError
 
 class RedisCache(CacheBackend):
+    CLEAR_BATCH_SIZE = 1000
 
-    def __init__(self, redis_url: str, namespace: str):
+    def __init__(self, redis_url: str, namespace: str, max_connections: int=32):
         import redis
-        self.redis = redis.from_url(redis_url, decode_responses=False)
+        pool = redis.BlockingConnectionPool.from_url(redis_url, max_connections=max_connections, timeout=5, socket_timeout=1.0, socket_connect_timeout=1.0, socket_keepalive=True, health_check_interval=30, decode_responses=False)
+        self.redis = redis.Redis(connection_pool=pool)
         self.redis.ping()
         self.namespace = namespace
 
@@ -30,15 +91,45 @@ class RedisCache(CacheBackend):
         return f'{self.namespace}:{key}'
 
     def get(self, key: str) -> Optional[Any]:
-        cached = self.redis.get(self._key(key))
-        return json.loads(cached) if cached else None
+        cached = self.get_raw(key)
+        return _unpack(cached) if cached else None
 
     def set(self, key: str, value: Any, ttl: int):
-        self.redis.setex(self._key(key), ttl, json.dumps(value, default=str))
+        self.set_raw(key, _pack(value), ttl)
+
+    def get_raw(self, key: str) -> Optional[bytes]:
+        return self.redis.get(self._key(key))
+
+    def set_raw(self, key: str, payload: bytes, ttl: int):
+        self.redis.setex(self._key(key), ttl, payload)
+
+    def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        return [_unpack(c) if c else None for c in self.mget_raw(keys)]
+
+    def mset_ex(self, items: List[Tuple[str, Any, int]]):
+        self.mset_raw([(key, _pack(value), ttl) for key, value, ttl in items])
+
+    def mget_raw(self, keys: List[str]) -> List[Optional[bytes]]:
+        return self.redis.mget([self._key(key) for key in keys])
+
+    def mset_raw(self, items: List[Tuple[str, bytes, int]]):
+        pipe = self.redis.pipeline(transaction=False)
+        for key, payload, ttl in items:
+            pipe.setex(self._key(key), ttl, payload)
+        pipe.execute()
 
     def clear(self):
-        for key in self.redis.scan_iter(match=f'{self.namespace}:*'):
-            self.redis.delete(key)
+        pipe = self.redis.pipeline(transaction=False)
+        batch = []
+        for key in self.redis.scan_iter(match=f'{self.namespace}:*', count=self.CLEAR_BATCH_SIZE):
+            batch.append(key)
+            if len(batch) >= self.CLEAR_BATCH_SIZE:
+                pipe.unlink(*batch)
+                pipe.execute()
+                batch = []
+        if batch:
+            pipe.unlink(*batch)
+            pipe.execute()
 
 class FileCache(CacheBackend):
 
@@ -47,37 +138,59 @@ class FileCache(CacheBackend):
         self.cache_dir.mkdir(exist_ok=True)
 
     def _path(self, key: str) -> Path:
-        key_hash = hashlib.md5(key.encode()).hexdigest()
-        return self.cache_dir / f'{key_hash}.json'
+        key_hash = hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+        return self.cache_dir / f'{key_hash}.msgpack'
 
     def get(self, key: str) -> Optional[Any]:
+        payload = self.get_raw(key)
+        return _unpack(payload) if payload else None
+
+    def set(self, key: str, value: Any, ttl: int):
+        self.set_raw(key, _pack(value), ttl)
+
+    def get_raw(self, key: str) -> Optional[bytes]:
         cache_file = self._path(key)
-        if not cache_file.exists():
+        try:
+            data = msgpack.unpackb(cache_file.read_bytes(), raw=False)
+        except FileNotFoundError:
             return None
-        data = json.loads(cache_file.read_text())
         if data['expires_at'] > time.time():
-            return data['value']
-        cache_file.unlink()
+            return data['payload'] if 'payload' in data else _pack(data['value'])
+        cache_file.unlink(missing_ok=True)
         return None
 
-    def set(self, key: str, value: Any, ttl: int):
+    def set_raw(self, key: str, payload: bytes, ttl: int):
         cache_file = self._path(key)
-        cache_file.write_text(json.dumps({'value': value, 'expires_at': time.time() + ttl}, default=str))
+        data = msgpack.packb({'payload': payload, 'expires_at': time.time() + ttl}, use_bin_type=True)
+        with tempfile.NamedTemporaryFile(dir=self.cache_dir, prefix='.tmp-', delete=False) as tmp:
+            tmp.write(data)
+        try:
+            os.replace(tmp.name, cache_file)
+        except OSError:
+            os.unlink(tmp.name)
+            raise
 
     def clear(self):
-        for cache_file in self.cache_dir.glob('*.json'):
-            cache_file.unlink()
+        for pattern in ('*.msgpack', '*.json'):
+            for cache_file in self.cache_dir.glob(pattern):
+                cache_file.unlink(missing_ok=True)
 
 class QueryCache:
     TTL_RESEARCH = 604800
     TTL_AGENT = 86400
     TTL_SYNTHESIS = 86400
     TTL_SIMPLE = 604800
+    TTL_NEGATIVE = 3600
+    TTL_ROUTING = 86400
+    L1_MAX_ENTRIES = 512
+    L1_TTL = 60
 
     def __init__(self, client_id: Optional[str]=None):
         self.client_id = client_id
         self.backend = self._init_backend()
         self.stats = {'hits': 0, 'misses': 0, 'saves': 0}
+        self._l1 = OrderedDict()
+        self._l1_lock = threading.Lock()
         if self.backend:
             backend_type = type(self.backend).__name__
             logger.info(f'✓ Cache enabled: {backend_type}')
@@ -98,16 +211,43 @@ class QueryCache:
         return FileCache(cache_dir)
 
     def _make_key(self, prefix: str, *parts: str) -> str:
-        content = '::'.join((str(p) for p in parts))
-        content_hash = hashlib.sha256(content.encode()).hexdigest()[:16]
-        if self.client_id:
-            return f'client:{self.client_id}:{prefix}:{content_hash}'
-        return f'{prefix}:{content_hash}'
+        return _derive_key(self.client_id, prefix, parts)
+
+    def _l1_get(self, key: str) -> Optional[Any]:
+        with self._l1_lock:
+            entry = self._l1.get(key)
+            if entry is None:
+                return None
+            payload, value, expires_at = entry
+            if expires_at <= time.time():
+                del self._l1[key]
+                return None
+            self._l1.move_to_end(key)
+            if value is None:
+                value = _unpack(payload)
+                if isinstance(value, _L1_SHARED_TYPES):
+                    self._l1[key] = (payload, value, expires_at)
+            return value
+
+    def _l1_put(self, key: str, payload: bytes, ttl: int, value: Any=None):
+        # Only immutable values are kept decoded; dicts and lists are decoded per hit so callers get their own copy
+        if not isinstance(value, _L1_SHARED_TYPES):
+            value = None
+        with self._l1_lock:
+            self._l1[key] = (payload, value, time.time() + min(ttl, self.L1_TTL))
+            self._l1.move_to_end(key)
+            while len(self._l1) > self.L1_MAX_ENTRIES:
+                self._l1.popitem(last=False)
 
     def _get(self, key: str, label: str) -> Optional[Any]:
         if not self.backend:
             return None
-        result = self.backend.get(key)
+        result = self._l1_get(key)
+        if result is None:
+            payload = self.backend.get_raw(key)
+            if payload:
+                result = _unpack(payload)
+                self._l1_put(key, payload, self.L1_TTL, result)
         if result:
             self.stats['hits'] += 1
             logger.info(f'Cache HIT: {label}')
@@ -118,7 +258,9 @@ class QueryCache:
     def _set(self, key: str, value: Any, ttl: int, label: str):
         if not self.backend:
             return
-        self.backend.set(key, value, ttl)
+        payload = _pack(value)
+        self.backend.set_raw(key, payload, ttl)
+        self._l1_put(key, payload, ttl, value)
         self.stats['saves'] += 1
         logger.debug(f'Cached: {label}')
 
@@ -130,6 +272,10 @@ class QueryCache:
         key = self._make_key('research', query)
         self._set(key, papers, self.TTL_RESEARCH, 'research')
 
+    def set_empty_research(self, query: str, result: Dict):
+        key = self._make_key('research', query)
+        self._set(key, result, self.TTL_NEGATIVE, 'empty research')
+
     def get_agent_response(self, agent: str, query: str, has_research: bool=False) -> Optional[str]:
         key = self._make_key('agent', agent, query, str(has_research))
         return self._get(key, f'{agent} agent ({query[:30]}...)')
@@ -138,6 +284,35 @@ class QueryCache:
         key = self._make_key('agent', agent, query, str(has_research))
         self._set(key, response, self.TTL_AGENT, f'{agent} agent')
 
+    def get_agent_responses_batch(self, agents: List[str], query: str, has_research: bool=False) -> Dict[str, str]:
+        if not self.backend or not agents:
+            return {}
+        keys = [self._make_key('agent', agent, query, str(has_research)) for agent in agents]
+        results = [self._l1_get(key) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            fetched = self.backend.mget_raw([keys[i] for i in missing])
+            for i, payload in zip(missing, fetched):
+                if payload:
+                    results[i] = _unpack(payload)
+                    self._l1_put(keys[i], payload, self.TTL_AGENT, results[i])
+        responses = {agent: result for agent, result in zip(agents, results) if result}
+        self.stats['hits'] += len(responses)
+        self.stats['misses'] += len(agents) - len(responses)
+        if responses:
+            logger.info(f"Cache HIT: {', '.join(responses)} agents ({query[:30]}...)")
+        return responses
+
+    def set_agent_responses_batch(self, responses: Dict[str, str], query: str, has_research: bool=False):
+        if not self.backend or not responses:
+            return
+        items = [(self._make_key('agent', agent, query, str(has_research)), _pack(response), self.TTL_AGENT) for agent, response in responses.items()]
+        self.backend.mset_raw(items)
+        for (key, payload, ttl), response in zip(items, responses.values()):
+            self._l1_put(key, payload, ttl, response)
+        self.stats['saves'] += len(items)
+        logger.debug(f"Cached: {', '.join(responses)} agents")
+
     def get_synthesis(self, query: str, agents_used: list) -> Optional[str]:
         agents_key = ':'.join(sorted(agents_used))
         key = self._make_key('synthesis', query, agents_key)
@@ -148,6 +323,14 @@ class QueryCache:
         key = self._make_key('synthesis', query, agents_key)
         self._set(key, synthesis, self.TTL_SYNTHESIS, 'synthesis')
 
+    def get_routing(self, query: str) -> Optional[List[str]]:
+        key = self._make_key('routing', ' '.join(query.lower().split()))
+        return self._get(key, f'routing ({query[:30]}...)')
+
+    def set_routing(self, query: str, agents: List[str]):
+        key = self._make_key('routing', ' '.join(query.lower().split()))
+        self._set(key, agents, self.TTL_ROUTING, 'routing')
+
     def get_simple_answer(self, query: str) -> Optional[str]:
         key = self._make_key('simple', query)
         return self._get(key, f'simple answer ({query[:30]}...)')
@@ -159,6 +342,8 @@ class QueryCache:
     def clear(self):
         if self.backend:
             self.backend.clear()
+            with self._l1_lock:
+                self._l1.clear()
             self.stats = {'hits': 0, 'misses': 0, 'saves': 0}
             logger.info('Cache cleared')
 
@@ -17,6 +17,11 @@ class Config:
     REASONING_EFFORT = 'low'
     TEXT_VERBOSITY = 'medium'
     MAX_OUTPUT_TOKENS = 2000
+    AGENT_TIMEOUT_S = float(os.getenv('AGENT_TIMEOUT_S', '30'))
+    FAST_PATH_SINGLE_AGENT = os.getenv('FAST_PATH_SINGLE_AGENT', 'true').lower() == 'true'
+    VS_LOCAL_EMBED = os.getenv('VS_LOCAL_EMBED', 'false').lower() == 'true'
+    VS_PREWARM = os.getenv('VS_PREWARM', 'true').lower() == 'true'
+    PARALLEL_SYNTHESIS_N = int(os.getenv('PARALLEL_SYNTHESIS_N', '1'))
     TEMPERATURE_CODING = 0.0
     TEMPERATURE_ANALYSIS = 1.0
     TEMPERATURE_CONVERSATION = 1.3
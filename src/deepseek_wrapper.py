@@ -9,10 +9,11 @@ class DeepSeekWrapper:
         self.client = OpenAI(api_key=Config.DEEPSEEK_API_KEY, base_url='https://api.deepseek.com')
         self.model = model
         self.is_reasoner = 'reasoner' in model.lower()
+        self.mock_mode = bool(Config.DEEPSEEK_API_KEY) and Config.DEEPSEEK_API_KEY.startswith('sk-demo')
 
     def generate(self, messages: List[Dict[str, str]]=None, input_text: str=None, instructions: str=None, temperature: float=None, max_tokens: int=None, stream: bool=False, tools: List[Dict[str, Any]]=None, **kwargs) -> str:
         # MOCK MODE: Intercept calls if using a dummy key
-        if Config.DEEPSEEK_API_KEY.startswith("sk-demo"):
+        if self.mock_mode:
             return self._generate_mock(messages, input_text, instructions)
 
         if messages is None:
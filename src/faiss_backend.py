@@ -0,0 +1,108 @@
+import faiss
+import numpy as np
+import orjson
+import os
+import sqlite3
+import threading
+import uuid
+from typing import List, Dict, Any, Optional
+
+class FaissIVFPQBackend:
+    TRAIN_SIZE = 100000
+
+    def __init__(self, persist_directory: str='./faiss_db', dim: int=1536, nlist: int=1024, m: int=32, nprobe: int=16):
+        self.persist_directory = persist_directory
+        self.nprobe = nprobe
+        os.makedirs(persist_directory, exist_ok=True)
+        self.index_path = os.path.join(persist_directory, 'index.faiss')
+        if os.path.exists(self.index_path):
+            self.index = faiss.read_index(self.index_path)
+        else:
+            # 1536-d float32 is ~6KB per vector; IVF + 32x8-bit PQ codes keep it at 128 bytes
+            self.index = faiss.index_factory(dim, f'IVF{nlist},PQ{m}x8', faiss.METRIC_INNER_PRODUCT)
+        # Documents and metadata live in a sidecar table keyed by the int64 ids stored in the index
+        self._db = sqlite3.connect(os.path.join(persist_directory, 'documents.sqlite3'), check_same_thread=False, isolation_level=None)
+        self._db.execute('CREATE TABLE IF NOT EXISTS documents (id INTEGER PRIMARY KEY, doc_id TEXT UNIQUE NOT NULL, document TEXT NOT NULL, metadata BLOB)')
+        self._lock = threading.Lock()
+
+    def add_documents(self, documents: List[str], embeddings: List[Any], metadatas: Optional[List[Dict[str, Any]]]=None, ids: Optional[List[str]]=None) -> None:
+        if not documents:
+            return
+        if ids is None:
+            ids = [uuid.uuid4().hex for _ in documents]
+        x = np.ascontiguousarray(embeddings, dtype=np.float32)
+        faiss.normalize_L2(x)
+        with self._lock:
+            if not self.index.is_trained:
+                if len(x) < self.index.nlist:
+                    raise ValueError(f'Need at least {self.index.nlist} vectors to train the IVF index, got {len(x)}')
+                self.index.train(x[:self.TRAIN_SIZE])
+            rows = [(doc_id, document, orjson.dumps(metadatas[i]) if metadatas else None) for i, (doc_id, document) in enumerate(zip(ids, documents))]
+            # Re-added documents get a fresh row id, so their old vectors must be dropped
+            stale_ids = self._int_ids(ids)
+            self._db.execute('BEGIN')
+            try:
+                self._db.executemany('INSERT OR REPLACE INTO documents (doc_id, document, metadata) VALUES (?, ?, ?)', rows)
+                int_ids = self._int_ids(ids)
+                self._db.execute('COMMIT')
+            except Exception:
+                self._db.execute('ROLLBACK')
+                raise
+            if len(stale_ids):
+                self.index.remove_ids(stale_ids)
+            self.index.add_with_ids(x, int_ids)
+            faiss.write_index(self.index, self.index_path)
+
+    def search(self, query_embedding: List[float], top_k: int=5, filter_metadata: Optional[Dict[str, Any]]=None) -> List[Dict[str, Any]]:
+        q = np.asarray([query_embedding], dtype=np.float32)
+        faiss.normalize_L2(q)
+        # Metadata filters are applied after the ANN search, so over-fetch when one is given
+        k = top_k * 4 if filter_metadata else top_k
+        # IVF-PQ indexes are not safe to search while add/remove mutate their inverted lists
+        with self._lock:
+            self.index.nprobe = self.nprobe
+            scores, int_ids = self.index.search(q, k)
+            hits = [(int(i), float(s)) for i, s in zip(int_ids[0], scores[0]) if i != -1]
+            if not hits:
+                return []
+            rows = {row[0]: row[1:] for row in self._db.execute(f"SELECT id, doc_id, document, metadata FROM documents WHERE id IN ({','.join('?' * len(hits))})", [i for i, _ in hits])}
+        formatted_results = []
+        for int_id, score in hits:
+            if int_id not in rows:
+                continue
+            doc_id, document, metadata = rows[int_id]
+            metadata = orjson.loads(metadata) if metadata else {}
+            if filter_metadata and any(metadata.get(key) != value for key, value in filter_metadata.items()):
+                continue
+            formatted_results.append({'id': doc_id, 'document': document, 'metadata': metadata, 'distance': 1.0 - score})
+            if len(formatted_results) == top_k:
+                break
+        return formatted_results
+
+    def count(self) -> int:
+        with self._lock:
+            return self.index.ntotal
+
+    def delete(self, ids: List[str]) -> None:
+        if not ids:
+            return
+        with self._lock:
+            int_ids = self._int_ids(ids)
+            self.index.remove_ids(int_ids)
+            self._db.execute(f"DELETE FROM documents WHERE doc_id IN ({','.join('?' * len(ids))})", ids)
+            faiss.write_index(self.index, self.index_path)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _int_ids(self, ids: List[str]) -> np.ndarray:
+        rows = dict(self._db.execute(f"SELECT doc_id, id FROM documents WHERE doc_id IN ({','.join('?' * len(ids))})", ids).fetchall())
+        return np.asarray([rows[doc_id] for doc_id in ids if doc_id in rows], dtype=np.int64)
+
+    def get_by_id(self, ids: List[str]) -> List[Dict[str, Any]]:
+        if not ids:
+            return []
+        with self._lock:
+            rows = {row[0]: row[1:] for row in self._db.execute(f"SELECT doc_id, document, metadata FROM documents WHERE doc_id IN ({','.join('?' * len(ids))})", ids)}
+        return [{'id': doc_id, 'document': rows[doc_id][0], 'metadata': orjson.loads(rows[doc_id][1]) if rows[doc_id][1] else {}} for doc_id in ids if doc_id in rows]
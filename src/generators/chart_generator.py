@@ -1,21 +1,44 @@
-import matplotlib.pyplot as plt
-import matplotlib
 from pathlib import Path
 from typing import Optional
 import io
+import threading
 from PIL import Image
-matplotlib.use('Agg')
 from src.schemas import ChartSpec
 
+def _new_figure(figsize: tuple, dpi: int):
+    from matplotlib.figure import Figure
+    return Figure(figsize=figsize, dpi=dpi)
+
 class ChartGenerator:
+    BYTES_COMPRESS_LEVEL = 1
 
     def __init__(self, dpi: int=150, figsize: tuple=(10, 6)):
         self.dpi = dpi
         self.figsize = figsize
         self.default_colors = ['#3498DB', '#2ECC71', '#E74C3C', '#F39C12', '#9B59B6', '#1ABC9C']
+        self._fig = None
+        self._ax = None
+        self._lock = threading.Lock()
+
+    def _get_axes(self):
+        if self._fig is None:
+            self._fig = _new_figure(self.figsize, self.dpi)
+        else:
+            self._fig.clear()
+        self._ax = self._fig.add_subplot()
+        return (self._fig, self._ax)
+
+    def close(self):
+        with self._lock:
+            self._fig = None
+            self._ax = None
 
     def generate(self, chart_spec: ChartSpec, output_path: Optional[str]=None, return_bytes: bool=False):
-        fig, ax = plt.subplots(figsize=self.figsize, dpi=self.dpi)
+        with self._lock:
+            return self._render(chart_spec, output_path, return_bytes)
+
+    def _render(self, chart_spec: ChartSpec, output_path: Optional[str], return_bytes: bool):
+        fig, ax = self._get_axes()
         colors = chart_spec.colors if chart_spec.colors else self.default_colors
         if chart_spec.type == 'bar':
             self._generate_bar(ax, chart_spec, colors)
@@ -37,25 +60,21 @@ class ChartGenerator:
         ax.grid(True, alpha=0.3, linestyle='--')
         ax.spines['top'].set_visible(False)
         ax.spines['right'].set_visible(False)
-        plt.tight_layout()
+        fig.tight_layout()
         if return_bytes:
             buf = io.BytesIO()
-            plt.savefig(buf, format='png', dpi=self.dpi, bbox_inches='tight')
+            fig.savefig(buf, format='png', dpi=self.dpi, bbox_inches='tight', pil_kwargs={'compress_level': self.BYTES_COMPRESS_LEVEL})
             buf.seek(0)
-            plt.close(fig)
             return buf.getvalue()
         else:
             if not output_path:
                 output_path = f'chart_{chart_spec.type}_{id(chart_spec)}.png'
-            plt.savefig(output_path, dpi=self.dpi, bbox_inches='tight')
-            plt.close(fig)
+            fig.savefig(output_path, dpi=self.dpi, bbox_inches='tight')
             return output_path
 
     def _generate_bar(self, ax, spec: ChartSpec, colors):
-        bars = ax.bar(spec.x_data, spec.y_data, color=colors[:len(spec.x_data)])
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width() / 2.0, height, f'{height:,.0f}', ha='center', va='bottom', fontsize=10)
+        bars = ax.bar(spec.x_data, spec.y_data, color=colors)
+        ax.bar_label(bars, fmt='{:,.0f}', fontsize=10)
 
     def _generate_line(self, ax, spec: ChartSpec, colors):
         ax.plot(spec.x_data, spec.y_data, color=colors[0], linewidth=2.5, marker='o', markersize=6)
@@ -66,7 +85,7 @@ class ChartGenerator:
         ax.scatter(spec.x_data, spec.y_data, color=colors[0], s=100, alpha=0.6, edgecolors='black', linewidth=1)
 
     def _generate_pie(self, ax, spec: ChartSpec, colors):
-        wedges, texts, autotexts = ax.pie(spec.y_data, labels=spec.x_data, colors=colors[:len(spec.x_data)], autopct='%1.1f%%', startangle=90)
+        wedges, texts, autotexts = ax.pie(spec.y_data, labels=spec.x_data, colors=colors, autopct='%1.1f%%', startangle=90)
         for text in texts:
             text.set_fontsize(11)
         for autotext in autotexts:
@@ -78,7 +97,7 @@ class ChartGenerator:
         ax.fill_between(spec.x_data, spec.y_data, color=colors[0], alpha=0.3)
         ax.plot(spec.x_data, spec.y_data, color=colors[0], linewidth=2)
 
-    def generate_metric_comparison(self, metrics: dict, title: str='Key Metrics', output_path: Optional[str]=None):
+    def generate_metric_comparison(self, metrics: dict, title: str='Key Metrics', output_path: Optional[str]=None, return_bytes: bool=False):
         from src.schemas import ChartSpec
         spec = ChartSpec(type='bar', title=title, x_label='Metric', y_label='Value', x_data=list(metrics.keys()), y_data=list(metrics.values()))
-        return self.generate(spec, output_path)
\ No newline at end of file
+        return self.generate(spec, output_path, return_bytes)
\ No newline at end of file
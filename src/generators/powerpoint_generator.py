@@ -1,15 +1,125 @@
+import pptx
 from pptx import Presentation
 from pptx.util import Inches, Pt
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
 from pptx.dml.color import RGBColor
+from pptx.oxml.ns import qn
+from lxml import etree
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Tuple, Any
 from datetime import datetime
 import io
+import logging
+import threading
 from src.schemas import AgentOutput, Recommendation
 from .chart_generator import ChartGenerator
+logger = logging.getLogger(__name__)
+_TEMPLATE_BYTES = (Path(pptx.__file__).parent / 'templates' / 'default.pptx').read_bytes()
+_WHITE = RGBColor(255, 255, 255)
+_LIGHT_GRAY = RGBColor(200, 200, 200)
+_PRIORITY_EMOJI = {'high': '🔴', 'medium': '🟡', 'low': '🟢'}
+_DETAIL_TEMPLATE = ('• Agent: {agent}', '• Model: {model}', '• Confidence: {confidence}', '• Generated: {generated}')
+_PT_8 = Pt(8)
+_PT_10 = Pt(10)
+_PT_11 = Pt(11)
+_PT_12 = Pt(12)
+_PT_13 = Pt(13)
+_PT_14 = Pt(14)
+_PT_15 = Pt(15)
+_PT_16 = Pt(16)
+_PT_18 = Pt(18)
+_PT_20 = Pt(20)
+_PT_32 = Pt(32)
+_PT_44 = Pt(44)
+_IN_0_3 = Inches(0.3)
+_IN_0_5 = Inches(0.5)
+_IN_0_6 = Inches(0.6)
+_IN_1 = Inches(1)
+_IN_1_5 = Inches(1.5)
+_IN_2_5 = Inches(2.5)
+_IN_4_2 = Inches(4.2)
+_IN_5 = Inches(5)
+_IN_6_5 = Inches(6.5)
+_IN_7 = Inches(7)
+_IN_7_5 = Inches(7.5)
+_IN_8 = Inches(8)
+_IN_9 = Inches(9)
+_IN_10 = Inches(10)
+
+def _bulk_write_paragraphs(text_frame, entries):
+    """Append `(text, size, bold, level, space_after, space_before)` entries as `<a:p>` elements.
+
+    Paragraph properties are written straight into the frame's txBody instead of going
+    through a `_Paragraph` proxy per attribute. `None` leaves a property unset, and the
+    single empty paragraph left behind by `text_frame.clear()` is replaced.
+    """
+    if not entries:
+        return
+    txBody = text_frame._txBody
+    p_lst = txBody.p_lst
+    if len(p_lst) == 1 and not text_frame.text:
+        txBody.remove(p_lst[0])
+    for text, size, bold, level, space_after, space_before in entries:
+        p = etree.SubElement(txBody, qn('a:p'))
+        pPr = etree.SubElement(p, qn('a:pPr'))
+        if level:
+            pPr.set('lvl', str(level))
+        if space_before is not None:
+            etree.SubElement(etree.SubElement(pPr, qn('a:spcBef')), qn('a:spcPts')).set('val', str(space_before.centipoints))
+        if space_after is not None:
+            etree.SubElement(etree.SubElement(pPr, qn('a:spcAft')), qn('a:spcPts')).set('val', str(space_after.centipoints))
+        defRPr = etree.SubElement(pPr, qn('a:defRPr'))
+        if size is not None:
+            defRPr.set('sz', str(size.centipoints))
+        if bold:
+            defRPr.set('b', '1')
+        p.append_text(text)
+
+def _set_font(p, size=None, bold=None, rgb=None):
+    """Write a paragraph's default run size, weight and color onto its `<a:defRPr>` in one pass."""
+    defRPr = p._p.get_or_add_pPr().get_or_add_defRPr()
+    if size is not None:
+        defRPr.set('sz', str(size.centipoints))
+    if bold is not None:
+        defRPr.set('b', '1' if bold else '0')
+    if rgb is not None:
+        defRPr.get_or_change_to_solidFill().get_or_change_to_srgbClr().set('val', str(rgb))
+
+_METRIC_CHART_CACHE_SIZE = 128
+_metric_charts: 'OrderedDict[tuple, bytes]' = OrderedDict()
+_metric_charts_lock = threading.Lock()
+
+def _metric_chart_bytes(chart_gen: ChartGenerator, items: Tuple[Tuple[str, Any], ...]) -> Optional[bytes]:
+    # Keyed on content and render settings, not the generator, so every PowerPointGenerator shares the cache
+    # while rendering on its own reused figure
+    key = (items, chart_gen.dpi, tuple(chart_gen.figsize))
+    try:
+        hash(key)
+    except TypeError:
+        # Unhashable metric values (lists, dicts) are rendered uncached and usually fall back to text
+        key = None
+    if key is not None:
+        with _metric_charts_lock:
+            if key in _metric_charts:
+                _metric_charts.move_to_end(key)
+                return _metric_charts[key]
+    try:
+        chart = chart_gen.generate_metric_comparison(metrics=dict(items), title='', return_bytes=True)
+    except Exception as e:
+        logger.warning('Metric chart skipped: %s', e)
+        return None
+    # Failures are not cached, so a transient render error does not disable the chart for good
+    if key is not None and chart:
+        with _metric_charts_lock:
+            _metric_charts[key] = chart
+            while len(_metric_charts) > _METRIC_CHART_CACHE_SIZE:
+                _metric_charts.popitem(last=False)
+    return chart
 
 class ValtricTheme:
+    __slots__ = ()
     PRIMARY = '#2C3E50'
     SECONDARY = '#3498DB'
     ACCENT = '#E74C3C'
@@ -19,6 +129,7 @@ class ValtricTheme:
     BACKGROUND = '#FFFFFF'
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def hex_to_rgb(hex_color: str) -> RGBColor:
         hex_color = hex_color.lstrip('#')
         return RGBColor(*[int(hex_color[i:i + 2], 16) for i in (0, 2, 4)])
@@ -32,13 +143,13 @@ class ValtricTheme:
 class PowerPointGenerator:
 
     def __init__(self, theme: ValtricTheme=None):
-        self.theme = theme or ValtricTheme()
+        self.theme = theme or ValtricTheme
         self.chart_gen = ChartGenerator()
 
     def generate(self, agent_output: AgentOutput, output_path: Optional[str]=None, template: str='executive_summary') -> str:
-        prs = Presentation()
-        prs.slide_width = Inches(10)
-        prs.slide_height = Inches(7.5)
+        prs = Presentation(io.BytesIO(_TEMPLATE_BYTES))
+        prs.slide_width = _IN_10
+        prs.slide_height = _IN_7_5
         if template == 'executive_summary':
             self._build_executive_summary(prs, agent_output)
         else:
@@ -46,56 +157,58 @@ class PowerPointGenerator:
         if not output_path:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             output_path = f'presentation_{agent_output.agent}_{timestamp}.pptx'
-        prs.save(output_path)
-        print(f'✓ PowerPoint saved: {output_path}')
+        buffer = io.BytesIO()
+        prs.save(buffer)
+        Path(output_path).write_bytes(buffer.getbuffer())
+        logger.info('PowerPoint saved: %s', output_path)
         return output_path
 
     def _build_executive_summary(self, prs: Presentation, output: AgentOutput):
-        self._add_title_slide(prs, output)
-        self._add_executive_summary_slide(prs, output)
-        self._add_context_slide(prs, output)
-        self._add_key_findings_slide(prs, output)
+        layouts = prs.slide_layouts
+        layout_body = layouts[1]
+        layout_chart = layouts[5]
+        layout_title = layouts[6]
+        self._add_title_slide(prs, output, layout_title)
+        self._add_executive_summary_slide(prs, output, layout_body)
+        self._add_context_slide(prs, output, layout_body)
+        self._add_key_findings_slide(prs, output, layout_body)
         if output.findings.metrics:
-            self._add_metrics_slides(prs, output)
+            self._add_metrics_slides(prs, output, layout_chart)
         if output.findings.risks:
-            self._add_risks_slide(prs, output)
+            self._add_risks_slide(prs, output, layout_body)
         if output.findings.recommendations:
-            self._add_recommendations_slide(prs, output)
-        self._add_next_steps_slide(prs, output)
+            self._add_recommendations_slide(prs, output, layout_body)
+        self._add_next_steps_slide(prs, output, layout_body)
         if output.research_citations:
-            self._add_appendix_slide(prs, output)
+            self._add_appendix_slide(prs, output, layout_body)
 
-    def _add_title_slide(self, prs: Presentation, output: AgentOutput):
-        slide = prs.slides.add_slide(prs.slide_layouts[6])
+    def _add_title_slide(self, prs: Presentation, output: AgentOutput, layout):
+        slide = prs.slides.add_slide(layout)
         background = slide.background
         fill = background.fill
         fill.solid()
         fill.fore_color.rgb = self.theme.hex_to_rgb(self.theme.PRIMARY)
-        title_box = slide.shapes.add_textbox(Inches(1), Inches(2.5), Inches(8), Inches(1.5))
+        title_box = slide.shapes.add_textbox(_IN_1, _IN_2_5, _IN_8, _IN_1_5)
         title_frame = title_box.text_frame
         title_frame.text = 'Business Intelligence Analysis'
         title_para = title_frame.paragraphs[0]
         title_para.alignment = PP_ALIGN.CENTER
-        title_para.font.size = Pt(44)
-        title_para.font.bold = True
-        title_para.font.color.rgb = RGBColor(255, 255, 255)
-        subtitle_box = slide.shapes.add_textbox(Inches(1.5), Inches(4.2), Inches(7), Inches(1))
+        _set_font(title_para, _PT_44, bold=True, rgb=_WHITE)
+        subtitle_box = slide.shapes.add_textbox(_IN_1_5, _IN_4_2, _IN_7, _IN_1)
         subtitle_frame = subtitle_box.text_frame
         subtitle_frame.text = output.query[:100] + ('...' if len(output.query) > 100 else '')
         subtitle_para = subtitle_frame.paragraphs[0]
         subtitle_para.alignment = PP_ALIGN.CENTER
-        subtitle_para.font.size = Pt(20)
-        subtitle_para.font.color.rgb = RGBColor(255, 255, 255)
-        footer_box = slide.shapes.add_textbox(Inches(1), Inches(6.5), Inches(8), Inches(0.5))
+        _set_font(subtitle_para, _PT_20, rgb=_WHITE)
+        footer_box = slide.shapes.add_textbox(_IN_1, _IN_6_5, _IN_8, _IN_0_5)
         footer_frame = footer_box.text_frame
         footer_frame.text = f"Prepared by ValtricAI | {output.timestamp.strftime('%B %d, %Y')}"
         footer_para = footer_frame.paragraphs[0]
         footer_para.alignment = PP_ALIGN.CENTER
-        footer_para.font.size = Pt(12)
-        footer_para.font.color.rgb = RGBColor(200, 200, 200)
+        _set_font(footer_para, _PT_12, rgb=_LIGHT_GRAY)
 
-    def _add_executive_summary_slide(self, prs: Presentation, output: AgentOutput):
-        slide = prs.slides.add_slide(prs.slide_layouts[1])
+    def _add_executive_summary_slide(self, prs: Presentation, output: AgentOutput, layout):
+        slide = prs.slides.add_slide(layout)
         title = slide.shapes.title
         title.text = 'Executive Summary'
         self._style_title(title)
@@ -104,22 +217,21 @@ class PowerPointGenerator:
         text_frame.clear()
         p = text_frame.paragraphs[0]
         p.text = output.findings.executive_summary
-        p.font.size = Pt(14)
-        p.space_after = Pt(12)
-        if output.findings.metrics and len(output.findings.metrics) > 0:
+        _set_font(p, _PT_14)
+        p.space_after = _PT_12
+        if output.findings.metrics:
             p = text_frame.add_paragraph()
             p.text = '\nKey Metrics:'
-            p.font.bold = True
-            p.font.size = Pt(16)
-            p.space_before = Pt(20)
+            _set_font(p, _PT_16, bold=True)
+            p.space_before = _PT_20
             for i, (name, metric) in enumerate(list(output.findings.metrics.items())[:3]):
                 p = text_frame.add_paragraph()
                 p.text = f"• {name.replace('_', ' ').title()}: {metric.value} {metric.unit}"
-                p.font.size = Pt(14)
+                _set_font(p, _PT_14)
                 p.level = 1
 
-    def _add_context_slide(self, prs: Presentation, output: AgentOutput):
-        slide = prs.slides.add_slide(prs.slide_layouts[1])
+    def _add_context_slide(self, prs: Presentation, output: AgentOutput, layout):
+        slide = prs.slides.add_slide(layout)
         title = slide.shapes.title
         title.text = 'Context'
         self._style_title(title)
@@ -128,89 +240,79 @@ class PowerPointGenerator:
         text_frame.clear()
         p = text_frame.paragraphs[0]
         p.text = 'Question'
-        p.font.bold = True
-        p.font.size = Pt(16)
+        _set_font(p, _PT_16, bold=True)
         p = text_frame.add_paragraph()
         p.text = output.query
-        p.font.size = Pt(14)
-        p.space_after = Pt(20)
+        _set_font(p, _PT_14)
+        p.space_after = _PT_20
         p = text_frame.add_paragraph()
         p.text = 'Why This Matters'
-        p.font.bold = True
-        p.font.size = Pt(16)
-        p.space_before = Pt(20)
+        _set_font(p, _PT_16, bold=True)
+        p.space_before = _PT_20
         p = text_frame.add_paragraph()
         p.text = f"This analysis provides {output.agent.replace('_', ' ')} insights to inform strategic business decisions."
-        p.font.size = Pt(14)
+        _set_font(p, _PT_14)
         p = text_frame.add_paragraph()
         p.text = '\nAnalysis Details'
-        p.font.bold = True
-        p.font.size = Pt(16)
-        p.space_before = Pt(20)
-        details = [f"Agent: {output.agent.replace('_', ' ').title()}", f'Model: {output.metadata.model}', f'Confidence: {output.metadata.confidence.title()}', f"Generated: {output.timestamp.strftime('%B %d, %Y at %I:%M %p')}"]
-        for detail in details:
+        _set_font(p, _PT_16, bold=True)
+        p.space_before = _PT_20
+        details = {'agent': output.agent.replace('_', ' ').title(), 'model': output.metadata.model, 'confidence': output.metadata.confidence.title(), 'generated': output.timestamp.strftime('%B %d, %Y at %I:%M %p')}
+        for template in _DETAIL_TEMPLATE:
             p = text_frame.add_paragraph()
-            p.text = f'• {detail}'
-            p.font.size = Pt(12)
+            p.text = template.format_map(details)
+            _set_font(p, _PT_12)
             p.level = 1
 
-    def _add_key_findings_slide(self, prs: Presentation, output: AgentOutput):
-        slide = prs.slides.add_slide(prs.slide_layouts[1])
+    def _add_key_findings_slide(self, prs: Presentation, output: AgentOutput, layout):
+        slide = prs.slides.add_slide(layout)
         title = slide.shapes.title
         title.text = 'Key Findings'
         self._style_title(title)
         body_shape = slide.placeholders[1]
         text_frame = body_shape.text_frame
         text_frame.clear()
-        for i, finding in enumerate(output.findings.key_findings, 1):
-            p = text_frame.paragraphs[0] if i == 1 else text_frame.add_paragraph()
-            p.text = finding
-            p.font.size = Pt(14)
-            p.space_after = Pt(12)
-            p.level = 0
-            p.text = f'• {finding}'
+        _bulk_write_paragraphs(text_frame, [(f'• {finding}', _PT_14, False, 0, _PT_12, None) for finding in output.findings.key_findings])
 
-    def _add_metrics_slides(self, prs: Presentation, output: AgentOutput):
+    def _add_metrics_slides(self, prs: Presentation, output: AgentOutput, layout):
         metrics_dict = {name.replace('_', ' ').title(): metric.value for name, metric in output.findings.metrics.items()}
         metric_items = list(metrics_dict.items())
         chunk_size = 6
-        for chunk_idx in range(0, len(metric_items), chunk_size):
-            chunk = dict(metric_items[chunk_idx:chunk_idx + chunk_size])
-            slide = prs.slides.add_slide(prs.slide_layouts[5])
-            title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(9), Inches(0.6))
+        chunks = [dict(metric_items[chunk_idx:chunk_idx + chunk_size]) for chunk_idx in range(0, len(metric_items), chunk_size)]
+        charts = self._render_metric_charts(chunks)
+        slides = prs.slides
+        for part, (chunk, chart_bytes) in enumerate(zip(chunks, charts), 1):
+            slide = slides.add_slide(layout)
+            title_box = slide.shapes.add_textbox(_IN_0_5, _IN_0_3, _IN_9, _IN_0_6)
             title_frame = title_box.text_frame
-            title_frame.text = f'Key Metrics' + (f' (Part {chunk_idx // chunk_size + 1})' if len(metric_items) > chunk_size else '')
+            title_frame.text = f'Key Metrics' + (f' (Part {part})' if len(metric_items) > chunk_size else '')
             title_para = title_frame.paragraphs[0]
-            title_para.font.size = Pt(32)
-            title_para.font.bold = True
-            title_para.font.color.rgb = self.theme.hex_to_rgb(self.theme.PRIMARY)
-            chart_bytes = self.chart_gen.generate_metric_comparison(metrics=chunk, title='', output_path=None)
-            metrics_box = slide.shapes.add_textbox(Inches(1), Inches(1.5), Inches(8), Inches(5))
-            metrics_frame = metrics_box.text_frame
-            for name, value in chunk.items():
-                p = metrics_frame.paragraphs[0] if name == list(chunk.keys())[0] else metrics_frame.add_paragraph()
-                p.text = f'{name}: {value:,}' if isinstance(value, (int, float)) else f'{name}: {value}'
-                p.font.size = Pt(18)
-                p.space_after = Pt(15)
+            _set_font(title_para, _PT_32, bold=True, rgb=self.theme.hex_to_rgb(self.theme.PRIMARY))
+            if chart_bytes:
+                slide.shapes.add_picture(io.BytesIO(chart_bytes), _IN_1, _IN_1_5, width=_IN_8)
+                continue
+            metrics_box = slide.shapes.add_textbox(_IN_1, _IN_1_5, _IN_8, _IN_5)
+            entries = [(f'{name}: {value:,}' if isinstance(value, (int, float)) else f'{name}: {value}', _PT_18, False, 0, _PT_15, None) for name, value in chunk.items()]
+            _bulk_write_paragraphs(metrics_box.text_frame, entries)
+
+    def _render_metric_charts(self, chunks: List[dict]) -> List[Optional[bytes]]:
+        # Agg rendering holds the GIL, so charts are drawn serially on the one shared figure
+        return [_metric_chart_bytes(self.chart_gen, tuple(chunk.items())) for chunk in chunks]
 
-    def _add_risks_slide(self, prs: Presentation, output: AgentOutput):
-        slide = prs.slides.add_slide(prs.slide_layouts[1])
+    def _add_risks_slide(self, prs: Presentation, output: AgentOutput, layout):
+        slide = prs.slides.add_slide(layout)
         title = slide.shapes.title
         title.text = 'Risks & Considerations'
         self._style_title(title)
         body_shape = slide.placeholders[1]
         text_frame = body_shape.text_frame
         text_frame.clear()
-        for i, risk in enumerate(output.findings.risks, 1):
-            p = text_frame.paragraphs[0] if i == 1 else text_frame.add_paragraph()
-            p.text = f'• {risk}'
-            p.font.size = Pt(14)
-            p.space_after = Pt(12)
+        _bulk_write_paragraphs(text_frame, [(f'• {risk}', _PT_14, False, 0, _PT_12, None) for risk in output.findings.risks])
 
-    def _add_recommendations_slide(self, prs: Presentation, output: AgentOutput):
+    def _add_recommendations_slide(self, prs: Presentation, output: AgentOutput, layout):
+        slides = prs.slides
         for rec in output.findings.recommendations:
-            slide = prs.slides.add_slide(prs.slide_layouts[1])
-            priority_emoji = '🔴' if rec.priority == 'high' else '🟡' if rec.priority == 'medium' else '🟢'
+            slide = slides.add_slide(layout)
+            priority_emoji = _PRIORITY_EMOJI.get(rec.priority, '🟢')
             title = slide.shapes.title
             title.text = f'{priority_emoji} {rec.title}'
             self._style_title(title)
@@ -219,82 +321,64 @@ class PowerPointGenerator:
             text_frame.clear()
             p = text_frame.paragraphs[0]
             p.text = 'Expected Impact'
-            p.font.bold = True
-            p.font.size = Pt(16)
+            _set_font(p, _PT_16, bold=True)
             p = text_frame.add_paragraph()
             p.text = rec.impact
-            p.font.size = Pt(14)
-            p.space_after = Pt(20)
+            _set_font(p, _PT_14)
+            p.space_after = _PT_20
             p = text_frame.add_paragraph()
             p.text = 'Rationale'
-            p.font.bold = True
-            p.font.size = Pt(16)
-            p.space_before = Pt(15)
+            _set_font(p, _PT_16, bold=True)
+            p.space_before = _PT_15
             p = text_frame.add_paragraph()
             p.text = rec.rationale
-            p.font.size = Pt(14)
-            p.space_after = Pt(20)
+            _set_font(p, _PT_14)
+            p.space_after = _PT_20
             p = text_frame.add_paragraph()
             p.text = 'Action Items'
-            p.font.bold = True
-            p.font.size = Pt(16)
-            p.space_before = Pt(15)
-            for action in rec.action_items:
-                p = text_frame.add_paragraph()
-                p.text = f'• {action}'
-                p.font.size = Pt(13)
-                p.level = 1
+            _set_font(p, _PT_16, bold=True)
+            p.space_before = _PT_15
+            _bulk_write_paragraphs(text_frame, [(f'• {action}', _PT_13, False, 1, None, None) for action in rec.action_items])
 
-    def _add_next_steps_slide(self, prs: Presentation, output: AgentOutput):
-        slide = prs.slides.add_slide(prs.slide_layouts[1])
+    def _add_next_steps_slide(self, prs: Presentation, output: AgentOutput, layout):
+        slide = prs.slides.add_slide(layout)
         title = slide.shapes.title
         title.text = 'Next Steps'
         self._style_title(title)
         body_shape = slide.placeholders[1]
+        if not output.findings.recommendations:
+            body_shape._element.getparent().remove(body_shape._element)
+            return
         text_frame = body_shape.text_frame
         text_frame.clear()
-        if output.findings.recommendations:
-            p = text_frame.paragraphs[0]
-            p.text = 'Immediate Actions (High Priority)'
-            p.font.bold = True
-            p.font.size = Pt(16)
-            for rec in output.findings.recommendations:
-                if rec.priority == 'high':
-                    p = text_frame.add_paragraph()
-                    p.text = f'• {rec.title}'
-                    p.font.size = Pt(14)
-                    p.space_after = Pt(8)
-            p = text_frame.add_paragraph()
-            p.text = '\n30-Day Actions (Medium Priority)'
-            p.font.bold = True
-            p.font.size = Pt(16)
-            p.space_before = Pt(20)
-            for rec in output.findings.recommendations:
-                if rec.priority == 'medium':
-                    p = text_frame.add_paragraph()
-                    p.text = f'• {rec.title}'
-                    p.font.size = Pt(14)
-                    p.space_after = Pt(8)
+        buckets = {'high': [], 'medium': [], 'low': []}
+        for rec in output.findings.recommendations:
+            buckets.get(rec.priority, buckets['low']).append(rec.title)
+        entries = [('Immediate Actions (High Priority)', _PT_16, True, 0, None, None)]
+        add = entries.append
+        for rec_title in buckets['high']:
+            add((f'• {rec_title}', _PT_14, False, 0, _PT_8, None))
+        add(('\n30-Day Actions (Medium Priority)', _PT_16, True, 0, None, _PT_20))
+        for rec_title in buckets['medium']:
+            add((f'• {rec_title}', _PT_14, False, 0, _PT_8, None))
+        _bulk_write_paragraphs(text_frame, entries)
 
-    def _add_appendix_slide(self, prs: Presentation, output: AgentOutput):
-        slide = prs.slides.add_slide(prs.slide_layouts[1])
+    def _add_appendix_slide(self, prs: Presentation, output: AgentOutput, layout):
+        slide = prs.slides.add_slide(layout)
         title = slide.shapes.title
         title.text = 'References'
         self._style_title(title)
         body_shape = slide.placeholders[1]
         text_frame = body_shape.text_frame
         text_frame.clear()
-        for i, citation in enumerate(output.research_citations, 1):
-            p = text_frame.paragraphs[0] if i == 1 else text_frame.add_paragraph()
+        entries = []
+        for citation in output.research_citations:
             authors_str = citation.authors[0] + (' et al.' if len(citation.authors) > 1 else '')
             citation_text = f'{authors_str} ({citation.year}). {citation.title}.'
             if citation.url:
                 citation_text += f' {citation.url}'
-            p.text = citation_text
-            p.font.size = Pt(11)
-            p.space_after = Pt(10)
+            entries.append((citation_text, _PT_11, False, 0, _PT_10, None))
+        _bulk_write_paragraphs(text_frame, entries)
 
     def _style_title(self, title_shape):
-        title_shape.text_frame.paragraphs[0].font.size = Pt(32)
-        title_shape.text_frame.paragraphs[0].font.bold = True
-        title_shape.text_frame.paragraphs[0].font.color.rgb = self.theme.hex_to_rgb(self.theme.PRIMARY)
\ No newline at end of file
+        _set_font(title_shape.text_frame.paragraphs[0], _PT_32, bold=True, rgb=self.theme.hex_to_rgb(self.theme.PRIMARY))
\ No newline at end of file
@@ -1,18 +1,55 @@
 import os
-from openai import OpenAI
-from typing import List, Dict, Any, Optional
+import copy
+import json
+import asyncio
+import importlib.util
+import weakref
+from functools import lru_cache
+import httpx
+from openai import OpenAI, AsyncOpenAI
+from typing import List, Dict, Any, Optional, Tuple, Iterator, AsyncIterator
 from src.config import Config
 
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=64)
+_HTTP2 = importlib.util.find_spec('h2') is not None
+_async_clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]' = weakref.WeakKeyDictionary()
+
+@lru_cache(maxsize=1)
+def _get_shared_client() -> OpenAI:
+    return OpenAI(api_key=Config.OPENAI_API_KEY, http_client=httpx.Client(http2=_HTTP2, limits=_HTTP_LIMITS))
+
+def _get_shared_async_client() -> AsyncOpenAI:
+    # httpx async pools are bound to the loop that first uses them
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = AsyncOpenAI(api_key=Config.OPENAI_API_KEY, http_client=httpx.AsyncClient(http2=_HTTP2, limits=_HTTP_LIMITS))
+    return client
+
+@lru_cache(maxsize=64)
+def _convert_tools_cached(tools_key: Tuple[Tuple[Optional[str], str], ...]) -> Tuple[Dict[str, Any], ...]:
+    converted_tools = []
+    for tool_type, tool_json in tools_key:
+        tool = json.loads(tool_json)
+        if tool_type == 'function' and 'function' in tool:
+            func = tool['function']
+            converted_tools.append({'type': 'function', 'name': func.get('name'), 'description': func.get('description'), 'parameters': func.get('parameters', {})})
+        else:
+            converted_tools.append(tool)
+    return tuple(converted_tools)
+
 class GPT5Wrapper:
 
     def __init__(self):
-        self.client = OpenAI(api_key=Config.OPENAI_API_KEY)
+        self.client = _get_shared_client()
+        self._aclient = None
         self.model = Config.OPENAI_MODEL
         self.is_gpt5 = Config.is_gpt5()
+        self.mock_mode = bool(Config.OPENAI_API_KEY) and Config.OPENAI_API_KEY.startswith('sk-demo')
 
     def generate(self, messages: List[Dict[str, str]]=None, input_text: str=None, instructions: str=None, reasoning_effort: str=None, text_verbosity: str=None, max_output_tokens: int=None, tools: List[Dict[str, Any]]=None) -> str:
         # MOCK MODE: Intercept calls if using a dummy key
-        if Config.OPENAI_API_KEY.startswith("sk-demo"):
+        if self.mock_mode:
             return self._generate_mock(messages, input_text, instructions, tools)
 
         try:
@@ -23,6 +60,62 @@ class GPT5Wrapper:
         except Exception as e:
             return f'Error generating response: {str(e)}'
 
+    async def agenerate(self, messages: List[Dict[str, str]]=None, input_text: str=None, instructions: str=None, reasoning_effort: str=None, text_verbosity: str=None, max_output_tokens: int=None, tools: List[Dict[str, Any]]=None) -> str:
+        if self.mock_mode:
+            return await asyncio.to_thread(self._generate_mock, messages, input_text, instructions, tools)
+        try:
+            if self.is_gpt5:
+                request_params = self._build_gpt5_request(messages=messages, input_text=input_text, instructions=instructions, reasoning_effort=reasoning_effort or Config.REASONING_EFFORT, text_verbosity=text_verbosity or Config.TEXT_VERBOSITY, max_output_tokens=max_output_tokens or Config.MAX_OUTPUT_TOKENS, tools=tools)
+                response = await self.aclient.responses.create(**request_params)
+                return self._extract_text_from_response(response)
+            request_params = self._build_chat_request(messages=messages, max_tokens=max_output_tokens or Config.MAX_OUTPUT_TOKENS, tools=tools)
+            response = await self.aclient.chat.completions.create(**request_params)
+            return response.choices[0].message.content
+        except Exception as e:
+            return f'Error generating response: {str(e)}'
+
+    async def agenerate_stream(self, messages: List[Dict[str, str]]=None, input_text: str=None, instructions: str=None, reasoning_effort: str=None, text_verbosity: str=None, max_output_tokens: int=None, tools: List[Dict[str, Any]]=None) -> AsyncIterator[str]:
+        """Async counterpart of generate_stream using the shared async client."""
+        if self.mock_mode:
+            yield await asyncio.to_thread(self._generate_mock, messages, input_text, instructions, tools)
+            return
+        try:
+            if self.is_gpt5:
+                request_params = self._build_gpt5_request(messages=messages, input_text=input_text, instructions=instructions, reasoning_effort=reasoning_effort or Config.REASONING_EFFORT, text_verbosity=text_verbosity or Config.TEXT_VERBOSITY, max_output_tokens=max_output_tokens or Config.MAX_OUTPUT_TOKENS, tools=tools)
+                async for event in await self.aclient.responses.create(**request_params, stream=True):
+                    if event.type == 'response.output_text.delta':
+                        yield event.delta
+            else:
+                request_params = self._build_chat_request(messages=messages, max_tokens=max_output_tokens or Config.MAX_OUTPUT_TOKENS, tools=tools)
+                async for chunk in await self.aclient.chat.completions.create(**request_params, stream=True):
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+        except Exception as e:
+            yield f'Error generating response: {str(e)}'
+
+    def generate_stream(self, messages: List[Dict[str, str]]=None, input_text: str=None, instructions: str=None, reasoning_effort: str=None, text_verbosity: str=None, max_output_tokens: int=None, tools: List[Dict[str, Any]]=None) -> Iterator[str]:
+        """Yield response text deltas as the model produces them."""
+        if self.mock_mode:
+            yield self._generate_mock(messages, input_text, instructions, tools)
+            return
+        try:
+            if self.is_gpt5:
+                request_params = self._build_gpt5_request(messages=messages, input_text=input_text, instructions=instructions, reasoning_effort=reasoning_effort or Config.REASONING_EFFORT, text_verbosity=text_verbosity or Config.TEXT_VERBOSITY, max_output_tokens=max_output_tokens or Config.MAX_OUTPUT_TOKENS, tools=tools)
+                for event in self.client.responses.create(**request_params, stream=True):
+                    if event.type == 'response.output_text.delta':
+                        yield event.delta
+            else:
+                request_params = self._build_chat_request(messages=messages, max_tokens=max_output_tokens or Config.MAX_OUTPUT_TOKENS, tools=tools)
+                for chunk in self.client.chat.completions.create(**request_params, stream=True):
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+        except Exception as e:
+            yield f'Error generating response: {str(e)}'
+
+    @property
+    def aclient(self) -> AsyncOpenAI:
+        return self._aclient or _get_shared_async_client()
+
     def _generate_mock(self, messages: List[Dict[str, str]], input_text: str, instructions: str, tools: List[Dict[str, Any]]) -> str:
         """Generates context-aware mock responses for portfolio demo."""
         import json
@@ -59,11 +152,18 @@ class GPT5Wrapper:
         return "# Executive Summary (Simulated)\n\nThis is a **mock response** generated because the application is running in **Portfolio Demo Mode** (using a dummy API key).\n\nThe multi-agent system successfully 'analyzed' your query, routed it to specialized agents, and synthesized this report.\n\n## Key Findings\n- **Market**: Strong growth potential detected.\n- **Finance**: 30% projected revenue increase.\n- **Strategy**: Recommended to proceed with aggressive expansion.\n\n*Note: To get real AI responses, please configure a valid OPENAI_API_KEY in the .env file.*"
 
     def _generate_gpt5(self, messages: List[Dict[str, str]]=None, input_text: str=None, instructions: str=None, reasoning_effort: str='medium', text_verbosity: str='medium', max_output_tokens: int=2000, tools: List[Dict[str, Any]]=None) -> str:
+        request_params = self._build_gpt5_request(messages=messages, input_text=input_text, instructions=instructions, reasoning_effort=reasoning_effort, text_verbosity=text_verbosity, max_output_tokens=max_output_tokens, tools=tools)
+        response = self.client.responses.create(**request_params)
+        return self._extract_text_from_response(response)
+
+    def _build_gpt5_request(self, messages: List[Dict[str, str]]=None, input_text: str=None, instructions: str=None, reasoning_effort: str='medium', text_verbosity: str='medium', max_output_tokens: int=2000, tools: List[Dict[str, Any]]=None) -> Dict[str, Any]:
         if input_text is None and messages:
-            system_msgs = [m for m in messages if m.get('role') == 'system']
-            if system_msgs and (not instructions):
-                instructions = system_msgs[0]['content']
-            user_msgs = [m for m in messages if m.get('role') != 'system']
+            user_msgs = []
+            for m in messages:
+                if m.get('role') != 'system':
+                    user_msgs.append(m)
+                elif not instructions:
+                    instructions = m['content']
             if user_msgs:
                 input_text = user_msgs if len(user_msgs) > 1 else user_msgs[0]['content']
             else:
@@ -73,34 +173,33 @@ class GPT5Wrapper:
             request_params['instructions'] = instructions
         if tools:
             request_params['tools'] = self._convert_tools_to_gpt5(tools)
-        response = self.client.responses.create(**request_params)
-        return self._extract_text_from_response(response)
+        return request_params
 
     def _generate_chat_completions(self, messages: List[Dict[str, str]], max_tokens: int=2000, tools: List[Dict[str, Any]]=None) -> str:
+        response = self.client.chat.completions.create(**self._build_chat_request(messages=messages, max_tokens=max_tokens, tools=tools))
+        return response.choices[0].message.content
+
+    def _build_chat_request(self, messages: List[Dict[str, str]], max_tokens: int=2000, tools: List[Dict[str, Any]]=None) -> Dict[str, Any]:
         request_params = {'model': self.model, 'messages': messages, 'max_tokens': max_tokens}
         if tools:
             request_params['tools'] = tools
-        response = self.client.chat.completions.create(**request_params)
-        return response.choices[0].message.content
+        return request_params
 
     def _convert_tools_to_gpt5(self, tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        converted_tools = []
-        for tool in tools:
-            if tool.get('type') == 'function' and 'function' in tool:
-                func = tool['function']
-                converted_tools.append({'type': 'function', 'name': func.get('name'), 'description': func.get('description'), 'parameters': func.get('parameters', {})})
-            else:
-                converted_tools.append(tool)
-        return converted_tools
+        tools_key = tuple(((tool.get('type'), json.dumps(tool, sort_keys=True)) for tool in tools))
+        # Callers may mutate the schemas (including nested parameters), so never hand out the cached objects
+        return copy.deepcopy(list(_convert_tools_cached(tools_key)))
 
     def _extract_text_from_response(self, response: Any) -> str:
-        if hasattr(response, 'output_text'):
-            return response.output_text
-        if hasattr(response, 'output'):
-            for item in response.output:
-                if item.get('type') == 'message':
-                    content = item.get('content', [])
-                    for content_item in content:
-                        if content_item.get('type') == 'output_text':
-                            return content_item.get('text', '')
-        return 'No text output found in response'
\ No newline at end of file
+        try:
+            text = response.output_text
+            if text:
+                return text
+        except AttributeError:
+            pass
+        for item in getattr(response, 'output', None) or []:
+            if getattr(item, 'type', None) == 'message':
+                for content_item in getattr(item, 'content', None) or []:
+                    if getattr(content_item, 'type', None) == 'output_text':
+                        return getattr(content_item, 'text', '')
+        return 'No text output found in response'
@@ -1,7 +1,13 @@
 import asyncio
-from typing import Dict, Any, List, TypedDict, Annotated, Literal
+import orjson
+import re
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Dict, Any, List, TypedDict, Annotated, Literal, Optional, Tuple, AsyncIterator
 from langgraph.graph import StateGraph, END
 from langchain_core.messages import HumanMessage, AIMessage
+from langchain_core.runnables import RunnableLambda
 from langsmith import traceable
 from src.gpt5_wrapper import GPT5Wrapper
 from src.agents.market_analysis import MarketAnalysisAgent
@@ -13,8 +19,17 @@ from src.tools.web_research import WebResearchTool
 from src.memory import ConversationMemory
 from src.config import Config
 from src.cache import QueryCache
+# Static prompt prefixes come first and per-query text last so OpenAI prompt caching can reuse them
+_ROUTING_PROMPT_PREFIX = 'You are the routing layer of a business intelligence system. Analyze the business query at the end of this message and determine which specialized agents should be consulted.\n\nAvailable agents:\n- market: Market research, trends, competition, market sizing, customer segmentation\n  Covers total addressable market (TAM/SAM/SOM) estimates, industry growth rates and trends, competitor landscapes and positioning, customer segments and personas, product-market fit signals, geographic or vertical expansion, and the demand side of pricing (willingness to pay, competitor price points). Choose it whenever the answer depends on what is happening outside the company.\n- operations: Process optimization, efficiency analysis, workflow improvement\n  Covers internal processes and workflows, bottlenecks, automation opportunities, tooling, team structure and capacity, onboarding and support processes, supply chain and fulfilment, scaling operations, and operational KPIs such as cycle time, utilization and throughput. Choose it whenever the answer depends on how the company does its work.\n- financial: Financial projections, ROI calculations, revenue/cost analysis, pricing\n  Covers revenue and cost modeling, unit economics (CAC, LTV, LTV:CAC, payback period, gross margin), cash flow and runway, budgets, ROI of investments, pricing and packaging economics, billing models, fundraising and valuation, and financial scenario analysis. Choose it whenever the answer needs numbers, projections or a cost/benefit judgement.\n- leadgen: Customer acquisition, sales funnel, growth strategies, marketing\n  Covers lead generation channels (outbound, inbound, paid, partnerships, referrals), sales funnel design and conversion rates, go-to-market motions, marketing campaigns and content, growth experiments, activation and expansion, and sales team playbooks. Choose it whenever the answer depends on winning, converting or growing customers.\n\nRouting rules:\n1. Select every agent whose domain is needed to answer the query well, and only those agents.\n2. Questions about strategy, expansion, launches or "what should we do" decisions usually need several agents; include each one whose perspective changes the recommendation.\n3. Narrow questions that fall entirely within one domain should be routed to that single agent.\n4. Pricing questions need financial; add market when competitor pricing or willingness to pay matters, and leadgen when the question is about conversion or packaging for acquisition.\n5. Churn and retention questions need financial for the revenue impact; add operations when the cause is service or onboarding quality, and leadgen when the cause is fit of acquired customers.\n6. Hiring, tooling and process questions need operations; add financial when budget or ROI is part of the question.\n7. When it is unclear whether an agent is needed, leave it out unless its perspective could change the recommendation.\n8. Never invent agent names. Valid names are exactly: "market", "operations", "financial", "leadgen".\n9. Order does not matter, and no agent may appear twice.\n\nExamples:\nQuery: What is the market size for AI-powered bookkeeping tools for small businesses?\nJSON: ["market"]\nQuery: How can we reduce the time it takes to onboard new enterprise customers?\nJSON: ["operations"]\nQuery: What is our LTV:CAC ratio if CAC is $1,200 and monthly ARPU is $150 with 3% churn?\nJSON: ["financial"]\nQuery: Which channels should we use to generate more qualified B2B leads?\nJSON: ["leadgen"]\nQuery: Should we switch from monthly to annual billing?\nJSON: ["financial", "leadgen"]\nQuery: How should we price our new analytics add-on against competitors?\nJSON: ["market", "financial"]\nQuery: Our churn rose from 3% to 6% after we changed our onboarding process. What should we do?\nJSON: ["operations", "financial"]\nQuery: Should we expand into the European mid-market next year?\nJSON: ["market", "financial", "leadgen"]\nQuery: How do we scale customer support without doubling headcount?\nJSON: ["operations", "financial"]\nQuery: We are launching a new product line; how should we plan the go-to-market?\nJSON: ["market", "operations", "financial", "leadgen"]\nQuery: Is it worth automating our invoice processing workflow?\nJSON: ["operations", "financial"]\nQuery: Who are our main competitors and how do we win deals against them?\nJSON: ["market", "leadgen"]\nQuery: How much runway do we have if we hire five engineers this quarter?\nJSON: ["financial", "operations"]\nQuery: What trends are shaping the B2B payments industry in 2025?\nJSON: ["market"]\nQuery: Our trial-to-paid conversion is 8%; how do we improve it?\nJSON: ["leadgen"]\nQuery: Should we build a partner channel or grow our direct sales team?\nJSON: ["market", "financial", "leadgen"]\nQuery: What is the average sales cycle length in mid-market HR software?\nJSON: ["market"]\nQuery: Should we outsource our tier-one customer support to cut costs?\nJSON: ["operations", "financial"]\n\nResponse format:\nRespond with a JSON array of the agent names selected by the rules above.\nExample: ["market", "financial", "leadgen"]\n\nOnly output the JSON array, nothing else.\n\nQuery: '
+_SYNTHESIS_PROMPT_PREFIX = 'As the Business Intelligence Orchestrator, synthesize the findings from specialized agents below into a comprehensive, actionable recommendation.\n\nYour task:\n1. Identify key themes and insights across all agent analyses\n2. Highlight any conflicts or trade-offs between recommendations\n3. Provide a clear, prioritized action plan\n4. Offer a holistic strategic recommendation\n\nAbout the agents:\n- MARKET ANALYSIS comes from the market agent. It covers market size (TAM/SAM/SOM), industry trends, competitors and their positioning, customer segments, and the demand side of pricing. It may cite live web research, so treat its figures as external estimates and say so when you rely on them.\n- OPERATIONS AUDIT comes from the operations agent. It covers internal processes, bottlenecks, automation, tooling, team capacity and operational KPIs. Its recommendations usually carry implementation effort, so weigh them against the time and people the company actually has.\n- FINANCIAL ANALYSIS comes from the financial agent. It covers revenue and cost modeling, unit economics (CAC, LTV, payback, gross margin), cash flow and runway, ROI and pricing economics. When it gives numbers, carry them into the recommendation rather than restating them vaguely.\n- LEAD GENERATION STRATEGY comes from the lead generation agent. It covers acquisition channels, funnel conversion, go-to-market motions and growth experiments. Its tactics are only worth pursuing if the market and financial findings support the segment and the economics.\nOnly the agents that were consulted appear below. Do not mention, guess at, or apologize for the perspective of an agent whose section is missing.\n\nHow to combine the findings:\n- Start from the decision the user is actually trying to make, as stated in the original query, and organize everything around it. Findings that do not bear on that decision belong in an appendix or nowhere.\n- Look for points where two or more agents agree; these are the strongest conclusions and should lead the recommendation.\n- When agents disagree, name the disagreement explicitly, explain what each side is optimizing for (growth, margin, risk, speed, effort), and state which way you lean and why. Do not average conflicting advice into something neither agent said.\n- Keep numbers consistent. If the financial analysis and the market analysis use different figures for the same quantity, point out the discrepancy and say which figure the plan assumes.\n- Separate facts, estimates and assumptions. Label estimates as estimates and state the key assumptions a reader would need to check before acting.\n- If research context from academic papers is reflected in an agent\'s findings, keep the citation in the form the agent gave it; never invent sources, statistics, company names or quotes.\n- If the conversation history shows earlier questions or answers, stay consistent with them, or say plainly what has changed.\n\nHow to write the action plan:\n- Give three to seven actions, ordered by priority. For each one, state what to do, who in the business would typically own it, the expected impact, and a rough time frame (for example: next 30 days, this quarter, next two quarters).\n- Put quick wins with low effort and clear impact first, then foundational work, then larger bets.\n- Attach one or two measurable success metrics to each action (for example: trial-to-paid conversion, CAC payback in months, cycle time, churn rate), with a target when the findings support one.\n- Call out dependencies between actions, such as a pricing change that should wait for a billing-system update.\n- Include the main risks and how to mitigate them, and a clear signal that would tell the user to stop or change course.\n\nStyle rules:\n- Write for a founder or executive who will read the executive summary and skim the rest. Lead with the answer, not with background.\n- Be specific and concrete. Prefer "raise the annual plan discount from 10% to 17% and test it on new sign-ups for six weeks" over "consider adjusting pricing".\n- Use short paragraphs, headings and bullet points. Use a table only when comparing options across the same criteria.\n- Do not repeat each agent\'s report section by section; the user can read those separately. Add value by connecting them.\n- Do not pad the answer with generic advice that would apply to any company, and do not hedge every sentence. State your confidence once, where it matters.\n- If the findings are too thin to support a firm recommendation, say what additional information would change the answer and give the best provisional recommendation anyway.\n\nSpecial cases:\n- If only one agent\'s findings are present, still add value: turn its analysis into a decision, a plan and a way to measure it.\n- If the query asks a factual question rather than for a decision, answer it directly first and keep the action plan short.\n- If an agent reports that it could not complete its analysis, continue with the remaining findings and note the gap in one sentence.\n- If the query involves legal, tax or regulatory questions, flag that a qualified professional should confirm the conclusion.\n\nSuggested structure:\n1. Executive Summary: the recommendation in two to four sentences, including the single most important next step.\n2. Key Insights: the cross-agent themes that drive the recommendation.\n3. Trade-offs and Conflicts: where the agents pull in different directions and how you resolved it.\n4. Prioritized Action Plan: the ordered actions with owners, time frames and metrics.\n5. Risks and Assumptions: what could make this wrong and what to watch.\n\nProvide an executive summary followed by detailed recommendations.\n\n'
+_SYNTHESIS_EFFORTS = ('low', 'low', 'medium')
+_AGENT_STATE_KEYS = {'market': 'market_analysis', 'operations': 'operations_audit', 'financial': 'financial_modeling', 'leadgen': 'lead_generation'}
+# Cheap pre-router signal, known before any LLM call, for starting web research speculatively
+_MARKET_HINT_RE = re.compile(r'\b(?:markets?|competit\w*|industry|industries|trends?|tam|sam|som|segments?|demand|expan\w*)\b', re.IGNORECASE)
+_JSON_FENCE_RE = re.compile('^```(?:json)?\\s*|\\s*```$', re.MULTILINE)
 
 class AgentState(TypedDict):
+    request_id: str
     query: str
     query_complexity: Literal['simple', 'business', 'complex']
     agents_to_call: List[str]
@@ -42,6 +57,8 @@ class LangGraphOrchestrator:
         self.lead_gen_agent = LeadGenerationAgent()
         if self.enable_rag:
             self.research_agent = ResearchSynthesisAgent()
+            # Load the rerank embedding model now rather than on the first research request
+            self.research_agent.retriever.warmup()
             print('✓ RAG enabled - Research Synthesis Agent initialized')
         else:
             self.research_agent = None
@@ -50,10 +67,15 @@ class LangGraphOrchestrator:
         if self.use_ml_routing:
             try:
                 import os
-                if os.path.exists('models/routing_classifier.pkl'):
+                if os.path.exists('models/routing_classifier/routing_metadata.json') or os.path.exists('models/routing_classifier.pkl'):
                     from src.ml.routing_classifier import RoutingClassifier
                     self.ml_router = RoutingClassifier()
-                    self.ml_router.load('models/routing_classifier.pkl')
+                    if os.path.exists('models/routing_classifier/routing_metadata.json'):
+                        self.ml_router.load_pretrained('models/routing_classifier')
+                    else:
+                        self.ml_router.load('models/routing_classifier.pkl')
+                    # First inference pays tokenizer and kernel setup; do it before serving traffic
+                    self.ml_router.warmup()
                     print('✓ ML routing enabled - Classifier loaded')
                 else:
                     print('  ML routing requested but model not found. Using GPT-5 routing.')
@@ -64,25 +86,39 @@ class LangGraphOrchestrator:
         if not self.use_ml_routing:
             print('✓ Using GPT-5 semantic routing')
         self.web_research = WebResearchTool()
+        self._web_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='web-research')
+        self._pending_web_research: Dict[str, Future] = {}
+        self._research_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='research')
+        self._pending_research: Dict[str, Future] = {}
+        self._synthesis_pool = ThreadPoolExecutor(max_workers=Config.PARALLEL_SYNTHESIS_N, thread_name_prefix='synthesis') if Config.PARALLEL_SYNTHESIS_N > 1 else None
         self.memory = ConversationMemory(max_messages=Config.MAX_MEMORY_MESSAGES)
         self.cache = QueryCache()
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._loop.run_forever, name='agent-loop', daemon=True)
+        self._loop_thread.start()
         self.graph = self._build_graph()
+        self._stream_graph = self._build_graph(stream_synthesis=True)
 
-    def _build_graph(self) -> StateGraph:
+    def _build_graph(self, stream_synthesis: bool=False) -> StateGraph:
         workflow = StateGraph(AgentState)
         workflow.add_node('complexity_classifier', self._complexity_classifier_node)
         workflow.add_node('fast_answer', self._fast_answer_node)
         workflow.add_node('router', self._router_node)
         workflow.add_node('research_synthesis', self._research_synthesis_node)
-        workflow.add_node('parallel_agents', self._parallel_agents_node)
-        workflow.add_node('synthesis', self._synthesis_node)
+        workflow.add_node('parallel_agents', RunnableLambda(self._parallel_agents_node, afunc=self._aparallel_agents_node))
+        if not stream_synthesis:
+            workflow.add_node('synthesis', self._synthesis_node)
         workflow.set_entry_point('complexity_classifier')
         workflow.add_conditional_edges('complexity_classifier', self._route_by_complexity, {'simple': 'fast_answer', 'business': 'router', 'complex': 'router'})
         workflow.add_edge('fast_answer', END)
         workflow.add_conditional_edges('router', self._route_after_router, {'research': 'research_synthesis', 'agents': 'parallel_agents'})
         workflow.add_edge('research_synthesis', 'parallel_agents')
-        workflow.add_edge('parallel_agents', 'synthesis')
-        workflow.add_edge('synthesis', END)
+        if stream_synthesis:
+            # Synthesis is streamed by astream_orchestrate after the graph finishes
+            workflow.add_edge('parallel_agents', END)
+        else:
+            workflow.add_edge('parallel_agents', 'synthesis')
+            workflow.add_edge('synthesis', END)
         return workflow.compile()
 
     @traceable(name='complexity_classifier')
@@ -135,11 +171,38 @@ class LangGraphOrchestrator:
     @traceable(name='router_node')
     def _router_node(self, state: AgentState) -> AgentState:
         query = state['query']
+        if not state.get('request_id'):
+            state['request_id'] = uuid.uuid4().hex
+        request_id = state['request_id']
+        # Queries that look market-related start web research now so it overlaps the routing LLM call
+        if not state.get('web_research'):
+            self._prefetch_web_research(request_id, query)
+        # Complex queries always go on to RAG, and retrieval only needs the query, so run it alongside routing
+        if self._route_after_router(state) == 'research' and self.research_agent:
+            self._pending_research[request_id] = self._research_pool.submit(self._retrieve_research, query)
+        state = self._route(state)
+        # Without a prefetch the market agent fetches for itself; a prefetch for a non-market route is dropped
+        if 'market' not in state.get('agents_to_call', []):
+            future = self._pending_web_research.pop(request_id, None)
+            if future is not None:
+                future.cancel()
+        return state
+
+    def _prefetch_web_research(self, request_id: str, query: str):
+        if request_id not in self._pending_web_research and _MARKET_HINT_RE.search(query):
+            self._pending_web_research[request_id] = self._web_pool.submit(self.web_research.execute, query)
+
+    def _route(self, state: AgentState) -> AgentState:
+        query = state['query']
+        cached_agents = self.cache.get_routing(query)
+        if cached_agents:
+            print(f'⚡ Cached routing: {cached_agents}')
+            state['agents_to_call'] = cached_agents
+            return state
         if self.use_ml_routing and self.ml_router:
             try:
                 ADAPTIVE_THRESHOLDS = {'market': 0.55, 'financial': 0.45, 'operations': 0.45, 'leadgen': 0.35}
-                agents_to_call = self.ml_router.predict(query, adaptive_thresholds=ADAPTIVE_THRESHOLDS)
-                probas = self.ml_router.predict_proba(query)
+                agents_to_call, probas = self.ml_router.predict_with_proba(query, adaptive_thresholds=ADAPTIVE_THRESHOLDS)
                 print(f'🤖 ML Router: {agents_to_call}')
                 print(f'   Confidence: {probas}')
                 confidence_scores = list(probas.values())
@@ -153,19 +216,20 @@ class LangGraphOrchestrator:
                     print(f'   Falling back to GPT-5 for verification...')
                 else:
                     print(f'   ✓ High confidence (max={max_confidence:.2f})')
+                    self.cache.set_routing(query, agents_to_call)
                     state['agents_to_call'] = agents_to_call
                     return state
             except Exception as e:
                 print(f'  ML routing failed: {e}, falling back to GPT-5')
-        routing_prompt = f'Analyze the following business query and determine which specialized agents should be consulted.\n\nAvailable agents:\n- market: Market research, trends, competition, market sizing, customer segmentation\n- operations: Process optimization, efficiency analysis, workflow improvement\n- financial: Financial projections, ROI calculations, revenue/cost analysis, pricing\n- leadgen: Customer acquisition, sales funnel, growth strategies, marketing\n\nQuery: {query}\n\nRespond with a JSON array of agent names that should be consulted. For comprehensive business decisions, include multiple relevant agents.\nExample: ["market", "financial", "leadgen"]\n\nOnly output the JSON array, nothing else.'
+        routing_prompt = f'{_ROUTING_PROMPT_PREFIX}{query}\n\nJSON:'
         try:
             response = self.gpt5.generate(input_text=routing_prompt, reasoning_effort='low', text_verbosity='low')
-            import json
-            response_clean = response.strip().replace('```json', '').replace('```', '').strip()
-            agents_to_call = json.loads(response_clean)
+            response_clean = _JSON_FENCE_RE.sub('', response.strip()).strip()
+            agents_to_call = orjson.loads(response_clean)
             if not agents_to_call:
                 agents_to_call = ['market', 'operations', 'financial', 'leadgen']
             print(f'🧠 GPT-5 Router: {agents_to_call}')
+            self.cache.set_routing(query, agents_to_call)
         except Exception as e:
             print(f'Routing error: {e}, using all agents')
             agents_to_call = ['market', 'operations', 'financial', 'leadgen']
@@ -179,20 +243,25 @@ class LangGraphOrchestrator:
             state['research_context'] = ''
             return state
         query = state['query']
+        pending = self._pending_research.pop(state.get('request_id'), None)
+        research = pending.result() if pending is not None else self._retrieve_research(query)
+        state['research_findings'] = research
+        state['research_context'] = research.get('research_context', '')
+        return state
+
+    def _retrieve_research(self, query: str) -> Dict[str, Any]:
         print('\n📚 Retrieving academic research...')
         cached_research = self.cache.get_research(query)
         if cached_research:
-            print('   ⚡ Using cached research papers')
-            state['research_findings'] = cached_research
-            state['research_context'] = cached_research.get('research_context', '')
             paper_count = cached_research.get('paper_count', 0)
             if paper_count > 0:
+                print('   ⚡ Using cached research papers')
                 print(f'✓ {paper_count} papers loaded from cache')
-            return state
+            else:
+                print('  No relevant research (cached) - continuing without RAG')
+            return cached_research
         try:
             research_result = self.research_agent.synthesize(query=query, retrieve_papers=True, top_k_papers=3)
-            state['research_findings'] = research_result
-            state['research_context'] = research_result.get('research_context', '')
             paper_count = research_result.get('paper_count', 0)
             if paper_count > 0:
                 print(f'✓ Retrieved {paper_count} relevant papers')
@@ -200,12 +269,12 @@ class LangGraphOrchestrator:
                 self.cache.set_research(query, research_result)
             else:
                 print('  No relevant research found - continuing without RAG')
+                self.cache.set_empty_research(query, research_result)
+            return research_result
         except Exception as e:
             print(f'  Research synthesis failed: {e}')
             print('   Continuing without research augmentation...')
-            state['research_findings'] = {}
-            state['research_context'] = ''
-        return state
+            return {}
 
     @traceable(name='parallel_agents')
     def _parallel_agents_node(self, state: AgentState) -> AgentState:
@@ -215,10 +284,10 @@ class LangGraphOrchestrator:
             return state
         print(f' Parallel Execution: {len(agents_to_call)} agents running concurrently')
         
-        # Run agents synchronously to avoid asyncio event loop conflicts with FastAPI
-        # This is simpler and works reliably in all environments
+        # Agents run on a persistent background event loop, so this works whether or not
+        # the caller (e.g. FastAPI) already has a loop running on this thread
         try:
-            state = self._execute_agents_sync(state)
+            state = asyncio.run_coroutine_threadsafe(self._execute_agents_parallel(state), self._loop).result()
         except Exception as e:
             import traceback
             print(f'🔥 AGENT EXECUTION ERROR: {type(e).__name__}: {e}')
@@ -228,51 +297,31 @@ class LangGraphOrchestrator:
         print('✓ All agents completed')
         return state
 
-    def _execute_agents_sync(self, state: AgentState) -> AgentState:
-        """Run agents synchronously - simpler and avoids asyncio issues with FastAPI."""
+    @traceable(name='parallel_agents')
+    async def _aparallel_agents_node(self, state: AgentState) -> AgentState:
         agents_to_call = state.get('agents_to_call', [])
-        
-        if 'market' in agents_to_call:
-            web_results = state.get('web_research')
-            if not web_results:
-                web_results = self.web_research.execute(state['query'])
-            research_context = state.get('research_context', '')
-            analysis = self.market_agent.analyze(
-                query=state['query'],
-                web_research_results=web_results,
-                research_context=research_context
-            )
-            state['market_analysis'] = analysis
-            state['web_research'] = web_results
-            
-        if 'operations' in agents_to_call:
-            research_context = state.get('research_context', '')
-            audit = self.operations_agent.audit(
-                query=state['query'],
-                research_context=research_context
-            )
-            state['operations_audit'] = audit
-            
-        if 'financial' in agents_to_call:
-            research_context = state.get('research_context', '')
-            modeling = self.financial_agent.model_financials(
-                query=state['query'],
-                research_context=research_context
-            )
-            state['financial_modeling'] = modeling
-            
-        if 'leadgen' in agents_to_call:
-            research_context = state.get('research_context', '')
-            strategy = self.lead_gen_agent.generate_strategy(
-                query=state['query'],
-                research_context=research_context
-            )
-            state['lead_generation'] = strategy
-            
+        if not agents_to_call:
+            print('  No agents selected - skipping agent execution')
+            return state
+        print(f' Parallel Execution: {len(agents_to_call)} agents running concurrently')
+        state = await self._execute_agents_parallel(state)
+        print('✓ All agents completed')
         return state
 
     @traceable(name='synthesis_node')
     def _synthesis_node(self, state: AgentState) -> AgentState:
+        prepared = self._prepare_synthesis(state)
+        if prepared is None:
+            return state
+        synthesis_prompt, agent_names = prepared
+        synthesis = self._generate_synthesis(synthesis_prompt)
+        if not synthesis.startswith('Error generating response'):
+            self.cache.set_synthesis(state['query'], agent_names, synthesis)
+        state['synthesis'] = synthesis
+        return state
+
+    def _prepare_synthesis(self, state: AgentState) -> Optional[Tuple[str, List[str]]]:
+        # Returns the synthesis prompt, or None when state['synthesis'] could be filled without an LLM call
         query = state['query']
         agent_names = []
         agent_outputs = []
@@ -291,79 +340,186 @@ class LangGraphOrchestrator:
         if not agent_outputs:
             print('  No agent outputs to synthesize')
             state['synthesis'] = 'No analysis available. Please try again.'
-            return state
-        if len(agent_outputs) == 1:
+            return None
+        if len(agent_outputs) == 1 and Config.FAST_PATH_SINGLE_AGENT:
             print(' Single agent output - skipping synthesis overhead')
             state['synthesis'] = agent_outputs[0]
-            return state
+            return None
         cached_synthesis = self.cache.get_synthesis(query, agent_names)
         if cached_synthesis:
             print('   ⚡ Using cached synthesis')
             state['synthesis'] = cached_synthesis
-            return state
+            return None
         context = ''
         if state.get('use_memory', True):
             context = f'\n\nConversation History:\n{self.memory.get_context_string()}\n\n'
-        synthesis_prompt = f'As the Business Intelligence Orchestrator, synthesize the following findings from specialized agents into a comprehensive, actionable recommendation.\n\nOriginal Query: {query}\n{context}\nAgent Findings:\n\n{chr(10).join(agent_outputs)}\n\nYour task:\n1. Identify key themes and insights across all agent analyses\n2. Highlight any conflicts or trade-offs between recommendations\n3. Provide a clear, prioritized action plan\n4. Offer a holistic strategic recommendation\n\nProvide an executive summary followed by detailed recommendations.'
+        synthesis_prompt = f'{_SYNTHESIS_PROMPT_PREFIX}Original Query: {query}\n{context}\nAgent Findings:\n\n{chr(10).join(agent_outputs)}'
         print(f'🔄 Synthesizing {len(agent_outputs)} agent outputs')
-        synthesis = self.gpt5.generate(input_text=synthesis_prompt, reasoning_effort='low', text_verbosity='high')
-        self.cache.set_synthesis(query, agent_names, synthesis)
-        state['synthesis'] = synthesis
-        return state
+        return (synthesis_prompt, agent_names)
+
+    def _generate_synthesis(self, prompt: str) -> str:
+        if self._synthesis_pool is None:
+            return self.gpt5.generate(input_text=prompt, reasoning_effort='low', text_verbosity='high')
+        # Race several attempts and keep the first usable answer to cut tail latency
+        pending = {self._synthesis_pool.submit(self.gpt5.generate, input_text=prompt, reasoning_effort=_SYNTHESIS_EFFORTS[i % len(_SYNTHESIS_EFFORTS)], text_verbosity='high') for i in range(Config.PARALLEL_SYNTHESIS_N)}
+        synthesis = ''
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                synthesis = future.result()
+                if synthesis and not synthesis.startswith('Error generating response'):
+                    for other in pending:
+                        other.cancel()
+                    return synthesis
+        return synthesis
 
     async def _execute_agents_parallel(self, state: AgentState) -> AgentState:
         agents_to_call = state.get('agents_to_call', [])
-        tasks = []
-        if 'market' in agents_to_call:
-            tasks.append(self._run_market_agent_async(state))
-        if 'operations' in agents_to_call:
-            tasks.append(self._run_operations_agent_async(state))
-        if 'financial' in agents_to_call:
-            tasks.append(self._run_financial_agent_async(state))
-        if 'leadgen' in agents_to_call:
-            tasks.append(self._run_leadgen_agent_async(state))
-        results = await asyncio.gather(*tasks)
-        for result in results:
+        runners = {'market': self._run_market_agent_async, 'operations': self._run_operations_agent_async, 'financial': self._run_financial_agent_async, 'leadgen': self._run_leadgen_agent_async}
+        selected = [agent for agent in runners if agent in agents_to_call]
+        query = state['query']
+        has_research = bool(state.get('research_context'))
+        # Every selected agent is looked up in one cache round trip, and only the misses are run
+        cached = await asyncio.to_thread(self.cache.get_agent_responses_batch, selected, query, has_research)
+        for agent, response in cached.items():
+            state[_AGENT_STATE_KEYS[agent]] = response
+        async with asyncio.TaskGroup() as tg:
+            tasks = {agent: tg.create_task(self._run_agent_with_timeout(agent, runners[agent](state))) for agent in selected if agent not in cached}
+        fresh = {}
+        for agent, task in tasks.items():
+            result = task.result()
             state.update(result)
+            if result.get(_AGENT_STATE_KEYS[agent]):
+                fresh[agent] = result[_AGENT_STATE_KEYS[agent]]
+        if fresh:
+            await asyncio.to_thread(self.cache.set_agent_responses_batch, fresh, query, has_research)
         return state
 
+    async def _run_agent_with_timeout(self, agent: str, coro) -> Dict[str, str]:
+        # A slow or failing agent is dropped so synthesis can proceed with the others
+        try:
+            async with asyncio.timeout(Config.AGENT_TIMEOUT_S):
+                return await coro
+        except TimeoutError:
+            print(f'  {agent} agent timed out after {Config.AGENT_TIMEOUT_S}s - continuing without it')
+        except Exception as e:
+            print(f'  {agent} agent failed: {e} - continuing without it')
+        return {}
+
     async def _run_market_agent_async(self, state: AgentState) -> Dict[str, str]:
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         web_results = state.get('web_research')
         if not web_results:
-            web_results = await loop.run_in_executor(None, self.web_research.execute, state['query'])
+            pending = self._pending_web_research.pop(state.get('request_id'), None)
+            if pending is not None:
+                web_results = await asyncio.wrap_future(pending)
+            else:
+                web_results = await loop.run_in_executor(None, self.web_research.execute, state['query'])
         research_context = state.get('research_context', '')
         analysis = await loop.run_in_executor(None, lambda: self.market_agent.analyze(query=state['query'], web_research_results=web_results, research_context=research_context))
         return {'market_analysis': analysis, 'web_research': web_results}
 
     async def _run_operations_agent_async(self, state: AgentState) -> Dict[str, str]:
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         research_context = state.get('research_context', '')
         audit = await loop.run_in_executor(None, lambda: self.operations_agent.audit(query=state['query'], research_context=research_context))
         return {'operations_audit': audit}
 
     async def _run_financial_agent_async(self, state: AgentState) -> Dict[str, str]:
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         research_context = state.get('research_context', '')
         modeling = await loop.run_in_executor(None, lambda: self.financial_agent.model_financials(query=state['query'], research_context=research_context))
         return {'financial_modeling': modeling}
 
     async def _run_leadgen_agent_async(self, state: AgentState) -> Dict[str, str]:
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         research_context = state.get('research_context', '')
         strategy = await loop.run_in_executor(None, lambda: self.lead_gen_agent.generate_strategy(query=state['query'], research_context=research_context))
         return {'lead_generation': strategy}
 
     @traceable(name='orchestrate_query')
     def orchestrate(self, query: str, use_memory: bool=True) -> Dict[str, Any]:
+        initial_state = self._initial_state(query, use_memory)
+        try:
+            final_state = self.graph.invoke(initial_state)
+        finally:
+            self._discard_prefetches(initial_state['request_id'])
+        return self._finish(query, final_state, use_memory)
+
+    @traceable(name='orchestrate_query')
+    async def aorchestrate(self, query: str, use_memory: bool=True) -> Dict[str, Any]:
+        initial_state = self._initial_state(query, use_memory)
+        try:
+            final_state = await self.graph.ainvoke(initial_state)
+        finally:
+            self._discard_prefetches(initial_state['request_id'])
+        return self._finish(query, final_state, use_memory)
+
+    async def astream_orchestrate(self, query: str, use_memory: bool=True) -> AsyncIterator[Dict[str, Any]]:
+        # A client that disconnects mid-stream must not leave its question in memory without a reply
+        history = list(self.memory.messages) if use_memory else None
+        result = None
+        try:
+            initial_state = self._initial_state(query, use_memory)
+            try:
+                state = await self._stream_graph.ainvoke(initial_state)
+            finally:
+                self._discard_prefetches(initial_state['request_id'])
+            yield {'type': 'agents', 'agents_consulted': state.get('agents_to_call', [])}
+            prepared = None if state.get('synthesis') else self._prepare_synthesis(state)
+            if prepared is None:
+                yield {'type': 'delta', 'text': state['synthesis']}
+            else:
+                synthesis_prompt, agent_names = prepared
+                chunks = []
+                async for delta in self.gpt5.agenerate_stream(input_text=synthesis_prompt, reasoning_effort='low', text_verbosity='high'):
+                    chunks.append(delta)
+                    yield {'type': 'delta', 'text': delta}
+                state['synthesis'] = ''.join(chunks)
+                # A failed stream ends with the error text as its last delta, possibly after partial output
+                if chunks and not chunks[-1].startswith('Error generating response'):
+                    self.cache.set_synthesis(query, agent_names, state['synthesis'])
+            result = self._finish(query, state, use_memory)
+        finally:
+            if history is not None and result is None:
+                self.memory.clear()
+                self.memory.add_messages((msg.role, msg.content) for msg in history)
+        yield {'type': 'result', **result}
+
+    def _initial_state(self, query: str, use_memory: bool) -> AgentState:
+        request_id = uuid.uuid4().hex
+        # Market-flavoured queries start web research at ingress so it also overlaps complexity classification
+        self._prefetch_web_research(request_id, query)
         if use_memory:
             self.memory.add_message('user', query)
-        initial_state: AgentState = {'query': query, 'query_complexity': 'business', 'agents_to_call': [], 'research_enabled': self.enable_rag, 'research_findings': {}, 'research_context': '', 'market_analysis': '', 'operations_audit': '', 'financial_modeling': '', 'lead_generation': '', 'web_research': {}, 'synthesis': '', 'conversation_history': self.memory.get_messages(), 'use_memory': use_memory}
-        final_state = self.graph.invoke(initial_state)
+        return {'request_id': request_id, 'query': query, 'query_complexity': 'business', 'agents_to_call': [], 'research_enabled': self.enable_rag, 'research_findings': {}, 'research_context': '', 'market_analysis': '', 'operations_audit': '', 'financial_modeling': '', 'lead_generation': '', 'web_research': {}, 'synthesis': '', 'conversation_history': self.memory.get_messages(), 'use_memory': use_memory}
+
+    def _discard_prefetches(self, request_id: str):
+        # Forget prefetches the graph never consumed (errors, timed-out agents); cancel() only helps if still queued
+        for pending in (self._pending_web_research, self._pending_research):
+            future = pending.pop(request_id, None)
+            if future is not None:
+                future.cancel()
+
+    def _finish(self, query: str, final_state: AgentState, use_memory: bool) -> Dict[str, Any]:
         if use_memory:
             self.memory.add_message('assistant', final_state['synthesis'])
         return {'query': query, 'agents_consulted': final_state.get('agents_to_call', []), 'detailed_findings': {'market_analysis': final_state.get('market_analysis', ''), 'operations_audit': final_state.get('operations_audit', ''), 'financial_modeling': final_state.get('financial_modeling', ''), 'lead_generation': final_state.get('lead_generation', '')}, 'recommendation': final_state['synthesis']}
 
+    def close(self):
+        if self._loop.is_closed():
+            return
+        # Let in-flight agent calls on the loop's executor finish, then stop the loop thread
+        asyncio.run_coroutine_threadsafe(self._loop.shutdown_default_executor(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join()
+        self._loop.close()
+        for pool in (self._web_pool, self._research_pool, self._synthesis_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        if self.research_agent is not None:
+            self.research_agent.retriever.close()
+
     def get_conversation_history(self) -> List[Dict[str, str]]:
         return self.memory.get_messages()
 
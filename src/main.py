@@ -1,16 +1,37 @@
 import os
+import asyncio
+import orjson
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, Dict, Tuple
 from src.langgraph_orchestrator import LangGraphOrchestrator
 from src.config import Config
 load_dotenv()
 Config.validate()
-app = FastAPI(title='Business Intelligence Orchestrator v2', description='LangGraph-powered multi-agent system with GPT-5, LangSmith tracing, and parallel execution', version='2.0.0')
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Stops the orchestrator's agent loop and worker pools; blocking, so kept off the server loop
+    await asyncio.to_thread(orchestrator.close)
+app = FastAPI(title='Business Intelligence Orchestrator v2', description='LangGraph-powered multi-agent system with GPT-5, LangSmith tracing, and parallel execution', version='2.0.0', default_response_class=ORJSONResponse, lifespan=lifespan)
 app.add_middleware(CORSMiddleware, allow_origins=['*'], allow_credentials=True, allow_methods=['*'], allow_headers=['*'])
 orchestrator = LangGraphOrchestrator()
+_inflight: Dict[Tuple[str, bool], asyncio.Task] = {}
+
+async def _coalesced_orchestrate(query: str, use_memory: bool) -> dict:
+    # Concurrent requests for the same query share one pipeline run
+    key = (query, use_memory)
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(orchestrator.aorchestrate(query=query, use_memory=use_memory))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return await asyncio.shield(task)
 
 class QueryRequest(BaseModel):
     query: str
@@ -24,16 +45,27 @@ class QueryResponse(BaseModel):
 
 @app.get('/')
 async def root():
-    return {'name': 'Business Intelligence Orchestrator v2', 'version': '2.0.0', 'description': 'LangGraph-powered multi-agent system with GPT-5, LangSmith tracing, and parallel execution', 'features': ['GPT-5 Responses API with 40-80% cost reduction via caching', 'LangGraph state machine for intelligent routing', 'LangSmith tracing and monitoring', 'Parallel agent execution', 'Semantic routing (not keyword-based)'], 'agents': ['Market Analysis', 'Operations Audit', 'Financial Modeling', 'Lead Generation'], 'endpoints': {'/query': 'POST - Submit a business query for analysis', '/history': 'GET - Get conversation history', '/clear': 'POST - Clear conversation memory', '/cache/stats': 'GET - Get cache performance statistics', '/cache/clear': 'POST - Clear cache', '/health': 'GET - Health check'}}
+    return {'name': 'Business Intelligence Orchestrator v2', 'version': '2.0.0', 'description': 'LangGraph-powered multi-agent system with GPT-5, LangSmith tracing, and parallel execution', 'features': ['GPT-5 Responses API with 40-80% cost reduction via caching', 'LangGraph state machine for intelligent routing', 'LangSmith tracing and monitoring', 'Parallel agent execution', 'Semantic routing (not keyword-based)'], 'agents': ['Market Analysis', 'Operations Audit', 'Financial Modeling', 'Lead Generation'], 'endpoints': {'/query': 'POST - Submit a business query for analysis', '/query/stream': 'POST - Submit a query and stream the recommendation as server-sent events', '/history': 'GET - Get conversation history', '/clear': 'POST - Clear conversation memory', '/cache/stats': 'GET - Get cache performance statistics', '/cache/clear': 'POST - Clear cache', '/health': 'GET - Health check'}}
 
 @app.post('/query', response_model=QueryResponse)
 async def analyze_query(request: QueryRequest):
     try:
-        result = orchestrator.orchestrate(query=request.query, use_memory=request.use_memory)
+        result = await _coalesced_orchestrate(request.query, request.use_memory)
         return QueryResponse(query=result['query'], agents_consulted=result['agents_consulted'], recommendation=result['recommendation'], detailed_findings=result['detailed_findings'])
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post('/query/stream')
+async def stream_query(request: QueryRequest):
+
+    async def events():
+        try:
+            async for event in orchestrator.astream_orchestrate(query=request.query, use_memory=request.use_memory):
+                yield b'data: ' + orjson.dumps(event) + b'\n\n'
+        except Exception as e:
+            yield b'data: ' + orjson.dumps({'type': 'error', 'detail': str(e)}) + b'\n\n'
+    return StreamingResponse(events(), media_type='text/event-stream')
+
 @app.get('/history')
 async def get_history():
     try:
@@ -72,4 +104,5 @@ async def health_check():
     return {'status': 'healthy', 'openai_configured': bool(Config.OPENAI_API_KEY), 'openai_model': Config.OPENAI_MODEL, 'using_gpt5': Config.is_gpt5(), 'langsmith_tracing': Config.LANGCHAIN_TRACING_V2, 'langsmith_project': Config.LANGCHAIN_PROJECT if Config.LANGCHAIN_TRACING_V2 else None, 'cache': {'enabled': cache_stats['enabled'], 'backend': cache_stats['backend'], 'hit_rate': f"{cache_stats['hit_rate_percent']}%"}}
 if __name__ == '__main__':
     import uvicorn
-    uvicorn.run(app, host='0.0.0.0', port=8000)
\ No newline at end of file
+    # Conversation memory lives in each worker process, so multiple workers (WEB_CONCURRENCY) suit stateless use
+    uvicorn.run('src.main:app', host='0.0.0.0', port=8000, workers=int(os.getenv('WEB_CONCURRENCY', '1')), loop='uvloop', http='httptools', access_log=False)
\ No newline at end of file
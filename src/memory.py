@@ -1,23 +1,37 @@
-from typing import List, Dict
+from typing import List, Dict, Deque, Iterable, NamedTuple, Tuple
 from collections import deque
 
+class Message(NamedTuple):
+    role: str
+    content: str
+
 class ConversationMemory:
 
     def __init__(self, max_messages: int=10):
         self.max_messages = max_messages
-        self.messages = deque(maxlen=max_messages)
+        self.messages: Deque[Message] = deque(maxlen=max_messages)
+        self._context_str = ''
 
     def add_message(self, role: str, content: str):
-        self.messages.append({'role': role, 'content': content})
+        evicting = len(self.messages) == self.max_messages
+        self.messages.append(Message(role, content))
+        if evicting:
+            self._context_str = '\n\n'.join((f'{msg.role.upper()}: {msg.content}' for msg in self.messages))
+        elif self._context_str:
+            self._context_str += f'\n\n{role.upper()}: {content}'
+        else:
+            self._context_str = f'{role.upper()}: {content}'
+
+    def add_messages(self, pairs: Iterable[Tuple[str, str]]):
+        self.messages.extend(Message(role, content) for role, content in pairs)
+        self._context_str = '\n\n'.join((f'{msg.role.upper()}: {msg.content}' for msg in self.messages))
 
     def get_messages(self) -> List[Dict[str, str]]:
-        return list(self.messages)
+        return [msg._asdict() for msg in self.messages]
 
     def clear(self):
         self.messages.clear()
+        self._context_str = ''
 
     def get_context_string(self) -> str:
-        context = []
-        for msg in self.messages:
-            context.append(f"{msg['role'].upper()}: {msg['content']}")
-        return '\n\n'.join(context)
\ No newline at end of file
+        return self._context_str
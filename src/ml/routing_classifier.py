@@ -1,6 +1,7 @@
 import json
 import logging
 import os
+import orjson
 import pickle
 from datetime import datetime
 from typing import List, Dict, Any, Tuple
@@ -26,8 +27,8 @@ class RoutingClassifier:
 
     def load_training_data(self, data_path: str='models/training_data.json') -> Tuple[List[str], List[List[str]]]:
         try:
-            with open(data_path, 'r') as f:
-                dataset = json.load(f)
+            with open(data_path, 'rb') as f:
+                dataset = orjson.loads(f.read())
             train_data = dataset.get('train', [])
             if not train_data:
                 raise ValueError(f'No training data found in {data_path}')
@@ -48,8 +49,8 @@ class RoutingClassifier:
     def train(self, data_path='models/training_data.json', num_epochs=10, batch_size=16, learning_rate=2e-05, save_path='models/routing_classifier.pkl'):
         print(f"\n{'=' * 70}\n TRAINING ML ROUTING CLASSIFIER\n{'=' * 70}")
         queries, labels = self.load_training_data(data_path)
-        with open(data_path, 'r') as f:
-            dataset = json.load(f)
+        with open(data_path, 'rb') as f:
+            dataset = orjson.loads(f.read())
         val_data = dataset.get('val', [])
         val_queries = [ex['query'] for ex in val_data]
         val_labels = [ex['agents'] for ex in val_data]
@@ -98,9 +99,13 @@ class RoutingClassifier:
         return self.training_metrics
 
     def predict(self, query: str, threshold: float=0.5, adaptive_thresholds: Dict[str, float]=None) -> List[str]:
-        if not self.models:
-            raise ValueError('Model not trained. Call train() or load() first.')
+        return self.predict_with_proba(query, threshold, adaptive_thresholds)[0]
+
+    def predict_with_proba(self, query: str, threshold: float=0.5, adaptive_thresholds: Dict[str, float]=None) -> Tuple[List[str], Dict[str, float]]:
         probas = self.predict_proba(query)
+        return (self._select_agents(probas, threshold, adaptive_thresholds), probas)
+
+    def _select_agents(self, probas: Dict[str, float], threshold: float=0.5, adaptive_thresholds: Dict[str, float]=None) -> List[str]:
         agents = []
         for agent, prob in probas.items():
             agent_threshold = threshold
@@ -111,7 +116,15 @@ class RoutingClassifier:
         return sorted(agents) if agents else ['market']
 
     def predict_batch(self, queries: List[str]) -> List[List[str]]:
-        return [self.predict(q) for q in queries]
+        if not self.models:
+            raise ValueError('Model not trained. Call train() or load() first.')
+        if not queries:
+            return []
+        batch_probas = [{} for _ in queries]
+        for agent, model in self.models.items():
+            for probas, proba_output in zip(batch_probas, model.predict_proba(queries)):
+                probas[agent] = float(proba_output[1])
+        return [self._select_agents(probas) for probas in batch_probas]
 
     def predict_proba(self, query: str) -> Dict[str, float]:
         if not self.models:
@@ -128,8 +141,8 @@ class RoutingClassifier:
 
     def evaluate(self, data_path='models/training_data.json'):
         print(f'\n Evaluating on test set...')
-        with open(data_path, 'r') as f:
-            dataset = json.load(f)
+        with open(data_path, 'rb') as f:
+            dataset = orjson.loads(f.read())
         test_data = dataset.get('test', [])
         test_queries = [ex['query'] for ex in test_data]
         test_labels = [ex['agents'] for ex in test_data]
@@ -164,6 +177,22 @@ class RoutingClassifier:
         except Exception as e:
             logger.error(f'Failed to save model: {e}')
             raise
+        self.save_pretrained(os.path.splitext(path)[0])
+
+    def save_pretrained(self, directory: str='models/routing_classifier'):
+        if not self.models:
+            raise ValueError('No model to save. Train first.')
+        try:
+            os.makedirs(directory, exist_ok=True)
+            for agent, model in self.models.items():
+                model.save_pretrained(os.path.join(directory, agent))
+            metadata = {'agent_labels': self.agent_labels, 'base_model_name': self.base_model_name, 'training_metrics': self.training_metrics}
+            with open(os.path.join(directory, 'routing_metadata.json'), 'w') as f:
+                json.dump(metadata, f, indent=2)
+            logger.info(f'Model weights saved to {directory}')
+        except Exception as e:
+            logger.error(f'Failed to save model weights: {e}')
+            raise
 
     def load(self, path: str='models/routing_classifier.pkl'):
         if not os.path.exists(path):
@@ -181,6 +210,27 @@ class RoutingClassifier:
             logger.error(f'Failed to load model: {e}')
             raise
 
+    def load_pretrained(self, directory: str='models/routing_classifier'):
+        metadata_path = os.path.join(directory, 'routing_metadata.json')
+        if not os.path.exists(metadata_path):
+            raise FileNotFoundError(f'Model not found: {directory}')
+        try:
+            with open(metadata_path, 'r') as f:
+                metadata = json.load(f)
+            self.agent_labels = metadata['agent_labels']
+            self.base_model_name = metadata['base_model_name']
+            self.training_metrics = metadata.get('training_metrics', {})
+            # safetensors weights are memory-mapped instead of rebuilt object by object from a pickle
+            self.models = {agent: SetFitModel.from_pretrained(os.path.join(directory, agent)) for agent in self.agent_labels}
+            acc = self.training_metrics.get('exact_match_accuracy', 0)
+            logger.info(f'Model loaded from {directory} (accuracy: {acc:.3f})')
+        except Exception as e:
+            logger.error(f'Failed to load model: {e}')
+            raise
+
+    def warmup(self):
+        self.predict_proba('warmup')
+
 def main():
     import argparse
     parser = argparse.ArgumentParser(description='Train ML routing classifier')
@@ -1,4 +1,5 @@
 import os
+import re
 from openai import OpenAI
 from typing import Dict, Any, List
 from src.agents.market_analysis import MarketAnalysisAgent
@@ -8,6 +9,8 @@ from src.agents.lead_generation import LeadGenerationAgent
 from src.tools.calculator import CalculatorTool
 from src.tools.web_research import WebResearchTool
 from src.memory import ConversationMemory
+_AGENT_KEYWORDS = {'market': ('market', 'competition', 'competitor', 'industry', 'trend', 'customer segment', 'target audience'), 'operations': ('process', 'efficiency', 'workflow', 'operation', 'optimize', 'automate', 'scale', 'bottleneck'), 'financial': ('financial', 'revenue', 'cost', 'profit', 'roi', 'budget', 'pricing', 'investment', 'money'), 'leadgen': ('lead', 'customer acquisition', 'growth', 'sales', 'marketing', 'funnel', 'conversion', 'acquire')}
+_AGENT_KEYWORD_PATTERNS = {agent: re.compile('|'.join(map(re.escape, keywords))) for agent, keywords in _AGENT_KEYWORDS.items()}
 
 class PrimaryOrchestrator:
 
@@ -25,19 +28,7 @@ class PrimaryOrchestrator:
 
     def determine_agents_needed(self, query: str) -> Dict[str, bool]:
         query_lower = query.lower()
-        agents_needed = {'market': False, 'operations': False, 'financial': False, 'leadgen': False}
-        market_keywords = ['market', 'competition', 'competitor', 'industry', 'trend', 'customer segment', 'target audience']
-        if any((keyword in query_lower for keyword in market_keywords)):
-            agents_needed['market'] = True
-        ops_keywords = ['process', 'efficiency', 'workflow', 'operation', 'optimize', 'automate', 'scale', 'bottleneck']
-        if any((keyword in query_lower for keyword in ops_keywords)):
-            agents_needed['operations'] = True
-        financial_keywords = ['financial', 'revenue', 'cost', 'profit', 'roi', 'budget', 'pricing', 'investment', 'money']
-        if any((keyword in query_lower for keyword in financial_keywords)):
-            agents_needed['financial'] = True
-        leadgen_keywords = ['lead', 'customer acquisition', 'growth', 'sales', 'marketing', 'funnel', 'conversion', 'acquire']
-        if any((keyword in query_lower for keyword in leadgen_keywords)):
-            agents_needed['leadgen'] = True
+        agents_needed = {agent: pattern.search(query_lower) is not None for agent, pattern in _AGENT_KEYWORD_PATTERNS.items()}
         if not any(agents_needed.values()):
             agents_needed = {k: True for k in agents_needed}
         return agents_needed
@@ -1,5 +1,25 @@
+import ast
+import operator
 import re
+from functools import lru_cache
 from typing import Dict, Any
+_UNSAFE_CHARS = re.compile('[^0-9+\\-*/().\\s]')
+_BINARY_OPS = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Div: operator.truediv, ast.FloorDiv: operator.floordiv, ast.Pow: operator.pow}
+_UNARY_OPS = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+
+def _eval_node(node):
+    node_type = type(node)
+    if node_type is ast.Constant and type(node.value) in (int, float):
+        return node.value
+    if node_type is ast.BinOp and type(node.op) in _BINARY_OPS:
+        return _BINARY_OPS[type(node.op)](_eval_node(node.left), _eval_node(node.right))
+    if node_type is ast.UnaryOp and type(node.op) in _UNARY_OPS:
+        return _UNARY_OPS[type(node.op)](_eval_node(node.operand))
+    raise ValueError(f'Unsupported expression element: {node_type.__name__}')
+
+@lru_cache(maxsize=1024)
+def _evaluate(expression: str):
+    return _eval_node(ast.parse(expression.strip(), mode='eval').body)
 
 class CalculatorTool:
 
@@ -9,8 +29,8 @@ class CalculatorTool:
 
     def execute(self, expression: str) -> Dict[str, Any]:
         try:
-            safe_expression = re.sub('[^0-9+\\-*/().\\s]', '', expression)
-            result = eval(safe_expression, {'__builtins__': {}}, {})
+            safe_expression = _UNSAFE_CHARS.sub('', expression)
+            result = _evaluate(safe_expression)
             return {'success': True, 'expression': expression, 'result': result}
         except Exception as e:
-            return {'success': False, 'expression': expression, 'error': str(e)}
\ No newline at end of file
+            return {'success': False, 'expression': expression, 'error': str(e)}
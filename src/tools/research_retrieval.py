@@ -1,71 +1,347 @@
-import requests
+import asyncio
+import httpx
+import io
+import logging
+import threading
 import time
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+import weakref
+import zlib
+from collections import OrderedDict
+from functools import lru_cache
+from operator import itemgetter
+from typing import List, Dict, Any, Optional, Callable, Awaitable
 import hashlib
-import json
+import heapq
+import numpy as np
+import orjson
 import os
+import re
+import sqlite3
+from lxml import etree
+try:
+    import faiss
+except ImportError:
+    faiss = None
+_ATOM_NS = {'atom': 'http://www.w3.org/2005/Atom', 'arxiv': 'http://arxiv.org/schemas/atom'}
+_ATOM_ENTRY_TAG = '{http://www.w3.org/2005/Atom}entry'
+_ID_XP = etree.XPath('string(atom:id)', namespaces=_ATOM_NS)
+_TITLE_XP = etree.XPath('normalize-space(atom:title)', namespaces=_ATOM_NS)
+_SUMMARY_XP = etree.XPath('normalize-space(atom:summary)', namespaces=_ATOM_NS)
+_PUBLISHED_XP = etree.XPath('string(atom:published)', namespaces=_ATOM_NS)
+_AUTHOR_XP = etree.XPath('atom:author/atom:name/text()', namespaces=_ATOM_NS)
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_DEFAULT_S2_FIELDS = ('paperId', 'title', 'abstract', 'year', 'authors', 'citationCount', 'publicationDate', 'venue', 'url')
+_DEFAULT_S2_FIELDS_JOINED = ','.join(_DEFAULT_S2_FIELDS)
+_NON_WORD = re.compile(r'\W+')
+_ABSTRACT_SHORT_CHARS = 512
+_COMPRESS_LEVEL = 3
+_EMBED_MODEL = os.getenv('RESEARCH_EMBED_MODEL', 'BAAI/bge-small-en-v1.5')
+logger = logging.getLogger(__name__)
+_embedder = None
+_embedder_lock = threading.Lock()
+
+@lru_cache(maxsize=1024)
+def _derive_cache_key(source: str, query: str) -> str:
+    return hashlib.blake2b(f'{source}:{query}'.encode(), digest_size=16).hexdigest()
+
+def _load_embedder():
+    # Called from warmup, never per request; a failed load is retried on the next warmup
+    global _embedder
+    with _embedder_lock:
+        if _embedder is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+                _embedder = SentenceTransformer(_EMBED_MODEL, device='cpu')
+            except Exception as e:
+                logger.warning('Embedding rerank unavailable: %s', e)
+        return _embedder
+
+def _get_embedder():
+    # None until warmup has loaded the model; the rerank then keeps the citation ordering
+    return _embedder
+
+def _pack_papers(papers: List[Dict]) -> bytes:
+    return zlib.compress(orjson.dumps(papers), _COMPRESS_LEVEL)
+
+def _unpack_papers(payload: bytes) -> List[Dict]:
+    # Rows written before compression are raw JSON arrays
+    if payload[:1] == b'[':
+        return orjson.loads(payload)
+    return orjson.loads(zlib.decompress(payload))
+
+def _with_short_abstract(paper: Dict[str, Any]) -> Dict[str, Any]:
+    # Context formatting only shows the head of the abstract; synthesis still reads the full text
+    paper['abstract_short'] = (paper['abstract'] or '')[:_ABSTRACT_SHORT_CHARS]
+    return paper
+
+def _dedupe_papers(papers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # The same work often comes back as an arXiv preprint and a Semantic Scholar record; keep the cited one
+    kept: Dict[str, int] = {}
+    unique: List[Dict[str, Any]] = []
+    for paper in papers:
+        key = paper.get('doi') or _NON_WORD.sub('', (paper.get('title') or '').lower())[:80]
+        if not key:
+            unique.append(paper)
+            continue
+        index = kept.get(key)
+        if index is None:
+            kept[key] = len(unique)
+            unique.append(paper)
+        elif paper.get('citation_count', 0) > unique[index].get('citation_count', 0):
+            unique[index] = paper
+    return unique
+
+def _top_by_citations(papers: List[Dict[str, Any]], k: int) -> List[Dict[str, Any]]:
+    keyed = [((p.get('citation_count', 0), int(p.get('year', 0) or 0)), p) for p in papers]
+    return [p for _, p in heapq.nlargest(k, keyed, key=itemgetter(0))]
+
+def _mmr_select(query_sims: np.ndarray, pairwise: np.ndarray, k: int, lambda_mult: float) -> List[int]:
+    # Maximal Marginal Relevance: trade query similarity against similarity to already-picked papers
+    k = min(k, len(query_sims))
+    if k <= 0:
+        return []
+    selected = [int(np.argmax(query_sims))]
+    max_sim = pairwise[selected[0]].copy()
+    while len(selected) < k:
+        scores = lambda_mult * query_sims - (1 - lambda_mult) * max_sim
+        scores[selected] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        np.maximum(max_sim, pairwise[best], out=max_sim)
+    return selected
+
+class TokenBucket:
+
+    def __init__(self, capacity: float, refill_rate: float):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        # Takes a token now (possibly going into debt) and returns how long to wait until it is earned
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.refill_rate
 
 class ResearchRetriever:
+    L1_MAX_ENTRIES = 256
+    L1_TTL = 3600
+    MMR_LAMBDA = 0.7
 
     def __init__(self, cache_dir: str='./research_cache'):
         self.cache_dir = cache_dir
         self.semantic_scholar_base_url = 'https://api.semanticscholar.org/graph/v1'
         self.arxiv_base_url = 'http://export.arxiv.org/api/query'
         os.makedirs(cache_dir, exist_ok=True)
-        self.last_request_time = 0
-        self.min_request_interval = 1.0
+        self.max_cache_entries = 10000
+        # Each search caches several abstracts; 384-d float32 vectors are ~1.5KB a row
+        self.max_embedding_entries = 50000
+        # One indexed SQLite file instead of a JSON file per query; autocommit, shared across threads
+        self._db = sqlite3.connect(os.path.join(cache_dir, 'research_cache.sqlite3'), check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, ts REAL NOT NULL, atime REAL NOT NULL, payload BLOB NOT NULL)')
+        self._db.execute('CREATE INDEX IF NOT EXISTS cache_atime ON cache (atime)')
+        self._db.execute('CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, atime REAL NOT NULL, vector BLOB NOT NULL)')
+        if 'atime' not in [row[1] for row in self._db.execute('PRAGMA table_info(embeddings)')]:
+            self._db.execute('ALTER TABLE embeddings ADD COLUMN atime REAL NOT NULL DEFAULT 0')
+        self._db.execute('CREATE INDEX IF NOT EXISTS embeddings_atime ON embeddings (atime)')
+        self._db_lock = threading.Lock()
+        self._l1 = OrderedDict()
+        self._l1_lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Semantic Scholar allows 100 requests / 5 min unauthenticated; arXiv asks for one request every 3 s
+        self._limiters: Dict[str, TokenBucket] = {'semantic_scholar': TokenBucket(capacity=5, refill_rate=1 / 3), 'arxiv': TokenBucket(capacity=1, refill_rate=1 / 3)}
+        self.max_retries = 3
+        self.retry_backoff = 0.3
+        self._clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]' = weakref.WeakKeyDictionary()
+        # Sync callers run on one persistent loop so its client keeps connections alive between calls
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._loop.run_forever, name='research-retrieval', daemon=True)
+        self._loop_thread.start()
 
     def _get_cache_key(self, query: str, source: str) -> str:
-        cache_string = f'{source}:{query}'
-        return hashlib.md5(cache_string.encode()).hexdigest()
+        return _derive_cache_key(source, query)
+
+    def _l1_get(self, cache_key: str) -> Optional[List[Dict]]:
+        with self._l1_lock:
+            entry = self._l1.get(cache_key)
+            if entry is None:
+                return None
+            papers, expires_at = entry
+            if expires_at < time.time():
+                del self._l1[cache_key]
+                return None
+            self._l1.move_to_end(cache_key)
+            return papers
+
+    def _l1_put(self, cache_key: str, papers: List[Dict]) -> None:
+        with self._l1_lock:
+            self._l1[cache_key] = (papers, time.time() + self.L1_TTL)
+            self._l1.move_to_end(cache_key)
+            while len(self._l1) > self.L1_MAX_ENTRIES:
+                self._l1.popitem(last=False)
 
     def _get_from_cache(self, cache_key: str, max_age_days: int=7) -> Optional[List[Dict]]:
-        cache_file = os.path.join(self.cache_dir, f'{cache_key}.json')
-        if not os.path.exists(cache_file):
-            return None
-        file_modified_time = datetime.fromtimestamp(os.path.getmtime(cache_file))
-        if datetime.now() - file_modified_time > timedelta(days=max_age_days):
-            return None
+        # Parsed results are shared from memory; callers must not mutate them
+        papers = self._l1_get(cache_key)
+        if papers is not None:
+            return papers
+        now = time.time()
         try:
-            with open(cache_file, 'r') as f:
-                return json.load(f)
+            with self._db_lock:
+                row = self._db.execute('SELECT payload FROM cache WHERE key = ? AND ts > ?', (cache_key, now - max_age_days * 86400)).fetchone()
+                if row is None:
+                    return None
+                self._db.execute('UPDATE cache SET atime = ? WHERE key = ?', (now, cache_key))
+            papers = _unpack_papers(row[0])
+            self._l1_put(cache_key, papers)
+            return papers
         except Exception:
             return None
 
     def _save_to_cache(self, cache_key: str, data: List[Dict]) -> None:
-        cache_file = os.path.join(self.cache_dir, f'{cache_key}.json')
+        self._l1_put(cache_key, data)
+        now = time.time()
         try:
-            with open(cache_file, 'w') as f:
-                json.dump(data, f)
+            payload = _pack_papers(data)
+            with self._db_lock:
+                self._db.execute('INSERT OR REPLACE INTO cache (key, ts, atime, payload) VALUES (?, ?, ?, ?)', (cache_key, now, now, payload))
+                overflow = self._db.execute('SELECT COUNT(*) FROM cache').fetchone()[0] - self.max_cache_entries
+                if overflow > 0:
+                    self._db.execute('DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY atime LIMIT ?)', (overflow,))
         except Exception as e:
             print(f'Warning: Could not save to cache: {e}')
 
-    def _rate_limit(self) -> None:
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.min_request_interval:
-            time.sleep(self.min_request_interval - elapsed)
-        self.last_request_time = time.time()
+    def _embed_papers(self, embedder, papers: List[Dict[str, Any]]) -> np.ndarray:
+        # Abstract embeddings are persisted next to the search cache so cache hits skip the encoder
+        keys = [_derive_cache_key(_EMBED_MODEL, f"{p.get('title', '')}\n{p.get('abstract', '')}") for p in papers]
+        placeholders = ','.join('?' * len(keys))
+        with self._db_lock:
+            rows = dict(self._db.execute(f'SELECT key, vector FROM embeddings WHERE key IN ({placeholders})', keys).fetchall())
+            if rows:
+                self._db.execute(f'UPDATE embeddings SET atime = ? WHERE key IN ({placeholders})', [time.time(), *keys])
+        missing = [i for i, key in enumerate(keys) if key not in rows]
+        if missing:
+            vectors = embedder.encode([f"{papers[i].get('title', '')}\n{papers[i].get('abstract', '')}" for i in missing], normalize_embeddings=True, convert_to_numpy=True).astype(np.float32)
+            now = time.time()
+            with self._db_lock:
+                self._db.executemany('INSERT OR REPLACE INTO embeddings (key, atime, vector) VALUES (?, ?, ?)', [(keys[i], now, vector.tobytes()) for i, vector in zip(missing, vectors)])
+                # Same LRU policy as the search cache
+                overflow = self._db.execute('SELECT COUNT(*) FROM embeddings').fetchone()[0] - self.max_embedding_entries
+                if overflow > 0:
+                    self._db.execute('DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings ORDER BY atime LIMIT ?)', (overflow,))
+            rows.update({keys[i]: vector.tobytes() for i, vector in zip(missing, vectors)})
+        return np.stack([np.frombuffer(rows[key], dtype=np.float32) for key in keys])
+
+    def _rerank(self, query: str, papers: List[Dict[str, Any]], top_k: int) -> List[Dict[str, Any]]:
+        embedder = _get_embedder()
+        if embedder is None or not papers:
+            return _top_by_citations(papers, top_k)
+        try:
+            embs = self._embed_papers(embedder, papers)
+            query_vec = embedder.encode([query], normalize_embeddings=True, convert_to_numpy=True).astype(np.float32)
+        except Exception as e:
+            print(f'  Embedding rerank failed: {e}')
+            return _top_by_citations(papers, top_k)
+        fetch_k = min(3 * top_k, len(papers))
+        if faiss is not None:
+            index = faiss.IndexFlatIP(embs.shape[1])
+            index.add(embs)
+            sims, order = index.search(query_vec, fetch_k)
+            sims, order = sims[0], order[0]
+        else:
+            scores = embs @ query_vec[0]
+            order = np.argpartition(-scores, fetch_k - 1)[:fetch_k] if fetch_k < len(scores) else np.arange(len(scores))
+            order = order[np.argsort(-scores[order], kind='stable')]
+            sims = scores[order]
+        candidates = embs[order]
+        selected = _mmr_select(sims, candidates @ candidates.T, min(top_k, fetch_k), self.MMR_LAMBDA)
+        return [papers[order[i]] for i in selected]
+
+    def warmup(self):
+        _load_embedder()
+
+    def close(self):
+        if self._loop.is_closed():
+            return
+        for loop, client in list(self._clients.items()):
+            if loop is self._loop:
+                self._run(client.aclose())
+            elif loop.is_running():
+                # Clients made by async callers belong to their loop; schedule the close there without blocking on it
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        self._clients.clear()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join()
+        self._loop.close()
+        with self._db_lock:
+            self._db.close()
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    @property
+    def _client(self) -> httpx.AsyncClient:
+        # httpx async pools are bound to the loop that first uses them
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            transport = httpx.AsyncHTTPTransport(retries=3, limits=httpx.Limits(max_connections=16, max_keepalive_connections=4))
+            client = self._clients[loop] = httpx.AsyncClient(transport=transport, timeout=10, headers={'Connection': 'keep-alive'})
+        return client
+
+    async def _get(self, url: str, params: Dict[str, Any]) -> httpx.Response:
+        # Transport retries cover connection failures; throttling and transient 5xx get backoff here
+        for attempt in range(self.max_retries + 1):
+            response = await self._client.get(url, params=params)
+            if response.status_code not in _RETRY_STATUSES or attempt == self.max_retries:
+                return response
+            await asyncio.sleep(self.retry_backoff * 2 ** attempt)
+
+    async def _rate_limit(self, host: str) -> None:
+        # Semantic Scholar and arXiv have independent quotas, so each host has its own bucket
+        delay = self._limiters[host].reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _single_flight(self, cache_key: str, fetch: Callable[[], Awaitable[List[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        # Concurrent misses for the same search share one request instead of each paying a rate-limit slot
+        loop = asyncio.get_running_loop()
+        task = self._inflight.get(cache_key)
+        if task is None or task.get_loop() is not loop:
+            task = self._inflight[cache_key] = loop.create_task(fetch())
+            task.add_done_callback(lambda done: self._inflight.pop(cache_key, None) if self._inflight.get(cache_key) is done else None)
+        return await asyncio.shield(task)
 
     def search_semantic_scholar(self, query: str, limit: int=10, fields: Optional[List[str]]=None) -> List[Dict[str, Any]]:
+        return self._run(self.asearch_semantic_scholar(query, limit, fields))
+
+    async def asearch_semantic_scholar(self, query: str, limit: int=10, fields: Optional[List[str]]=None) -> List[Dict[str, Any]]:
         cache_key = self._get_cache_key(query, 'semantic_scholar')
         cached_results = self._get_from_cache(cache_key)
         if cached_results is not None:
             print(f'✓ Using cached Semantic Scholar results for: {query[:50]}...')
             return cached_results[:limit]
-        if fields is None:
-            fields = ['paperId', 'title', 'abstract', 'year', 'authors', 'citationCount', 'publicationDate', 'venue', 'url']
-        self._rate_limit()
+        fields_param = _DEFAULT_S2_FIELDS_JOINED if fields is None else ','.join(fields)
+        return await self._single_flight(cache_key, lambda: self._fetch_semantic_scholar(cache_key, query, limit, fields_param))
+
+    async def _fetch_semantic_scholar(self, cache_key: str, query: str, limit: int, fields_param: str) -> List[Dict[str, Any]]:
+        await self._rate_limit('semantic_scholar')
         try:
             url = f'{self.semantic_scholar_base_url}/paper/search'
-            params = {'query': query, 'limit': limit, 'fields': ','.join(fields)}
-            response = requests.get(url, params=params, timeout=10)
+            params = {'query': query, 'limit': limit, 'fields': fields_param}
+            response = await self._get(url, params)
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             papers = data.get('data', [])
             formatted_papers = []
             for paper in papers:
-                formatted_papers.append({'paper_id': paper.get('paperId', ''), 'title': paper.get('title', ''), 'authors': [author.get('name', '') for author in paper.get('authors', [])], 'year': paper.get('year'), 'abstract': paper.get('abstract', ''), 'citation_count': paper.get('citationCount', 0), 'publication_date': paper.get('publicationDate', ''), 'venue': paper.get('venue', ''), 'url': paper.get('url', ''), 'source': 'Semantic Scholar'})
+                formatted_papers.append(_with_short_abstract({'paper_id': paper.get('paperId', ''), 'title': paper.get('title', ''), 'authors': [author.get('name', '') for author in paper.get('authors', [])], 'year': paper.get('year'), 'abstract': paper.get('abstract', ''), 'citation_count': paper.get('citationCount', 0), 'publication_date': paper.get('publicationDate', ''), 'venue': paper.get('venue', ''), 'url': paper.get('url', ''), 'source': 'Semantic Scholar'}))
             self._save_to_cache(cache_key, formatted_papers)
             print(f'✓ Retrieved {len(formatted_papers)} papers from Semantic Scholar')
             return formatted_papers
@@ -74,25 +350,34 @@ class ResearchRetriever:
             return []
 
     def search_arxiv(self, query: str, limit: int=10, sort_by: str='relevance') -> List[Dict[str, Any]]:
+        return self._run(self.asearch_arxiv(query, limit, sort_by))
+
+    async def asearch_arxiv(self, query: str, limit: int=10, sort_by: str='relevance') -> List[Dict[str, Any]]:
         cache_key = self._get_cache_key(query, 'arxiv')
         cached_results = self._get_from_cache(cache_key)
         if cached_results is not None:
             print(f'✓ Using cached arXiv results for: {query[:50]}...')
             return cached_results[:limit]
-        self._rate_limit()
+        return await self._single_flight(cache_key, lambda: self._fetch_arxiv(cache_key, query, limit, sort_by))
+
+    async def _fetch_arxiv(self, cache_key: str, query: str, limit: int, sort_by: str) -> List[Dict[str, Any]]:
+        await self._rate_limit('arxiv')
         try:
             params = {'search_query': f'all:{query}', 'start': 0, 'max_results': limit, 'sortBy': sort_by, 'sortOrder': 'descending'}
-            response = requests.get(self.arxiv_base_url, params=params, timeout=10)
+            response = await self._get(self.arxiv_base_url, params)
             response.raise_for_status()
-            import xml.etree.ElementTree as ET
-            root = ET.fromstring(response.content)
-            namespaces = {'atom': 'http://www.w3.org/2005/Atom', 'arxiv': 'http://arxiv.org/schemas/atom'}
             formatted_papers = []
-            for entry in root.findall('atom:entry', namespaces):
-                authors = [author.find('atom:name', namespaces).text for author in entry.findall('atom:author', namespaces)]
-                published = entry.find('atom:published', namespaces).text
+            # Stream entries and free each one once read so the full feed is never resident
+            for _, entry in etree.iterparse(io.BytesIO(response.content), events=('end',), tag=_ATOM_ENTRY_TAG):
+                published = _PUBLISHED_XP(entry)
                 year = published.split('-')[0] if published else None
-                formatted_papers.append({'paper_id': entry.find('atom:id', namespaces).text, 'title': entry.find('atom:title', namespaces).text.strip(), 'authors': authors, 'year': year, 'abstract': entry.find('atom:summary', namespaces).text.strip(), 'citation_count': 0, 'publication_date': published, 'venue': 'arXiv preprint', 'url': entry.find('atom:id', namespaces).text, 'source': 'arXiv'})
+                entry_id = _ID_XP(entry)
+                formatted_papers.append(_with_short_abstract({'paper_id': entry_id, 'title': _TITLE_XP(entry), 'authors': [str(name) for name in _AUTHOR_XP(entry)], 'year': year, 'abstract': _SUMMARY_XP(entry), 'citation_count': 0, 'publication_date': published, 'venue': 'arXiv preprint', 'url': entry_id, 'source': 'arXiv'}))
+                entry.clear()
+                while entry.getprevious() is not None:
+                    del entry.getparent()[0]
+                if len(formatted_papers) >= limit:
+                    break
             self._save_to_cache(cache_key, formatted_papers)
             print(f'✓ Retrieved {len(formatted_papers)} papers from arXiv')
             return formatted_papers
@@ -101,15 +386,18 @@ class ResearchRetriever:
             return []
 
     def retrieve_papers(self, query: str, top_k: int=3, sources: List[str]=['semantic_scholar', 'arxiv']) -> List[Dict[str, Any]]:
-        all_papers = []
+        return self._run(self.aretrieve_papers(query, top_k, sources))
+
+    async def aretrieve_papers(self, query: str, top_k: int=3, sources: List[str]=['semantic_scholar', 'arxiv']) -> List[Dict[str, Any]]:
+        searches = []
         if 'semantic_scholar' in sources:
-            papers = self.search_semantic_scholar(query, limit=10)
-            all_papers.extend(papers)
+            searches.append(self.asearch_semantic_scholar(query, limit=10))
         if 'arxiv' in sources:
-            papers = self.search_arxiv(query, limit=10)
-            all_papers.extend(papers)
-        all_papers.sort(key=lambda p: (p.get('citation_count', 0), int(p.get('year', 0) or 0)), reverse=True)
-        top_papers = all_papers[:top_k]
+            searches.append(self.asearch_arxiv(query, limit=10))
+        all_papers = _dedupe_papers([paper for papers in await asyncio.gather(*searches) for paper in papers])
+        # Falls back to (citation_count, year) order when no embedder is available
+        ranked = await asyncio.to_thread(self._rerank, query, all_papers, top_k)
+        top_papers = [dict(paper) for paper in ranked]
         for paper in top_papers:
             paper['citation'] = self._format_citation(paper)
         return top_papers
@@ -136,27 +424,29 @@ class ResearchRetriever:
     def format_research_context(self, papers: List[Dict[str, Any]]) -> str:
         if not papers:
             return 'No relevant research papers found.'
-        context = '## Relevant Research Papers\n\n'
+        parts = ['## Relevant Research Papers\n\n']
+        append = parts.append
         for i, paper in enumerate(papers, 1):
-            context += f"### Paper {i}: {paper['title']}\n"
-            context += f"**Authors**: {', '.join(paper['authors'][:3])}"
+            append(f"### Paper {i}: {paper['title']}\n")
+            append(f"**Authors**: {', '.join(paper['authors'][:3])}")
             if len(paper['authors']) > 3:
-                context += ' et al.'
-            context += f"\n**Year**: {paper['year']}\n"
-            context += f"**Source**: {paper['source']}\n"
+                append(' et al.')
+            append(f"\n**Year**: {paper['year']}\n")
+            append(f"**Source**: {paper['source']}\n")
             if paper.get('citation_count', 0) > 0:
-                context += f"**Citations**: {paper['citation_count']}\n"
-            context += f"\n**Abstract**: {paper['abstract'][:300]}...\n"
-            context += f"\n**Citation**: {paper['citation']}\n"
-            context += f"**URL**: {paper['url']}\n\n"
-            context += '-' * 70 + '\n\n'
-        return context
+                append(f"**Citations**: {paper['citation_count']}\n")
+            append(f"\n**Abstract**: {(paper.get('abstract_short') or paper.get('abstract') or '')[:300]}...\n")
+            append(f"\n**Citation**: {paper['citation']}\n")
+            append(f"**URL**: {paper['url']}\n\n")
+            append('-' * 70 + '\n\n')
+        return ''.join(parts)
 
 def test_research_retrieval():
     print('\n' + '=' * 70)
     print('Testing Research Retrieval')
     print('=' * 70)
     retriever = ResearchRetriever()
+    retriever.warmup()
     query = 'SaaS pricing strategies and customer retention'
     print(f"\n1. Searching for: '{query}'")
     print('-' * 70)
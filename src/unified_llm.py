@@ -1,8 +1,30 @@
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, replace
+from functools import cached_property, lru_cache
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional, Mapping
 from src.config import Config
 from src.gpt5_wrapper import GPT5Wrapper
 from src.deepseek_wrapper import DeepSeekWrapper
 
+@dataclass(frozen=True, slots=True)
+class AgentConfig:
+    provider: str
+    model_attr: str
+    temperature: float
+    max_tokens: int
+# Per-agent settings under the hybrid strategy; None is the fallback for unknown agent types
+_AGENT_CONFIGS: Mapping[Optional[str], AgentConfig] = MappingProxyType({'research_synthesis': AgentConfig('deepseek', 'deepseek_reasoner', Config.TEMPERATURE_ANALYSIS, 32000), 'financial': AgentConfig('deepseek', 'deepseek_chat', Config.TEMPERATURE_CODING, 8000), 'market': AgentConfig('deepseek', 'deepseek_chat', Config.TEMPERATURE_CONVERSATION, 4000), 'operations': AgentConfig('deepseek', 'deepseek_chat', Config.TEMPERATURE_ANALYSIS, 4000), 'leadgen': AgentConfig('deepseek', 'deepseek_chat', Config.TEMPERATURE_CONVERSATION, 4000), 'router': AgentConfig('deepseek', 'deepseek_chat', Config.TEMPERATURE_CODING, 4000), 'synthesis': AgentConfig('deepseek', 'deepseek_chat', Config.TEMPERATURE_ANALYSIS, 4000), None: AgentConfig('gpt5', 'gpt5', Config.TEMPERATURE_ANALYSIS, 4000)})
+
+@lru_cache(maxsize=None)
+def _agent_config(strategy: str, agent_type: Optional[str]) -> AgentConfig:
+    config = _AGENT_CONFIGS.get(agent_type, _AGENT_CONFIGS[None])
+    if strategy == 'hybrid':
+        return config
+    max_tokens = 16000 if agent_type == 'research_synthesis' else config.max_tokens
+    if strategy == 'deepseek':
+        return replace(config, provider='deepseek', model_attr='deepseek_reasoner' if agent_type == 'research_synthesis' else 'deepseek_chat', max_tokens=max_tokens)
+    return replace(config, provider='gpt5', model_attr='gpt5', max_tokens=max_tokens)
+
 class UnifiedLLM:
 
     def __init__(self, agent_type: Optional[str]=None):
@@ -16,13 +38,17 @@ class UnifiedLLM:
         if self.strategy in ['deepseek', 'hybrid']:
             self.deepseek_chat = DeepSeekWrapper(model=Config.DEEPSEEK_CHAT_MODEL)
             self.deepseek_reasoner = DeepSeekWrapper(model=Config.DEEPSEEK_REASONER_MODEL)
+        # Routing depends only on (strategy, agent_type), both fixed after construction
+        self._cfg = _agent_config(self.strategy, agent_type)
+        self._model = getattr(self, self._cfg.model_attr)
 
     def generate(self, messages: List[Dict[str, str]]=None, input_text: str=None, instructions: str=None, temperature: float=None, max_tokens: int=None, tools: List[Dict[str, Any]]=None, **kwargs) -> str:
-        provider, model_name = self._select_model()
+        cfg = self._cfg
+        provider, model_name = (cfg.provider, self._model)
         if temperature is None:
-            temperature = self._get_optimal_temperature()
+            temperature = cfg.temperature
         if max_tokens is None:
-            max_tokens = self._get_optimal_max_tokens()
+            max_tokens = cfg.max_tokens
         try:
             if provider == 'gpt5':
                 return self.gpt5.generate(messages=messages, input_text=input_text, instructions=instructions, max_output_tokens=max_tokens, tools=tools, **kwargs)
@@ -36,46 +62,31 @@ class UnifiedLLM:
                 raise
 
     def _select_model(self) -> tuple:
-        if self.strategy == 'gpt5':
-            return ('gpt5', self.gpt5)
-        if self.strategy == 'deepseek':
-            if self.agent_type == 'research_synthesis':
-                return ('deepseek', self.deepseek_reasoner)
-            else:
-                return ('deepseek', self.deepseek_chat)
-        if self.strategy == 'hybrid':
-            return self._hybrid_routing()
-        return ('gpt5', self.gpt5)
-
-    def _hybrid_routing(self) -> tuple:
-        routing_map = {'research_synthesis': ('deepseek', self.deepseek_reasoner), 'financial': ('deepseek', self.deepseek_chat), 'market': ('deepseek', self.deepseek_chat), 'operations': ('deepseek', self.deepseek_chat), 'leadgen': ('deepseek', self.deepseek_chat), 'router': ('deepseek', self.deepseek_chat), 'synthesis': ('deepseek', self.deepseek_chat)}
-        return routing_map.get(self.agent_type, ('gpt5', self.gpt5))
+        return (self._cfg.provider, self._model)
 
     def _get_optimal_temperature(self) -> float:
-        temperature_map = {'financial': Config.TEMPERATURE_CODING, 'market': Config.TEMPERATURE_CONVERSATION, 'operations': Config.TEMPERATURE_ANALYSIS, 'leadgen': Config.TEMPERATURE_CONVERSATION, 'research_synthesis': Config.TEMPERATURE_ANALYSIS, 'router': Config.TEMPERATURE_CODING, 'synthesis': Config.TEMPERATURE_ANALYSIS}
-        return temperature_map.get(self.agent_type, Config.TEMPERATURE_ANALYSIS)
+        return self._cfg.temperature
 
     def _get_optimal_max_tokens(self) -> int:
-        if self.agent_type == 'research_synthesis':
-            return 32000 if self.strategy == 'hybrid' else 16000
-        if self.agent_type == 'financial':
-            return 8000
-        return 4000
+        return self._cfg.max_tokens
 
-    def get_current_provider(self) -> str:
-        provider, _ = self._select_model()
+    @cached_property
+    def current_provider(self) -> str:
+        provider, model = (self._cfg.provider, self._model)
         if provider == 'gpt5':
             return 'GPT-5-nano'
         elif provider == 'deepseek':
-            model = _
             if 'reasoner' in model.model:
                 return 'DeepSeek-V3.2-Exp (Reasoner)'
             else:
                 return 'DeepSeek-V3.2-Exp (Chat)'
         return 'Unknown'
 
+    def get_current_provider(self) -> str:
+        return self.current_provider
+
     def estimate_cost(self, input_tokens: int, output_tokens: int) -> float:
-        provider, model = self._select_model()
+        provider = self._cfg.provider
         if provider == 'gpt5':
             return (input_tokens * 0.015 + output_tokens * 0.06) / 1000000
         elif provider == 'deepseek':
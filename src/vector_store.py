@@ -1,64 +1,402 @@
 import chromadb
 from chromadb.config import Settings
 from chromadb.utils import embedding_functions
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+from openai import RateLimitError
+from typing import List, Dict, Any, Optional, Iterator
+import hashlib
+import json
 import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+import numpy as np
 from src.config import Config
+try:
+    from src.faiss_backend import FaissIVFPQBackend
+except ImportError:
+    FaissIVFPQBackend = None
+_EMBEDDING_MODEL = 'text-embedding-3-small'
+# Chroma's bundled ONNX MiniLM runs on CPU without a network round trip
+_LOCAL_EMBEDDING_MODEL = 'all-MiniLM-L6-v2'
+_EMBEDDING_DIMS = {_EMBEDDING_MODEL: 1536, _LOCAL_EMBEDDING_MODEL: 384}
+BATCH_SIZE = 250
+SEGMENT_CACHE_LIMIT_BYTES = int(os.getenv('CHROMA_MEMORY_LIMIT_BYTES', str(2 * 1024 ** 3)))
+# The embeddings endpoint accepts up to 2048 inputs per request
+EMBED_BATCH_SIZE = 2048
+EMBED_MAX_RETRIES = 5
+# Applied when a collection is created; existing collections keep their index settings
+_HNSW_METADATA = {'hnsw:space': 'cosine', 'hnsw:M': 16, 'hnsw:construction_ef': 200, 'hnsw:search_ef': 64}
+# Above this size the collection is served from a compressed FAISS IVF-PQ index instead of Chroma's HNSW
+LARGE_COLLECTION_THRESHOLD = 100000
+MIGRATION_PAGE_SIZE = 50000
+# Sign-bit codes give a coarse Hamming shortlist that is re-ranked with full float vectors
+BINARY_CANDIDATES = 50
+# Below this size a single HNSW query beats a full Hamming scan plus a second fetch for re-ranking
+BINARY_SEARCH_MIN_DOCS = 20000
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+def _quantize_int8(vector: List[float]) -> tuple:
+    # Symmetric scalar quantization: 1 byte per dimension instead of 4, negligible cosine error at these dimensions
+    vec = np.asarray(vector, dtype=np.float32)
+    scale = float(np.abs(vec).max()) / 127 or 1.0
+    return (scale, np.clip(np.rint(vec / scale), -127, 127).astype(np.int8).tobytes())
+
+def _dequantize_int8(scale: float, blob: bytes) -> List[float]:
+    return (np.frombuffer(blob, dtype=np.int8).astype(np.float32) * scale).tolist()
+
+@lru_cache(maxsize=None)
+def _get_persistent_client(path: str):
+    # Opening a PersistentClient loads SQLite and the HNSW segments, so one client is shared per directory
+    # LRU segment cache loads HNSW segments on demand and unloads cold ones past the memory limit
+    return chromadb.PersistentClient(path=path, settings=Settings(anonymized_telemetry=False, allow_reset=True, chroma_segment_cache_policy='LRU', chroma_memory_limit_bytes=SEGMENT_CACHE_LIMIT_BYTES))
+
+@lru_cache(maxsize=None)
+def _get_embedding_function(api_key: str, model_name: str):
+    return embedding_functions.OpenAIEmbeddingFunction(api_key=api_key, model_name=model_name)
+
+@lru_cache(maxsize=None)
+def _prewarm_embedding_function(api_key: str, model_name: str) -> None:
+    # One throwaway request per process opens the TLS connection before the first real query needs it
+    def warm():
+        try:
+            _get_embedding_function(api_key, model_name)(['warmup'])
+        except Exception:
+            pass
+    threading.Thread(target=warm, name='embedding-prewarm', daemon=True).start()
+
+class _SemanticCache:
+    # Results of earlier searches, matched by cosine similarity of their unit query vectors (one row per slot)
+    def __init__(self, max_entries: int, dims: int):
+        self.vectors = np.zeros((max_entries, dims), dtype=np.float32)
+        self.entries: List[Optional[tuple]] = [None] * max_entries
+        self.lru = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0}
+        # Index version the entries were computed against; a newer version empties the cache
+        self.version: Optional[int] = None
+
+    def clear(self) -> None:
+        # Caller holds lock
+        self.entries = [None] * len(self.entries)
+        self.lru.clear()
+        self.vectors[:] = 0
+
+@lru_cache(maxsize=None)
+def _get_semantic_cache(path: str, collection_name: str, embedding_model: str, max_entries: int) -> _SemanticCache:
+    # Shared by every VectorStore on the same collection in this process, like the persistent client
+    return _SemanticCache(max_entries, _EMBEDDING_DIMS[embedding_model])
+
+@lru_cache(maxsize=1)
+def _get_local_embedding_function():
+    return embedding_functions.ONNXMiniLM_L6_V2()
 
 class VectorStore:
+    QUERY_CACHE_MAX_ENTRIES = 1024
+    SEMANTIC_CACHE_MAX_ENTRIES = 500
+    SEMANTIC_CACHE_THRESHOLD = 0.95
 
-    def __init__(self, collection_name: str='business-research', persist_directory: str='./chroma_db'):
+    def __init__(self, collection_name: str='business-research', persist_directory: str='./chroma_db', local_embeddings: Optional[bool]=None):
         self.collection_name = collection_name
         self.persist_directory = persist_directory
-        self.client = chromadb.PersistentClient(path=persist_directory, settings=Settings(anonymized_telemetry=False, allow_reset=True))
-        self.embedding_function = embedding_functions.OpenAIEmbeddingFunction(api_key=Config.OPENAI_API_KEY, model_name='text-embedding-3-small')
+        self.client = _get_persistent_client(os.path.abspath(persist_directory))
+        # Vectors from the two models have different dimensions, so a collection must stick to one of them
+        self.local_embeddings = Config.VS_LOCAL_EMBED if local_embeddings is None else local_embeddings
+        if self.local_embeddings:
+            self.embedding_model = _LOCAL_EMBEDDING_MODEL
+            self.embedding_function = _get_local_embedding_function()
+        else:
+            self.embedding_model = _EMBEDDING_MODEL
+            self.embedding_function = _get_embedding_function(Config.OPENAI_API_KEY, _EMBEDDING_MODEL)
+            if Config.VS_PREWARM and not Config.OPENAI_API_KEY.startswith('sk-demo'):
+                _prewarm_embedding_function(Config.OPENAI_API_KEY, _EMBEDDING_MODEL)
         self.collection = self._get_or_create_collection()
+        # Query embeddings are cached in memory and on disk so repeated searches skip the OpenAI round trip
+        self._q_cache = OrderedDict()
+        self._q_lock = threading.Lock()
+        self._q_db = sqlite3.connect(os.path.join(persist_directory, 'query_embeddings.sqlite3'), check_same_thread=False, isolation_level=None)
+        # Vectors are stored int8-quantized with a per-vector scale
+        self._q_db.execute('CREATE TABLE IF NOT EXISTS query_embeddings_q8 (key TEXT PRIMARY KEY, scale REAL NOT NULL, vector BLOB NOT NULL)')
+        self.query_cache_stats = {'hits': 0, 'misses': 0}
+        self._sem_cache = _get_semantic_cache(os.path.abspath(persist_directory), collection_name, self.embedding_model, self.SEMANTIC_CACHE_MAX_ENTRIES)
+        self.semantic_cache_stats = self._sem_cache.stats
+        self._codes_db = sqlite3.connect(os.path.join(persist_directory, f'{collection_name}-binary-codes.sqlite3'), check_same_thread=False, isolation_level=None)
+        self._codes_db.execute('CREATE TABLE IF NOT EXISTS codes (doc_id TEXT PRIMARY KEY, bits BLOB NOT NULL)')
+        # Every VectorStore write to this collection, from any instance or process, bumps this shared version
+        self._codes_db.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+        self._codes_db.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('version', 0)")
+        self._codes_version: Optional[int] = None
+        self._codes: Optional[np.ndarray] = None
+        self._code_ids: List[str] = []
+        # Collection size is cached per index version so searches do not pay a count() round trip
+        self._doc_count: Optional[int] = None
+        self._large_backend = None
+        if FaissIVFPQBackend is not None and self._collection_count() > LARGE_COLLECTION_THRESHOLD:
+            self._large_backend = FaissIVFPQBackend(persist_directory=self._faiss_directory(), dim=_EMBEDDING_DIMS[self.embedding_model])
+            if self._large_backend.count() == 0:
+                self._migrate_to_faiss()
 
     def _get_or_create_collection(self):
         try:
             collection = self.client.get_collection(name=self.collection_name, embedding_function=self.embedding_function)
             print(f'✓ Loaded existing collection: {self.collection_name}')
         except Exception:
-            collection = self.client.create_collection(name=self.collection_name, embedding_function=self.embedding_function, metadata={'description': 'Business and academic research papers'})
+            collection = self.client.create_collection(name=self.collection_name, embedding_function=self.embedding_function, metadata={'description': 'Business and academic research papers', **_HNSW_METADATA})
             print(f'✓ Created new collection: {self.collection_name}')
         return collection
 
-    def add_documents(self, documents: List[str], metadatas: Optional[List[Dict[str, Any]]]=None, ids: Optional[List[str]]=None) -> None:
+    def _faiss_directory(self) -> str:
+        return os.path.join(self.persist_directory, f'{self.collection_name}-faiss')
+
+    def _migrate_to_faiss(self) -> None:
+        # The first page also trains the IVF centroids and PQ codebooks
+        total = self.collection.count()
+        for offset in range(0, total, MIGRATION_PAGE_SIZE):
+            page = self.collection.get(limit=MIGRATION_PAGE_SIZE, offset=offset, include=['documents', 'metadatas', 'embeddings'])
+            self._large_backend.add_documents(documents=page['documents'], embeddings=page['embeddings'], metadatas=page['metadatas'], ids=page['ids'])
+        print(f'✓ Migrated {total} documents from {self.collection_name} to FAISS IVF-PQ')
+
+    def add_documents(self, documents: List[str], metadatas: Optional[List[Dict[str, Any]]]=None, ids: Optional[List[str]]=None, embeddings: Optional[List[Any]]=None) -> None:
+        if not documents:
+            return
         if ids is None:
-            start_id = self.collection.count()
-            ids = [f'doc_{start_id + i}' for i in range(len(documents))]
-        self.collection.add(documents=documents, metadatas=metadatas, ids=ids)
+            # Random ids need no count round-trip and are safe across processes; they are no longer doc_{n}
+            ids = [uuid.uuid4().hex for _ in documents]
+        if embeddings is None:
+            # Embed up front in maximal requests (overlapped across threads) so Chroma never embeds per batch itself
+            slices = [documents[i:i + EMBED_BATCH_SIZE] for i in range(0, len(documents), EMBED_BATCH_SIZE)]
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                embeddings = [vector for batch in pool.map(self._embed_documents, slices) for vector in batch]
+        self._invalidate_semantic_cache()
+        if self._large_backend is not None:
+            self._large_backend.add_documents(documents=documents, embeddings=embeddings, metadatas=metadatas, ids=ids)
+            with self._q_lock:
+                self._bump_version()
+            print(f'✓ Added {len(documents)} documents to {self.collection_name}')
+            return
+        for i in range(0, len(documents), BATCH_SIZE):
+            self.collection.add(documents=documents[i:i + BATCH_SIZE], embeddings=embeddings[i:i + BATCH_SIZE], metadatas=metadatas[i:i + BATCH_SIZE] if metadatas else None, ids=ids[i:i + BATCH_SIZE])
+        bits = np.packbits(np.asarray(embeddings, dtype=np.float32) > 0, axis=1)
+        with self._q_lock:
+            self._codes_db.executemany('INSERT OR REPLACE INTO codes (doc_id, bits) VALUES (?, ?)', [(doc_id, row.tobytes()) for doc_id, row in zip(ids, bits)])
+            self._bump_version()
         print(f'✓ Added {len(documents)} documents to {self.collection_name}')
 
-    def search(self, query: str, top_k: int=5, filter_metadata: Optional[Dict[str, Any]]=None) -> List[Dict[str, Any]]:
-        results = self.collection.query(query_texts=[query], n_results=top_k, where=filter_metadata)
-        formatted_results = []
-        if results['ids'] and len(results['ids'][0]) > 0:
-            for i in range(len(results['ids'][0])):
-                formatted_results.append({'id': results['ids'][0][i], 'document': results['documents'][0][i], 'metadata': results['metadatas'][0][i] if results['metadatas'] else {}, 'distance': results['distances'][0][i] if results['distances'] else None})
-        return formatted_results
+    def _embed_documents(self, documents: List[str]) -> List[Any]:
+        for attempt in range(EMBED_MAX_RETRIES + 1):
+            try:
+                return list(self.embedding_function(documents))
+            except RateLimitError:
+                if attempt == EMBED_MAX_RETRIES:
+                    raise
+                time.sleep(0.5 * 2 ** attempt)
+
+    def _embed_query(self, query: str) -> List[float]:
+        key = hashlib.sha256(f'{self.embedding_model}:{query}'.encode()).hexdigest()
+        with self._q_lock:
+            vector = self._q_cache.get(key)
+            if vector is None:
+                row = self._q_db.execute('SELECT scale, vector FROM query_embeddings_q8 WHERE key = ?', (key,)).fetchone()
+                if row is not None:
+                    vector = _dequantize_int8(*row)
+            if vector is not None:
+                self.query_cache_stats['hits'] += 1
+                self._q_cache[key] = vector
+                self._q_cache.move_to_end(key)
+                return vector
+            self.query_cache_stats['misses'] += 1
+        vector = [float(x) for x in self.embedding_function([query])[0]]
+        with self._q_lock:
+            self._q_db.execute('INSERT OR REPLACE INTO query_embeddings_q8 (key, scale, vector) VALUES (?, ?, ?)', (key, *_quantize_int8(vector)))
+            self._q_cache[key] = vector
+            while len(self._q_cache) > self.QUERY_CACHE_MAX_ENTRIES:
+                self._q_cache.popitem(last=False)
+        return vector
+
+    def _load_codes(self) -> np.ndarray:
+        with self._q_lock:
+            if self._codes is None:
+                rows = self._codes_db.execute('SELECT doc_id, bits FROM codes').fetchall()
+                self._code_ids = [doc_id for doc_id, _ in rows]
+                self._codes = np.frombuffer(b''.join(bits for _, bits in rows), dtype=np.uint8).reshape(len(rows), -1) if rows else np.empty((0, 0), dtype=np.uint8)
+            return self._codes
+
+    def _bump_version(self) -> None:
+        # Caller holds _q_lock
+        self._codes_db.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+        self._codes = None
+        self._doc_count = None
+
+    def _index_version(self) -> int:
+        # One local SQLite read; drops the codes matrix and cached size when anyone else has written since
+        with self._q_lock:
+            version = self._codes_db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+            if version != self._codes_version:
+                self._codes_version = version
+                self._codes = None
+                self._doc_count = None
+            return version
+
+    def _collection_count(self) -> int:
+        self._index_version()
+        with self._q_lock:
+            if self._doc_count is None:
+                self._doc_count = self.collection.count()
+            return self._doc_count
+
+    def _binary_search(self, query_vec: List[float], top_k: int) -> Optional[List[Dict[str, Any]]]:
+        doc_count = self._collection_count()
+        if doc_count < BINARY_SEARCH_MIN_DOCS:
+            return None
+        codes = self._load_codes()
+        # Documents indexed before codes existed would be invisible to the shortlist
+        if len(codes) != doc_count:
+            return None
+        q = np.asarray(query_vec, dtype=np.float32)
+        hamming = _POPCOUNT[codes ^ np.packbits(q > 0)].sum(axis=1, dtype=np.uint32)
+        n = min(BINARY_CANDIDATES, len(hamming))
+        shortlist = np.argpartition(hamming, n - 1)[:n] if n < len(hamming) else np.arange(n)
+        results = self.collection.get(ids=[self._code_ids[i] for i in shortlist], include=['documents', 'metadatas', 'embeddings'])
+        vectors = np.asarray(results['embeddings'], dtype=np.float32)
+        sims = vectors @ q / (np.linalg.norm(vectors, axis=1) * np.linalg.norm(q) + 1e-12)
+        order = np.argsort(-sims)[:top_k]
+        return [{'id': results['ids'][i], 'document': results['documents'][i], 'metadata': results['metadatas'][i] if results['metadatas'] else {}, 'distance': float(1.0 - sims[i])} for i in order]
+
+    def _invalidate_semantic_cache(self) -> None:
+        cache = self._sem_cache
+        with cache.lock:
+            cache.clear()
+
+    def _semantic_lookup(self, unit_vec: np.ndarray, params: tuple, version: int) -> Optional[List[Dict[str, Any]]]:
+        cache = self._sem_cache
+        with cache.lock:
+            # Writes from other instances or processes only show up as a newer index version
+            if cache.version != version:
+                cache.clear()
+                cache.version = version
+            if cache.lru:
+                # Empty slots are zero rows, so they can never clear the threshold
+                sims = cache.vectors @ unit_vec
+                candidates = np.flatnonzero(sims >= self.SEMANTIC_CACHE_THRESHOLD)
+                for slot in candidates[np.argsort(-sims[candidates])]:
+                    entry_params, results = cache.entries[slot]
+                    if entry_params == params:
+                        cache.lru.move_to_end(int(slot))
+                        cache.stats['hits'] += 1
+                        return [dict(result) for result in results]
+            cache.stats['misses'] += 1
+            return None
+
+    def _semantic_store(self, unit_vec: np.ndarray, params: tuple, results: List[Dict[str, Any]], version: int) -> None:
+        cache = self._sem_cache
+        with cache.lock:
+            # The index changed while this search ran, so its results may already be stale
+            if cache.version != version:
+                return
+            if len(cache.lru) < len(cache.entries):
+                slot = next(i for i, entry in enumerate(cache.entries) if entry is None)
+            else:
+                slot, _ = cache.lru.popitem(last=False)
+            cache.vectors[slot] = unit_vec
+            cache.entries[slot] = (params, [dict(result) for result in results])
+            cache.lru[slot] = None
+
+    def search(self, query: str, top_k: int=5, filter_metadata: Optional[Dict[str, Any]]=None, query_embedding: Optional[List[float]]=None) -> List[Dict[str, Any]]:
+        return list(self.search_iter(query, top_k=top_k, filter_metadata=filter_metadata, query_embedding=query_embedding))
+
+    def search_iter(self, query: str, top_k: int=5, filter_metadata: Optional[Dict[str, Any]]=None, query_embedding: Optional[List[float]]=None) -> Iterator[Dict[str, Any]]:
+        query_vec = self._embed_query(query) if query_embedding is None else query_embedding
+        unit_vec = np.asarray(query_vec, dtype=np.float32)
+        unit_vec /= np.linalg.norm(unit_vec) or 1.0
+        params = (top_k, json.dumps(filter_metadata, sort_keys=True, default=str))
+        version = self._index_version()
+        cached = self._semantic_lookup(unit_vec, params, version)
+        if cached is not None:
+            yield from cached
+            return
+        results = []
+        for result in self._search_by_vector(query_vec, top_k, filter_metadata):
+            results.append(result)
+            yield result
+        # Only fully consumed searches are cached; a partial result list would look complete later
+        self._semantic_store(unit_vec, params, results, version)
+
+    def _search_by_vector(self, query_vec: List[float], top_k: int, filter_metadata: Optional[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        if self._large_backend is not None:
+            yield from self._large_backend.search(query_vec, top_k=top_k, filter_metadata=filter_metadata)
+            return
+        if filter_metadata is None:
+            shortlisted = self._binary_search(query_vec, top_k)
+            if shortlisted is not None:
+                yield from shortlisted
+                return
+        results = self.collection.query(query_embeddings=[query_vec], n_results=top_k, where=filter_metadata)
+        if not results['ids'] or not results['ids'][0]:
+            return
+        metadatas = results['metadatas'][0] if results['metadatas'] else repeat({})
+        distances = results['distances'][0] if results['distances'] else repeat(None)
+        for doc_id, document, metadata, distance in zip(results['ids'][0], results['documents'][0], metadatas, distances):
+            yield {'id': doc_id, 'document': document, 'metadata': metadata, 'distance': distance}
 
     def get_by_id(self, ids: List[str]) -> List[Dict[str, Any]]:
+        return list(self.get_by_id_iter(ids))
+
+    def get_by_id_iter(self, ids: List[str]) -> Iterator[Dict[str, Any]]:
+        if self._large_backend is not None:
+            yield from self._large_backend.get_by_id(ids)
+            return
         results = self.collection.get(ids=ids)
-        formatted_results = []
-        for i in range(len(results['ids'])):
-            formatted_results.append({'id': results['ids'][i], 'document': results['documents'][i], 'metadata': results['metadatas'][i] if results['metadatas'] else {}})
-        return formatted_results
+        metadatas = results['metadatas'] if results['metadatas'] else repeat({})
+        for doc_id, document, metadata in zip(results['ids'], results['documents'], metadatas):
+            yield {'id': doc_id, 'document': document, 'metadata': metadata}
 
     def count(self) -> int:
+        if self._large_backend is not None:
+            return self._large_backend.count()
         return self.collection.count()
 
     def delete(self, ids: List[str]) -> None:
-        self.collection.delete(ids=ids)
+        if self._large_backend is not None:
+            self._large_backend.delete(ids)
+        else:
+            self.collection.delete(ids=ids)
+        with self._q_lock:
+            if self._large_backend is None:
+                self._codes_db.executemany('DELETE FROM codes WHERE doc_id = ?', [(doc_id,) for doc_id in ids])
+            self._bump_version()
+        self._invalidate_semantic_cache()
         print(f'✓ Deleted {len(ids)} documents from {self.collection_name}')
 
     def reset(self) -> None:
         self.client.delete_collection(name=self.collection_name)
+        self._invalidate_semantic_cache()
+        with self._q_lock:
+            self._codes_db.execute('DELETE FROM codes')
+            self._bump_version()
+        if self._large_backend is not None:
+            self._large_backend.close()
+            self._large_backend = None
+            shutil.rmtree(self._faiss_directory(), ignore_errors=True)
         self.collection = self._get_or_create_collection()
         print(f'  Reset collection: {self.collection_name}')
 
+    def close(self) -> None:
+        # The Chroma client is shared per path and stays open; only this instance's sidecars are closed
+        with self._q_lock:
+            self._q_db.close()
+            self._codes_db.close()
+        if self._large_backend is not None:
+            self._large_backend.close()
+
     def get_stats(self) -> Dict[str, Any]:
-        return {'collection_name': self.collection_name, 'document_count': self.count(), 'persist_directory': self.persist_directory, 'embedding_model': 'text-embedding-3-small'}
+        lookups = self.query_cache_stats['hits'] + self.query_cache_stats['misses']
+        hit_rate = self.query_cache_stats['hits'] / lookups if lookups else 0.0
+        return {'collection_name': self.collection_name, 'document_count': self.count(), 'persist_directory': self.persist_directory, 'embedding_model': self.embedding_model, 'index': 'faiss-ivfpq' if self._large_backend is not None else 'chroma-hnsw', 'query_cache_hits': self.query_cache_stats['hits'], 'query_cache_misses': self.query_cache_stats['misses'], 'query_cache_hit_rate': round(hit_rate, 3), 'semantic_cache_hits': self.semantic_cache_stats['hits'], 'semantic_cache_misses': self.semantic_cache_stats['misses']}
 
 def test_vector_store():
     print('\n' + '=' * 70)
@@ -68,9 +406,11 @@ def test_vector_store():
     sample_docs = ['SaaS pricing strategies include value-based, tiered, and usage-based models.', 'Customer retention improves with regular engagement and personalized onboarding.', 'Market segmentation helps target the right customers with tailored messaging.', 'Financial modeling for startups should include burn rate and runway calculations.']
     sample_metadata = [{'topic': 'pricing', 'source': 'test'}, {'topic': 'retention', 'source': 'test'}, {'topic': 'marketing', 'source': 'test'}, {'topic': 'finance', 'source': 'test'}]
     print('\n1. Adding sample documents...')
-    vs.add_documents(documents=sample_docs, metadatas=sample_metadata)
+    # One embedding request covers the sample documents and the demo query
+    vectors = vs._embed_documents(sample_docs + ['pricing strategies'])
+    vs.add_documents(documents=sample_docs, metadatas=sample_metadata, embeddings=vectors[:-1])
     print("\n2. Searching for 'pricing strategies'...")
-    results = vs.search('pricing strategies', top_k=2)
+    results = vs.search('pricing strategies', top_k=2, query_embedding=vectors[-1])
     for i, result in enumerate(results, 1):
         print(f'\n   Result {i}:')
         print(f"   Document: {result['document'][:80]}...")
@@ -82,6 +422,7 @@ def test_vector_store():
         print(f'   {key}: {value}')
     print('\n4. Cleaning up test collection...')
     vs.reset()
+    vs.close()
     print('\n' + '=' * 70)
     print('✓ Vector Store test complete!')
     print('=' * 70 + '\n')
@@ -33,12 +33,16 @@ class TestABTestManager(unittest.TestCase):
 
     def test_split_ratio(self):
         num_users = 1000
-        assignments = [self.ab_test.assign_user(f'user_{i}') for i in range(num_users)]
-        treatment_count = sum((1 for a in assignments if a == 'treatment'))
+        assignments = self.ab_test.assign_users([f'user_{i}' for i in range(num_users)])
+        treatment_count = int((assignments == 'treatment').sum())
         treatment_ratio = treatment_count / num_users
         self.assertGreater(treatment_ratio, 0.45)
         self.assertLess(treatment_ratio, 0.55)
 
+    def test_batch_assignment_matches_single(self):
+        user_ids = [f'user_{i}' for i in range(200)]
+        self.assertEqual(list(self.ab_test.assign_users(user_ids)), [self.ab_test.assign_user(u) for u in user_ids])
+
     def test_log_result(self):
         self.ab_test.log_result(user_id='user_1', query='test query', response='test response', metrics={'latency': 1.5, 'quality': 0.8})
         results_path = os.path.join(self.test_dir, 'test_experiment.json')
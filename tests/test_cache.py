@@ -0,0 +1,271 @@
+import unittest
+import json
+import tempfile
+import shutil
+import time
+from pathlib import Path
+from unittest import mock
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.cache import RedisCache, FileCache, QueryCache, _derive_key, _pack, _unpack
+
+class FakeRedis:
+
+    def __init__(self):
+        self.store = {}
+
+    def ping(self):
+        return True
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def setex(self, key, ttl, value):
+        self.store[key] = value
+
+    def mget(self, keys):
+        return [self.store.get(key) for key in keys]
+
+    def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+    def unlink(self, *keys):
+        self.delete(*keys)
+
+    def scan_iter(self, match=None, count=None):
+        prefix = match.rstrip('*') if match else ''
+        return [k for k in list(self.store) if k.startswith(prefix)]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+class FakePipeline:
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+        self.executions = 0
+
+    def __getattr__(self, name):
+        method = getattr(self.redis, name)
+        return lambda *args, **kwargs: self.commands.append((method, args, kwargs))
+
+    def execute(self):
+        self.executions += 1
+        results = [method(*args, **kwargs) for method, args, kwargs in self.commands]
+        self.commands = []
+        return results
+
+class TestSerialization(unittest.TestCase):
+
+    def test_roundtrip(self):
+        value = {'papers': [{'title': 'A', 'year': 2024}], 'paper_count': 1, 'research_context': 'ctx'}
+        self.assertEqual(_unpack(_pack(value)), value)
+
+    def test_large_payload_compressed(self):
+        value = {'papers': [{'abstract': 'pricing strategy ' * 50, 'year': i} for i in range(20)]}
+        packed = _pack(value)
+        self.assertEqual(packed[:1], b'\x02')
+        self.assertLess(len(packed), 4096)
+        self.assertEqual(_unpack(packed), value)
+
+    def test_small_payload_not_compressed(self):
+        self.assertEqual(_pack('short')[:1], b'\x01')
+
+    def test_unserializable_values_coerced_to_str(self):
+        self.assertEqual(_unpack(_pack({'path': Path('a/b')})), {'path': 'a/b'})
+
+    def test_legacy_json_payload(self):
+        self.assertEqual(_unpack(json.dumps({'a': 1}).encode()), {'a': 1})
+        self.assertEqual(_unpack(b'\x00' + json.dumps('text').encode()), 'text')
+
+class TestRedisCache(unittest.TestCase):
+
+    def setUp(self):
+        self.fake = FakeRedis()
+        with mock.patch('redis.Redis', return_value=self.fake):
+            self.cache = RedisCache(redis_url='redis://localhost:6379/0', namespace='test')
+
+    def test_set_and_get(self):
+        self.cache.set('k', {'answer': 'yes'}, ttl=60)
+        self.assertEqual(self.cache.get('k'), {'answer': 'yes'})
+        self.assertIn('test:k', self.fake.store)
+
+    def test_get_missing(self):
+        self.assertIsNone(self.cache.get('missing'))
+
+    def test_reads_legacy_json_entries(self):
+        self.fake.store['test:old'] = json.dumps(['a', 'b']).encode()
+        self.assertEqual(self.cache.get('old'), ['a', 'b'])
+
+    def test_clear_only_namespace(self):
+        self.cache.set('k1', 1, ttl=60)
+        self.cache.set('k2', 2, ttl=60)
+        self.fake.store['other:k'] = b'1'
+        self.cache.clear()
+        self.assertEqual(list(self.fake.store), ['other:k'])
+
+    def test_clear_batches_unlinks(self):
+        for i in range(25):
+            self.cache.set(f'k{i}', i, ttl=60)
+        pipe = FakePipeline(self.fake)
+        with mock.patch.object(self.fake, 'pipeline', return_value=pipe), mock.patch.object(RedisCache, 'CLEAR_BATCH_SIZE', 10):
+            self.cache.clear()
+        self.assertEqual(pipe.executions, 3)
+        self.assertEqual(self.fake.store, {})
+
+class TestFileCache(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache = FileCache(self.test_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_set_and_get(self):
+        self.cache.set('k', {'papers': [1, 2, 3]}, ttl=60)
+        self.assertEqual(self.cache.get('k'), {'papers': [1, 2, 3]})
+
+    def test_get_missing(self):
+        self.assertIsNone(self.cache.get('missing'))
+
+    def test_expired_entry_removed(self):
+        self.cache.set('k', 'v', ttl=-1)
+        self.assertIsNone(self.cache.get('k'))
+        self.assertFalse(self.cache._path('k').exists())
+
+    def test_set_leaves_no_temp_files(self):
+        self.cache.set('k', 'v1', ttl=60)
+        self.cache.set('k', 'v2', ttl=60)
+        self.assertEqual(self.cache.get('k'), 'v2')
+        self.assertEqual([p.name for p in Path(self.test_dir).iterdir()], [self.cache._path('k').name])
+
+    def test_clear(self):
+        self.cache.set('k1', 1, ttl=60)
+        self.cache.set('k2', 2, ttl=60)
+        self.cache.clear()
+        self.assertEqual(list(Path(self.test_dir).iterdir()), [])
+
+class TestQueryCacheBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.fake = FakeRedis()
+        with mock.patch('redis.Redis', return_value=self.fake), mock.patch.dict('os.environ', {'CACHE_ENABLED': 'true'}):
+            self.cache = QueryCache()
+
+    def test_batch_roundtrip(self):
+        self.cache.set_agent_responses_batch({'market': 'm', 'financial': 'f'}, 'query', has_research=True)
+        self.assertEqual(self.cache.stats['saves'], 2)
+        responses = self.cache.get_agent_responses_batch(['market', 'financial', 'leadgen'], 'query', has_research=True)
+        self.assertEqual(responses, {'market': 'm', 'financial': 'f'})
+        self.assertEqual(self.cache.stats['hits'], 2)
+        self.assertEqual(self.cache.stats['misses'], 1)
+
+    def test_batch_matches_single_key_api(self):
+        self.cache.set_agent_response('operations', 'query', 'ops')
+        self.assertEqual(self.cache.get_agent_responses_batch(['operations'], 'query'), {'operations': 'ops'})
+        self.cache.set_agent_responses_batch({'leadgen': 'leads'}, 'query')
+        self.assertEqual(self.cache.get_agent_response('leadgen', 'query'), 'leads')
+
+class TestQueryCacheL1(unittest.TestCase):
+
+    def setUp(self):
+        self.fake = FakeRedis()
+        with mock.patch('redis.Redis', return_value=self.fake), mock.patch.dict('os.environ', {'CACHE_ENABLED': 'true'}):
+            self.cache = QueryCache()
+
+    def test_hit_served_without_backend(self):
+        self.cache.set_simple_answer('q', 'a')
+        with mock.patch.object(self.cache.backend, 'get_raw', side_effect=AssertionError('backend hit')):
+            self.assertEqual(self.cache.get_simple_answer('q'), 'a')
+        self.assertEqual(self.cache.stats['hits'], 1)
+
+    def test_backend_hit_populates_l1(self):
+        self.cache.backend.set(self.cache._make_key('simple', 'q'), 'a', 60)
+        self.assertEqual(self.cache.get_simple_answer('q'), 'a')
+        self.fake.store.clear()
+        self.assertEqual(self.cache.get_simple_answer('q'), 'a')
+
+    def test_expired_entry_falls_through(self):
+        self.cache.set_simple_answer('q', 'a')
+        with mock.patch('src.cache.time.time', return_value=time.time() + QueryCache.L1_TTL + 1):
+            self.assertIsNone(self.cache._l1_get(self.cache._make_key('simple', 'q')))
+
+    def test_lru_eviction(self):
+        with mock.patch.object(QueryCache, 'L1_MAX_ENTRIES', 2):
+            for q in ('a', 'b', 'c'):
+                self.cache.set_simple_answer(q, q)
+        self.assertEqual(len(self.cache._l1), 2)
+        self.assertIsNone(self.cache._l1_get(self.cache._make_key('simple', 'a')))
+
+    def test_empty_research_uses_short_ttl(self):
+        with mock.patch.object(self.cache.backend, 'set_raw') as backend_set:
+            self.cache.set_empty_research('q', {'papers': [], 'research_context': ''})
+        self.assertEqual(backend_set.call_args[0][2], QueryCache.TTL_NEGATIVE)
+        self.assertEqual(self.cache.get_research('q'), {'papers': [], 'research_context': ''})
+
+    def test_set_encodes_once_for_both_tiers(self):
+        with mock.patch('src.cache._pack', wraps=_pack) as pack:
+            self.cache.set_research('q', {'papers': [1]})
+        self.assertEqual(pack.call_count, 1)
+        key = self.cache._make_key('research', 'q')
+        self.assertEqual(self.fake.store[f'bi:{key}'], self.cache._l1[key][0])
+
+    def test_l1_decodes_payload_once(self):
+        key = self.cache._make_key('simple', 'q')
+        self.cache._l1_put(key, _pack('a'), 60)
+        with mock.patch('src.cache._unpack', wraps=_unpack) as unpack:
+            self.assertEqual(self.cache.get_simple_answer('q'), 'a')
+            self.assertEqual(self.cache.get_simple_answer('q'), 'a')
+        self.assertEqual(unpack.call_count, 1)
+
+    def test_l1_hits_return_independent_containers(self):
+        papers = {'papers': [1]}
+        self.cache.set_research('q', papers)
+        papers['papers'].append(2)
+        first = self.cache.get_research('q')
+        first['papers'].append(3)
+        self.assertEqual(self.cache.get_research('q'), {'papers': [1]})
+
+    def test_routing_keyed_on_normalized_query(self):
+        self.cache.set_routing('How do I  grow revenue?', ['market', 'leadgen'])
+        self.assertEqual(self.cache.get_routing('how do i grow\trevenue?'), ['market', 'leadgen'])
+        self.assertIsNone(self.cache.get_routing('how do i grow profit?'))
+
+    def test_clear_empties_l1(self):
+        self.cache.set_simple_answer('q', 'a')
+        self.cache.clear()
+        self.assertIsNone(self.cache.get_simple_answer('q'))
+
+class TestQueryCacheKeys(unittest.TestCase):
+
+    def setUp(self):
+        with mock.patch.dict('os.environ', {'CACHE_ENABLED': 'false'}):
+            self.cache = QueryCache()
+
+    def test_key_is_stable(self):
+        self.assertEqual(self.cache._make_key('agent', 'market', 'q', 'True'), self.cache._make_key('agent', 'market', 'q', 'True'))
+
+    def test_key_depends_on_parts(self):
+        self.assertNotEqual(self.cache._make_key('agent', 'market', 'q'), self.cache._make_key('agent', 'market', 'q2'))
+        self.assertNotEqual(self.cache._make_key('agent', 'a::b'), self.cache._make_key('agent', 'a', 'b'))
+
+    def test_key_format(self):
+        key = self.cache._make_key('research', 'query')
+        prefix, content_hash = key.split(':')
+        self.assertEqual(prefix, 'research')
+        self.assertEqual(len(content_hash), 11)
+        self.cache.client_id = 'acme'
+        self.assertTrue(self.cache._make_key('research', 'query').startswith('client:acme:research:'))
+
+    def test_key_derivation_is_memoized(self):
+        _derive_key.cache_clear()
+        self.cache.get_research('repeated query')
+        self.cache.set_research('repeated query', {'papers': []})
+        info = _derive_key.cache_info()
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.hits, 1)
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+import os
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault('OPENAI_API_KEY', 'sk-demo-test')
+os.environ.setdefault('DEEPSEEK_API_KEY', 'sk-demo-test')
+from src.gpt5_wrapper import GPT5Wrapper, _convert_tools_cached, _get_shared_client
+TOOLS = [{'type': 'function', 'function': {'name': 'calculate', 'description': 'Run a calculation', 'parameters': {'type': 'object'}}}, {'type': 'web_search'}]
+
+class TestGPT5Wrapper(unittest.TestCase):
+
+    def setUp(self):
+        _get_shared_client.cache_clear()
+        self.addCleanup(_get_shared_client.cache_clear)
+        with mock.patch('src.gpt5_wrapper.OpenAI'):
+            self.llm = GPT5Wrapper()
+        self.llm.mock_mode = False
+        self.llm.is_gpt5 = True
+
+    def test_client_shared_between_instances(self):
+        self.assertIs(GPT5Wrapper().client, self.llm.client)
+
+    def test_async_client_shared_per_loop(self):
+
+        async def clients():
+            return (self.llm.aclient, GPT5Wrapper().aclient)
+        with mock.patch('src.gpt5_wrapper.AsyncOpenAI', side_effect=lambda **kwargs: object()):
+            first, second = asyncio.run(clients())
+            other_loop, _ = asyncio.run(clients())
+        self.assertIs(first, second)
+        self.assertIsNot(first, other_loop)
+
+    def test_convert_tools(self):
+        converted = self.llm._convert_tools_to_gpt5(TOOLS)
+        self.assertEqual(converted, [{'type': 'function', 'name': 'calculate', 'description': 'Run a calculation', 'parameters': {'type': 'object'}}, {'type': 'web_search'}])
+
+    def test_convert_tools_is_cached(self):
+        _convert_tools_cached.cache_clear()
+        self.llm._convert_tools_to_gpt5(TOOLS)
+        self.llm._convert_tools_to_gpt5([dict(tool) for tool in TOOLS])
+        info = _convert_tools_cached.cache_info()
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.hits, 1)
+
+    def test_convert_tools_returns_fresh_list(self):
+        first = self.llm._convert_tools_to_gpt5(TOOLS)
+        first.append({'type': 'extra'})
+        self.assertEqual(len(self.llm._convert_tools_to_gpt5(TOOLS)), 2)
+
+    def test_convert_tools_returns_fresh_schemas(self):
+        first = self.llm._convert_tools_to_gpt5(TOOLS)
+        first[0]['name'] = 'mutated'
+        first[0]['parameters']['required'] = ['x']
+        self.assertEqual(self.llm._convert_tools_to_gpt5(TOOLS)[0], {'type': 'function', 'name': 'calculate', 'description': 'Run a calculation', 'parameters': {'type': 'object'}})
+
+    def test_messages_split_into_instructions_and_input(self):
+        self.llm.client.responses.create.return_value = SimpleNamespace(output_text='ok')
+        messages = [{'role': 'system', 'content': 'be brief'}, {'role': 'user', 'content': 'hi'}, {'role': 'system', 'content': 'ignored'}]
+        self.assertEqual(self.llm.generate(messages=messages), 'ok')
+        params = self.llm.client.responses.create.call_args.kwargs
+        self.assertEqual(params['instructions'], 'be brief')
+        self.assertEqual(params['input'], 'hi')
+
+    def test_explicit_instructions_win(self):
+        self.llm.client.responses.create.return_value = SimpleNamespace(output_text='ok')
+        messages = [{'role': 'system', 'content': 'be brief'}, {'role': 'user', 'content': 'a'}, {'role': 'assistant', 'content': 'b'}]
+        self.llm.generate(messages=messages, instructions='explicit')
+        params = self.llm.client.responses.create.call_args.kwargs
+        self.assertEqual(params['instructions'], 'explicit')
+        self.assertEqual(params['input'], messages[1:])
+
+    def test_extract_output_text(self):
+        self.assertEqual(self.llm._extract_text_from_response(SimpleNamespace(output_text='done')), 'done')
+
+    def test_extract_walks_output_items(self):
+        content = [SimpleNamespace(type='reasoning'), SimpleNamespace(type='output_text', text='from output')]
+        response = SimpleNamespace(output_text='', output=[SimpleNamespace(type='reasoning'), SimpleNamespace(type='message', content=content)])
+        self.assertEqual(self.llm._extract_text_from_response(response), 'from output')
+        self.assertEqual(self.llm._extract_text_from_response(SimpleNamespace()), 'No text output found in response')
+
+    def test_agenerate_uses_async_client(self):
+        self.llm._aclient = mock.Mock()
+        self.llm._aclient.responses.create = mock.AsyncMock(return_value=SimpleNamespace(output_text='async ok'))
+        result = asyncio.run(self.llm.agenerate(messages=[{'role': 'system', 'content': 'sys'}, {'role': 'user', 'content': 'q'}], tools=TOOLS))
+        self.assertEqual(result, 'async ok')
+        params = self.llm._aclient.responses.create.call_args.kwargs
+        self.assertEqual(params['instructions'], 'sys')
+        self.assertEqual(params['tools'], self.llm._convert_tools_to_gpt5(TOOLS))
+        self.llm.client.responses.create.assert_not_called()
+
+    def test_agenerate_reports_errors(self):
+        self.llm._aclient = mock.Mock()
+        self.llm._aclient.responses.create = mock.AsyncMock(side_effect=RuntimeError('boom'))
+        self.assertEqual(asyncio.run(self.llm.agenerate(input_text='q')), 'Error generating response: boom')
+
+    def test_generate_stream_yields_text_deltas(self):
+        events = [SimpleNamespace(type='response.created'), SimpleNamespace(type='response.output_text.delta', delta='Hel'), SimpleNamespace(type='response.output_text.delta', delta='lo'), SimpleNamespace(type='response.completed')]
+        self.llm.client.responses.create.return_value = iter(events)
+        self.assertEqual(list(self.llm.generate_stream(input_text='q')), ['Hel', 'lo'])
+        self.assertTrue(self.llm.client.responses.create.call_args.kwargs['stream'])
+
+    def test_agenerate_stream_yields_text_deltas(self):
+
+        async def events():
+            yield SimpleNamespace(type='response.output_text.delta', delta='Hi')
+            yield SimpleNamespace(type='response.completed')
+
+        async def collect():
+            return [delta async for delta in self.llm.agenerate_stream(input_text='q')]
+        self.llm._aclient = mock.Mock()
+        self.llm._aclient.responses.create = mock.AsyncMock(return_value=events())
+        self.assertEqual(asyncio.run(collect()), ['Hi'])
+        self.assertTrue(self.llm._aclient.responses.create.call_args.kwargs['stream'])
+
+    def test_generate_stream_chat_completions(self):
+        self.llm.is_gpt5 = False
+        chunks = [SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content='a'))]), SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=None))]), SimpleNamespace(choices=[])]
+        self.llm.client.chat.completions.create.return_value = iter(chunks)
+        self.assertEqual(list(self.llm.generate_stream(messages=[{'role': 'user', 'content': 'q'}])), ['a'])
+if __name__ == '__main__':
+    unittest.main()
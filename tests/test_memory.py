@@ -0,0 +1,43 @@
+import unittest
+from pathlib import Path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.memory import ConversationMemory, Message
+
+class TestConversationMemory(unittest.TestCase):
+
+    def setUp(self):
+        self.memory = ConversationMemory(max_messages=3)
+
+    def test_context_string(self):
+        scenarios = [([('user', 'hi'), ('assistant', 'hello')], 'USER: hi\n\nASSISTANT: hello'), ([('user', f'm{i}') for i in range(5)], 'USER: m2\n\nUSER: m3\n\nUSER: m4')]
+        for pairs, expected in scenarios:
+            with self.subTest(messages=len(pairs)):
+                memory = ConversationMemory(max_messages=3)
+                for role, content in pairs:
+                    memory.add_message(role, content)
+                self.assertEqual(memory.get_context_string(), expected)
+                self.assertEqual(len(memory.get_messages()), min(len(pairs), 3))
+
+    def test_messages_stored_as_tuples(self):
+        self.memory.add_message('user', 'hi')
+        self.assertEqual(self.memory.messages[0], Message('user', 'hi'))
+        self.assertEqual(self.memory.get_messages(), [{'role': 'user', 'content': 'hi'}])
+
+    def test_add_messages_matches_add_message(self):
+        pairs = [('user', f'Question {i}') for i in range(2)] + [('assistant', f'Answer {i}') for i in range(3)]
+        self.memory.add_messages(pairs)
+        expected = ConversationMemory(max_messages=3)
+        for role, content in pairs:
+            expected.add_message(role, content)
+        self.assertEqual(list(self.memory.messages), list(expected.messages))
+        self.assertEqual(self.memory.get_context_string(), expected.get_context_string())
+
+    def test_clear(self):
+        self.memory.add_message('user', 'hi')
+        self.memory.clear()
+        self.assertEqual(self.memory.get_context_string(), '')
+        self.memory.add_message('user', 'again')
+        self.assertEqual(self.memory.get_context_string(), 'USER: again')
+if __name__ == '__main__':
+    unittest.main()
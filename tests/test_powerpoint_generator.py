@@ -0,0 +1,74 @@
+import unittest
+import tempfile
+import shutil
+from datetime import datetime
+from pathlib import Path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+from src.schemas import AgentOutput, Findings, Metric, AgentMetadata, Recommendation, Citation
+from src.generators import PowerPointGenerator
+from unittest import mock
+from src.generators import ChartGenerator
+from src.generators.powerpoint_generator import _metric_charts, _metric_chart_bytes
+
+def make_output(metrics=None, recommendations=None):
+    findings = Findings(executive_summary='Unit economics are healthy.', narrative='Narrative.', metrics=metrics or {}, key_findings=['LTV:CAC is 3:1', 'Payback is 12 months'], risks=['Churn is rising'], recommendations=recommendations or [])
+    citations = [Citation(title='SaaS Metrics 2.0', authors=['David Skok', 'Other'], year=2015, url='https://example.com', relevance='Benchmarks')]
+    return AgentOutput(query='What are my SaaS unit economics?', agent='financial', timestamp=datetime(2025, 1, 2), findings=findings, research_citations=citations, metadata=AgentMetadata(model='test-model'))
+
+class TestPowerPointGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.generator = PowerPointGenerator()
+        _metric_charts.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _generate(self, output):
+        path = self.generator.generate(output, output_path=str(Path(self.test_dir) / 'deck.pptx'))
+        return Presentation(path)
+
+    def test_generate_deck(self):
+        recs = [Recommendation(title='Cut churn', priority='high', impact='LTV +40%', rationale='Churn erodes value', action_items=['Launch CS program', 'Add QBRs'])]
+        prs = self._generate(make_output(recommendations=recs))
+        texts = [shape.text_frame.text for slide in prs.slides for shape in slide.shapes if shape.has_text_frame]
+        self.assertIn('• LTV:CAC is 3:1\n• Payback is 12 months', texts)
+        self.assertIn('• Launch CS program', '\n'.join(texts))
+        self.assertIn('David Skok et al. (2015). SaaS Metrics 2.0. https://example.com', texts)
+
+    def test_metric_slides_embed_charts(self):
+        metrics = {f'metric_{i}': Metric(value=i * 100, unit='USD') for i in range(8)}
+        prs = self._generate(make_output(metrics=metrics))
+        pictures = [shape for slide in prs.slides for shape in slide.shapes if shape.shape_type == MSO_SHAPE_TYPE.PICTURE]
+        self.assertEqual(len(pictures), 2)
+
+    def test_non_numeric_metrics_fall_back_to_text(self):
+        prs = self._generate(make_output(metrics={'arr': Metric(value=1200000, unit='USD'), 'segment': Metric(value='enterprise', unit='')}))
+        texts = [shape.text_frame.text for slide in prs.slides for shape in slide.shapes if shape.has_text_frame]
+        self.assertIn('Arr: 1,200,000\nSegment: enterprise', texts)
+
+    def test_metric_charts_cached(self):
+        metrics = {'cac': Metric(value=5000, unit='USD'), 'ltv': Metric(value=15000, unit='USD')}
+        with mock.patch.object(ChartGenerator, 'generate_metric_comparison', autospec=True, side_effect=ChartGenerator.generate_metric_comparison) as render:
+            self._generate(make_output(metrics=metrics))
+            self.generator = PowerPointGenerator()
+            self._generate(make_output(metrics=metrics))
+        self.assertEqual(render.call_count, 1)
+        self.assertEqual(len(_metric_charts), 1)
+
+    def test_unhashable_metric_values_skip_cache(self):
+        self.assertIsNone(_metric_chart_bytes(ChartGenerator(), (('a', [1, 2]),)))
+        self.assertEqual(len(_metric_charts), 0)
+
+    def test_render_failures_not_cached(self):
+        items = (('cac', 5000),)
+        with mock.patch.object(ChartGenerator, 'generate_metric_comparison', side_effect=[RuntimeError('boom'), b'png']):
+            self.assertIsNone(_metric_chart_bytes(self.generator.chart_gen, items))
+            self.assertEqual(_metric_chart_bytes(self.generator.chart_gen, items), b'png')
+        self.assertEqual(list(_metric_charts.values()), [b'png'])
+if __name__ == '__main__':
+    unittest.main()
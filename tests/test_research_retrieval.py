@@ -0,0 +1,256 @@
+import unittest
+import asyncio
+import tempfile
+import shutil
+import time
+from pathlib import Path
+from unittest import mock
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import httpx
+import numpy as np
+from src.tools import research_retrieval
+from src.tools.research_retrieval import ResearchRetriever, TokenBucket, _mmr_select
+AsyncClient = httpx.AsyncClient
+ARXIV_FEED = b'<?xml version="1.0" encoding="UTF-8"?>\n<feed xmlns="http://www.w3.org/2005/Atom">\n  <entry>\n    <id>http://arxiv.org/abs/2401.00001v1</id>\n    <published>2024-01-02T00:00:00Z</published>\n    <title> Dynamic Pricing\n      for SaaS </title>\n    <summary> We study pricing. </summary>\n    <author><name>Ada Lovelace</name></author>\n    <author><name>Alan Turing</name></author>\n  </entry>\n</feed>'
+SEMANTIC_SCHOLAR_JSON = {'data': [{'paperId': 'p1', 'title': 'SaaS Retention', 'abstract': 'Retention matters.', 'year': 2020, 'authors': [{'name': 'Grace Hopper'}], 'citationCount': 42, 'publicationDate': '2020-05-01', 'venue': 'JMR', 'url': 'https://example.com/p1'}]}
+
+def handler(request):
+    if request.url.host == 'api.semanticscholar.org':
+        return httpx.Response(200, json=SEMANTIC_SCHOLAR_JSON)
+    return httpx.Response(200, content=ARXIV_FEED)
+
+class FakeEmbedder:
+    VOCAB = ('pricing', 'retention', 'saas')
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, normalize_embeddings=True, convert_to_numpy=True):
+        self.encoded.extend(texts)
+        vectors = np.array([[text.lower().count(word) for word in self.VOCAB] for text in texts], dtype=np.float64) + 0.01
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+class TestResearchRetriever(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+        self.requests = []
+
+        def record(request):
+            self.requests.append((request.url.host, time.time()))
+            return handler(request)
+        transport = httpx.MockTransport(record)
+        patcher = mock.patch('src.tools.research_retrieval.httpx.AsyncClient', side_effect=lambda **kwargs: AsyncClient(transport=transport))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.embedder = None
+        embedder_patcher = mock.patch('src.tools.research_retrieval._get_embedder', side_effect=lambda: self.embedder)
+        embedder_patcher.start()
+        self.addCleanup(embedder_patcher.stop)
+        self.retriever = ResearchRetriever(cache_dir=self.cache_dir)
+        self.addCleanup(self.retriever.close)
+
+    def test_close_releases_loop_and_clients(self):
+        self.retriever.retrieve_papers('saas pricing')
+        client = next(iter(self.retriever._clients.values()))
+        self.retriever.close()
+        self.assertTrue(client.is_closed)
+        self.assertTrue(self.retriever._loop.is_closed())
+        self.assertFalse(self.retriever._loop_thread.is_alive())
+        self.retriever.close()
+
+    def test_retrieve_papers_merges_sources(self):
+        papers = self.retriever.retrieve_papers('saas pricing', top_k=3)
+        self.assertEqual([p['source'] for p in papers], ['Semantic Scholar', 'arXiv'])
+        self.assertEqual(papers[1]['authors'], ['Ada Lovelace', 'Alan Turing'])
+        self.assertEqual(papers[1]['title'], 'Dynamic Pricing for SaaS')
+        self.assertEqual(papers[1]['abstract'], 'We study pricing.')
+        self.assertEqual(papers[0]['citation'], 'Grace Hopper (2020). SaaS Retention. JMR.')
+
+    def test_sources_are_not_serialized_by_rate_limit(self):
+        self.retriever._limiters['semantic_scholar'] = TokenBucket(capacity=1, refill_rate=2)
+        self.retriever._limiters['semantic_scholar'].tokens = 0
+        start = time.time()
+        self.retriever.retrieve_papers('saas pricing')
+        arxiv_at = dict(self.requests)['export.arxiv.org']
+        self.assertLess(arxiv_at - start, 0.3)
+
+    def test_same_host_is_rate_limited(self):
+        self.retriever._limiters['arxiv'] = TokenBucket(capacity=1, refill_rate=5)
+        self.retriever.search_arxiv('first')
+        self.retriever.search_arxiv('second')
+        self.assertGreaterEqual(self.requests[1][1] - self.requests[0][1], 0.15)
+
+    def test_bucket_allows_bursts(self):
+        for i in range(5):
+            self.retriever.search_semantic_scholar(f'burst {i}')
+        self.assertLess(self.requests[-1][1] - self.requests[0][1], 0.5)
+        self.assertGreater(self.retriever._limiters['semantic_scholar'].reserve(), 2.5)
+
+    def test_arxiv_feed_truncated_to_limit(self):
+        entry = ARXIV_FEED[ARXIV_FEED.index(b'<entry>'):ARXIV_FEED.index(b'</feed>')]
+        feed = ARXIV_FEED.replace(entry, entry * 5)
+        with mock.patch.object(ResearchRetriever, '_client', new=AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=feed)))):
+            papers = self.retriever.search_arxiv('many', limit=3)
+        self.assertEqual(len(papers), 3)
+        self.assertEqual(papers[2]['year'], '2024')
+
+    def test_transient_errors_retried(self):
+        self.retriever.retry_backoff = 0
+        statuses = iter([429, 503])
+
+        def flaky(request):
+            self.requests.append((request.url.host, time.time()))
+            status = next(statuses, 200)
+            return httpx.Response(status, json=SEMANTIC_SCHOLAR_JSON) if status == 200 else httpx.Response(status)
+        with mock.patch.object(ResearchRetriever, '_client', new=AsyncClient(transport=httpx.MockTransport(flaky))):
+            papers = self.retriever.search_semantic_scholar('flaky')
+        self.assertEqual(len(papers), 1)
+        self.assertEqual(len(self.requests), 3)
+
+    def test_results_cached(self):
+        self.retriever.search_semantic_scholar('cached query')
+        self.assertEqual(self.retriever.search_semantic_scholar('cached query')[0]['paper_id'], 'p1')
+        self.assertEqual(len(self.requests), 1)
+
+    def test_cache_expiry(self):
+        self.retriever._save_to_cache('k', [{'title': 'A'}])
+        self.retriever._l1.clear()
+        self.assertEqual(self.retriever._get_from_cache('k'), [{'title': 'A'}])
+        with mock.patch('src.tools.research_retrieval.time.time', return_value=time.time() + 8 * 86400):
+            self.assertIsNone(self.retriever._get_from_cache('k'))
+
+    def test_cache_evicts_least_recently_used(self):
+        self.retriever.max_cache_entries = 2
+        self.retriever._save_to_cache('a', [1])
+        self.retriever._save_to_cache('b', [2])
+        self.retriever._l1.clear()
+        self.retriever._get_from_cache('a')
+        self.retriever._save_to_cache('c', [3])
+        self.retriever._l1.clear()
+        self.assertIsNone(self.retriever._get_from_cache('b'))
+        self.assertEqual(self.retriever._get_from_cache('a'), [1])
+        self.assertEqual(self.retriever._get_from_cache('c'), [3])
+
+    def test_memory_hit_skips_database(self):
+        self.retriever._save_to_cache('k', [{'title': 'A'}])
+        with mock.patch.object(self.retriever, '_db') as db:
+            self.assertEqual(self.retriever._get_from_cache('k'), [{'title': 'A'}])
+        db.execute.assert_not_called()
+
+    def test_database_hit_populates_memory(self):
+        self.retriever._save_to_cache('k', [{'title': 'A'}])
+        self.retriever._l1.clear()
+        first = self.retriever._get_from_cache('k')
+        self.assertIs(self.retriever._get_from_cache('k'), first)
+
+    def test_citations_do_not_mutate_cached_papers(self):
+        self.retriever.retrieve_papers('saas pricing')
+        cached = self.retriever._get_from_cache(self.retriever._get_cache_key('saas pricing', 'arxiv'))
+        self.assertNotIn('citation', cached[0])
+
+    def test_concurrent_identical_searches_share_request(self):
+
+        async def search_twice():
+            return await asyncio.gather(self.retriever.asearch_arxiv('same'), self.retriever.asearch_arxiv('same'))
+        first, second = self.retriever._run(search_twice())
+        self.assertIs(first, second)
+        self.assertEqual(len(self.requests), 1)
+
+    def test_cache_key(self):
+        key = self.retriever._get_cache_key('saas pricing', 'arxiv')
+        self.assertEqual(len(key), 32)
+        self.assertEqual(key, self.retriever._get_cache_key('saas pricing', 'arxiv'))
+        self.assertNotEqual(key, self.retriever._get_cache_key('saas pricing', 'semantic_scholar'))
+
+    def test_rerank_orders_by_query_similarity(self):
+        self.embedder = FakeEmbedder()
+        papers = self.retriever.retrieve_papers('pricing', top_k=2)
+        self.assertEqual([p['source'] for p in papers], ['arXiv', 'Semantic Scholar'])
+        self.assertEqual(self.retriever.retrieve_papers('pricing', top_k=1)[0]['title'], 'Dynamic Pricing for SaaS')
+
+    def test_embeddings_persisted(self):
+        self.embedder = FakeEmbedder()
+        self.retriever.retrieve_papers('pricing')
+        self.embedder.encoded.clear()
+        ResearchRetriever(cache_dir=self.cache_dir).retrieve_papers('retention')
+        self.assertEqual(self.embedder.encoded, ['retention'])
+
+    def test_embeddings_evict_least_recently_used(self):
+        self.embedder = FakeEmbedder()
+        self.retriever.max_embedding_entries = 2
+        papers = [{'title': title, 'abstract': ''} for title in ('Pricing', 'Retention', 'SaaS')]
+        self.retriever._embed_papers(self.embedder, papers[:2])
+        with mock.patch('src.tools.research_retrieval.time.time', return_value=time.time() + 1):
+            self.retriever._embed_papers(self.embedder, papers[:1])
+        with mock.patch('src.tools.research_retrieval.time.time', return_value=time.time() + 2):
+            self.retriever._embed_papers(self.embedder, papers[2:])
+        self.embedder.encoded.clear()
+        self.retriever._embed_papers(self.embedder, papers)
+        self.assertEqual(self.embedder.encoded, ['Retention\n'])
+
+    def test_mmr_skips_near_duplicates(self):
+        self.embedder = FakeEmbedder()
+        papers = [{'title': 'Pricing SaaS', 'abstract': ''}, {'title': 'Pricing SaaS', 'abstract': ''}, {'title': 'Pricing retention', 'abstract': ''}]
+        ranked = self.retriever._rerank('pricing', papers, top_k=2)
+        self.assertIs(ranked[0], papers[0])
+        self.assertIs(ranked[1], papers[2])
+
+    def test_warmup_loads_embedder_once_and_retries_failures(self):
+        self.addCleanup(setattr, research_retrieval, '_embedder', research_retrieval._embedder)
+        research_retrieval._embedder = None
+        load = mock.Mock(side_effect=[OSError('offline'), 'model'])
+        with mock.patch.dict('sys.modules', {'sentence_transformers': mock.Mock(SentenceTransformer=load)}):
+            self.retriever.warmup()
+            self.assertIsNone(research_retrieval._embedder)
+            self.retriever.warmup()
+            self.retriever.warmup()
+        self.assertEqual(research_retrieval._embedder, 'model')
+        self.assertEqual(load.call_count, 2)
+
+    def test_mmr_bounds_k(self):
+        sims = np.array([0.2, 0.9])
+        pairwise = np.eye(2)
+        self.assertEqual(_mmr_select(sims, pairwise, 0, 0.7), [])
+        self.assertEqual(sorted(_mmr_select(sims, pairwise, 5, 0.7)), [0, 1])
+
+    def test_rerank_partitions_large_pools(self):
+        self.embedder = FakeEmbedder()
+        papers = [{'title': f'Retention {i}', 'abstract': ''} for i in range(5)] + [{'title': 'Pricing', 'abstract': ''}]
+        self.assertEqual(self.retriever._rerank('pricing', papers, top_k=1), [papers[5]])
+        self.embedder = None
+        papers[2]['citation_count'] = 7
+        self.assertEqual(self.retriever._rerank('pricing', papers, top_k=1), [papers[2]])
+
+    def test_format_research_context(self):
+        paper = {'title': 'T', 'authors': ['A', 'B', 'C', 'D'], 'year': 2024, 'source': 'arXiv', 'citation_count': 3, 'abstract': 'Abs', 'citation': 'A et al. (2024). T.', 'url': 'u'}
+        expected = '## Relevant Research Papers\n\n### Paper 1: T\n**Authors**: A, B, C et al.\n**Year**: 2024\n**Source**: arXiv\n**Citations**: 3\n\n**Abstract**: Abs...\n\n**Citation**: A et al. (2024). T.\n**URL**: u\n\n' + '-' * 70 + '\n\n'
+        self.assertEqual(self.retriever.format_research_context([paper]), expected)
+        self.assertEqual(self.retriever.format_research_context([]), 'No relevant research papers found.')
+
+    def test_cache_payload_compressed_with_short_abstract(self):
+        long_json = {'data': [dict(SEMANTIC_SCHOLAR_JSON['data'][0], abstract='retention ' * 300)]}
+        with mock.patch.object(ResearchRetriever, '_client', new=AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, json=long_json)))):
+            paper = self.retriever.search_semantic_scholar('long abstract')[0]
+        self.assertEqual(len(paper['abstract_short']), 512)
+        self.assertEqual(len(paper['abstract']), 3000)
+        payload = self.retriever._db.execute('SELECT payload FROM cache').fetchone()[0]
+        self.assertLess(len(payload), 1000)
+        self.retriever._l1.clear()
+        self.assertEqual(self.retriever.search_semantic_scholar('long abstract')[0], paper)
+
+    def test_reads_uncompressed_cache_rows(self):
+        key = self.retriever._get_cache_key('legacy', 'arxiv')
+        self.retriever._db.execute('INSERT INTO cache (key, ts, atime, payload) VALUES (?, ?, ?, ?)', (key, time.time(), time.time(), b'[{"title": "Old"}]'))
+        self.assertEqual(self.retriever.search_arxiv('legacy'), [{'title': 'Old'}])
+
+    def test_cross_source_duplicates_collapsed(self):
+        duplicate = {'data': [dict(SEMANTIC_SCHOLAR_JSON['data'][0], title='Dynamic pricing for SaaS.')]}
+        with mock.patch.dict(SEMANTIC_SCHOLAR_JSON, duplicate):
+            papers = self.retriever.retrieve_papers('saas pricing', top_k=3)
+        self.assertEqual(len(papers), 1)
+        self.assertEqual(papers[0]['source'], 'Semantic Scholar')
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+import os
+from pathlib import Path
+from unittest import mock
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault('OPENAI_API_KEY', 'sk-demo-test')
+os.environ.setdefault('DEEPSEEK_API_KEY', 'sk-demo-test')
+from src.config import Config
+from src import unified_llm
+from src.unified_llm import UnifiedLLM
+
+def make_llm(agent_type, strategy='hybrid'):
+    with mock.patch.object(Config, 'MODEL_STRATEGY', strategy), mock.patch.object(unified_llm, 'GPT5Wrapper'), mock.patch.object(unified_llm, 'DeepSeekWrapper', side_effect=lambda model: mock.Mock(model=model)):
+        return UnifiedLLM(agent_type=agent_type)
+
+class TestUnifiedLLM(unittest.TestCase):
+
+    def test_hybrid_routing(self):
+        llm = make_llm('research_synthesis')
+        self.assertEqual(llm._select_model(), ('deepseek', llm.deepseek_reasoner))
+        self.assertEqual(make_llm('unknown')._select_model()[0], 'gpt5')
+
+    def test_settings_resolved_at_init(self):
+        llm = make_llm('financial')
+        self.assertEqual((llm._cfg.temperature, llm._cfg.max_tokens), (Config.TEMPERATURE_CODING, 8000))
+        with mock.patch.object(UnifiedLLM, '_select_model', side_effect=AssertionError('re-routed')):
+            llm.generate(input_text='q')
+        llm.deepseek_chat.generate.assert_called_once_with(messages=None, input_text='q', instructions=None, temperature=Config.TEMPERATURE_CODING, max_tokens=8000, tools=None)
+
+    def test_optimal_settings_per_agent(self):
+        cases = [('financial', Config.TEMPERATURE_CODING, 8000), ('market', Config.TEMPERATURE_CONVERSATION, 4000), ('operations', Config.TEMPERATURE_ANALYSIS, 4000), ('leadgen', Config.TEMPERATURE_CONVERSATION, 4000), ('router', Config.TEMPERATURE_CODING, 4000), ('research_synthesis', Config.TEMPERATURE_ANALYSIS, 32000), (None, Config.TEMPERATURE_ANALYSIS, 4000)]
+        for agent_type, temperature, max_tokens in cases:
+            with self.subTest(agent_type=agent_type):
+                llm = make_llm(agent_type)
+                self.assertEqual((llm._get_optimal_temperature(), llm._get_optimal_max_tokens()), (temperature, max_tokens))
+
+    def test_hybrid_falls_back_to_gpt5(self):
+        llm = make_llm('market')
+        llm.deepseek_chat.generate.side_effect = RuntimeError('down')
+        llm.gpt5.generate.return_value = 'fallback'
+        self.assertEqual(llm.generate(input_text='q'), 'fallback')
+
+    def test_current_provider(self):
+        self.assertEqual(make_llm('research_synthesis').get_current_provider(), 'DeepSeek-V3.2-Exp (Reasoner)')
+        self.assertEqual(make_llm('market').current_provider, 'DeepSeek-V3.2-Exp (Chat)')
+        self.assertEqual(make_llm('market', strategy='gpt5').current_provider, 'GPT-5-nano')
+
+    def test_strategy_specific_configs(self):
+        self.assertEqual(make_llm('research_synthesis')._get_optimal_max_tokens(), 32000)
+        llm = make_llm('research_synthesis', strategy='deepseek')
+        self.assertEqual(llm._select_model(), ('deepseek', llm.deepseek_reasoner))
+        self.assertEqual(llm._get_optimal_max_tokens(), 16000)
+        self.assertEqual(make_llm('market', strategy='gpt5')._select_model()[0], 'gpt5')
+        self.assertEqual(make_llm('market', strategy='gpt5')._get_optimal_temperature(), Config.TEMPERATURE_CONVERSATION)
+if __name__ == '__main__':
+    unittest.main()